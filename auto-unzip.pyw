@@ -4,98 +4,102 @@ auto-unzip.py
 Main Script for Auto-Unzip
 """
 
-import signal
 import sys
-import threading
-import os
-import time
-import json
-import subprocess
-from typing import List
-from watchdog.observers import Observer
-from watchdog.events import FileSystemEventHandler
-
-from modules.config_load_config import load_config
-from modules.config_save_config import save_config
-from modules.config_dataclass import Config
-from modules.notifications_show_startup import show_startup_toast
-from modules.notifications_toast_backend import show_toast
-from modules.workflow_process_archive import process_archive
-from modules.watcher_directory_watcher import DirectoryWatcher
-from modules.tray_tray_controller import TrayController
-import queue
-from modules.gui_options_window import create_and_show_options_window
-from modules.qt_event_loop import integrate_qt_loop
-from modules.add_folder import add_folder
-from modules.graceful_exit import graceful_exit
-from modules.confirmed_graceful_exit import confirmed_graceful_exit
-from modules.reload_app import reload_app
-from modules.perform_exec_restart import perform_exec_restart
-from modules.read_pid_file import read_pid_file
-from modules.write_pid_file import write_pid_file
-from modules.kill_pid import kill_pid
-from modules.enforce_single_instance import enforce_single_instance
-from modules.install_signals import install_signals
-
-
-
-class RestartHandler(FileSystemEventHandler):
-    """Debounced project file change restarter.
-
-    Watches for modifications to .py / .pyw files under the project root.
-    Ignores changes in temporary / runtime folders (e.g. __pycache__).
-    On first qualifying change after the debounce window, re-execs the process.
+from modules.startup_profile import StartupProfile
+
+# Created first so import phases are timed (printed with --startup-profile)
+profile = StartupProfile('--startup-profile' in [a.lower() for a in sys.argv[1:]])
+
+with profile.phase('import stdlib'):
+    import atexit
+    import signal
+    import threading
+    import os
+    import time
+    import json
+    import subprocess
+    import queue
+    from typing import List
+
+with profile.phase('import config'):
+    from modules.config_load_config import load_config
+    from modules.config_dataclass import Config
+    from modules.config_service import ConfigService
+with profile.phase('import notifications'):
+    from modules.notifications_show_startup import show_startup_toast
+    from modules.notifications_toast_backend import set_toasts_enabled, show_toast
+    from modules.notifications_get_dispatcher import get_dispatcher
+# Extractors, the tray, the options window, Qt and watchdog are imported on first use
+with profile.phase('import workflow'):
+    from modules.workflow_process_archive import process_archive
+with profile.phase('import watcher and scheduler'):
+    from modules.watcher_create_watcher import create_watcher
+    from modules.scheduler_extraction_scheduler import ExtractionScheduler
+    from modules.index_processed_archives import ProcessedArchiveIndex
+    from modules.index_extraction_cache import ExtractionCache
+    from modules.index_job_journal import JobJournal
+    from modules.metrics_registry import get_metrics
+with profile.phase('import app helpers'):
+    from modules.qt_event_loop import integrate_qt_loop
+    from modules.add_folder import add_folder
+    from modules.graceful_exit import graceful_exit
+    from modules.confirmed_graceful_exit import confirmed_graceful_exit
+    from modules.reload_app import reload_app
+    from modules.perform_exec_restart import add_drain_hook, perform_exec_restart
+    from modules.read_pid_file import read_pid_file
+    from modules.write_pid_file import write_pid_file
+    from modules.kill_pid import kill_pid
+    from modules.enforce_single_instance import enforce_single_instance
+    from modules.install_signals import install_signals
+
+
+def run_headless(args: List[str]) -> int:
+    """--headless --once PATH... [--jobs N]: extract everything under PATHs, print a JSON summary, exit.
+
+    Exit status: 0 all archives extracted (or none found), 1 some failed, 2 usage error.
     """
-    def __init__(self, project_root: str, min_interval: float = 1.5, initial_delay: float = 2.0):
-        super().__init__()
-        self.project_root = os.path.abspath(project_root)
-        self.min_interval = min_interval
-        self.initial_delay = initial_delay
-        self._start_time = time.time()
-        self._last_restart = 0.0
-        self._pending = False
- 
-    def _should_consider(self, path: str) -> bool:
-        if not path.endswith(('.py', '.pyw')):
-            return False
-        # ignore __pycache__ or hidden
-        parts = path.lower().split(os.sep)
-        if '__pycache__' in parts:
-            return False
-        # Exclude any file inside the 'testing' folder
-        if 'testing' in parts:
-            return False
-        return True
-
-    def on_modified(self, event):  # pragma: no cover
-        try:
-            changed = os.path.abspath(event.src_path)
-        except Exception:
-            return
-        # Ignore early events right after startup to prevent immediate restart loop
-        if (time.time() - self._start_time) < self.initial_delay:
-            return
-        if not self._should_consider(changed):
-            return
-        now = time.time()
-        if now - self._last_restart < self.min_interval:
-            # debounce; mark pending but do not restart yet
-            self._pending = True
-            return
-        self._trigger_restart(changed)
-
-    def _trigger_restart(self, changed: str):
-        self._last_restart = time.time()
-        self._pending = False
-        print(f'[Auto-Unzip] Source changed ({changed}), restarting...')
-        try:
-            perform_exec_restart()
-        except Exception as e:
-            print(f'[Auto-Unzip] Restart failed: {e}')
+    paths: List[str] = []
+    jobs = 0
+    once = False
+    it = iter(args)
+    for arg in it:
+        low = arg.lower()
+        if low in ('--headless', '--startup-profile'):
+            continue
+        if low == '--once':
+            once = True
+        elif low == '--jobs' or low.startswith('--jobs='):
+            value = arg.split('=', 1)[1] if '=' in arg else next(it, '')
+            try:
+                jobs = int(value)
+            except ValueError:
+                print(f"[Auto-Unzip] --jobs expects a number, got '{value}'", file=sys.stderr)
+                return 2
+        elif arg.startswith('-'):
+            print(f"[Auto-Unzip] Unknown option for --headless: {arg}", file=sys.stderr)
+            return 2
+        else:
+            paths.append(arg)
+    if not once or not paths:
+        print("[Auto-Unzip] Usage: auto-unzip.pyw --headless --once PATH... [--jobs N]", file=sys.stderr)
+        return 2
+    missing = [p for p in paths if not os.path.exists(p)]
+    if missing:
+        print(f"[Auto-Unzip] Not found: {', '.join(missing)}", file=sys.stderr)
+        return 2
+    from modules.workflow_batch_extract import run_batch
+    set_toasts_enabled(False)
+    cfg = load_config()
+    stdout = sys.stdout
+    sys.stdout = sys.stderr  # log and progress lines; stdout carries only the summary
+    try:
+        summary = run_batch(paths, cfg, jobs)
+    finally:
+        get_dispatcher().stop()  # flush queued progress/completion lines
+        sys.stdout = stdout
+    print(json.dumps(summary, indent=2))
+    return 0 if summary['failed'] == 0 else 1
 
-    def poll(self):  # periodic check if a pending restart can now occur
-        if self._pending and (time.time() - self._last_restart) >= self.min_interval:
-            self._trigger_restart('pending-change')
 
 def main():
     # Basic CLI handling (keep lightweight to avoid argparse dependency)
@@ -107,9 +111,14 @@ def main():
         print("Options:")
         print("  -h, --help       Show this help and exit")
         print("  -v, --version    Show version and exit")
+        print("  --startup-profile  Print start-up phase timings once the first scan has started")
+        print("  --headless --once PATH... [--jobs N]")
+        print("                   Extract all archives under PATHs (N at a time) without the")
+        print("                   watcher, tray or Qt, print a JSON summary to stdout and exit")
+        print("                   (status 0 = all extracted, 1 = some failed, 2 = usage error)")
         print()
-        print("The application has no runtime CLI options; configuration is managed via")
-        print("the Options window (tray icon) and the config/settings.json file.")
+        print("Configuration is managed via the Options window (tray icon) and the")
+        print("config/settings.json file; --headless uses the same settings.")
         return
     if ('-v' in argv_lower) or ('--version' in argv_lower):
         try:
@@ -120,10 +129,19 @@ def main():
             print("Auto-Unzip version unknown (version.json unreadable)")
         return
 
-    enforce_single_instance()
+    if '--headless' in argv_lower:
+        # Runs alongside the tray service, so the single-instance check is skipped
+        sys.exit(run_headless(sys.argv[1:]))
+
+    with profile.phase('enforce single instance'):
+        enforce_single_instance()
 
     # Load config once on main thread so all components share the same instance
-    initial_cfg = load_config()
+    with profile.phase('load config'):
+        initial_cfg = load_config()
+    # Every settings change goes through the service: applied live, saved debounced
+    config = ConfigService(initial_cfg)
+    atexit.register(config.flush)  # a quit from the tray must not lose a pending save
     first_launch = getattr(initial_cfg, '_was_new', False)
     if first_launch:
         try:
@@ -137,14 +155,86 @@ def main():
 
     def app_logic():  # background (non-Qt) logic
         cfg = initial_cfg
+        # Archives handled by earlier runs (same size/mtime) are skipped after restarts
+        with profile.phase('load processed-archive index'):
+            index = ProcessedArchiveIndex() if getattr(cfg, 'remember_processed_archives', True) else None
+            # Re-downloads of an archive extracted before are recognised by content
+            cache = ExtractionCache() if getattr(cfg, 'dedup_mode', 'off') != 'off' else None
+            # Jobs cut short by a crash or restart are submitted again
+            journal = JobJournal() if getattr(cfg, 'job_journal', True) else None
+        # Watcher only enqueues; the scheduler's worker pool runs the extractions
+        with profile.phase('start scheduler and watcher'):
+            scheduler = ExtractionScheduler(lambda p, **kw: process_archive(p, cfg, index, submit=scheduler.submit,
+                                                                            cache=cache, journal=journal, **kw),
+                                            cfg.max_concurrent_extractions, cfg.max_extractions_per_folder, journal)
+            scheduler.start()
+            # Archives given up after repeated crashes; kept out of the queue so the crash can't loop
+            abandoned = set()
+
+            def _abandon(path):
+                abandoned.add(os.path.abspath(path))
+                if index is not None:
+                    try:
+                        st = os.stat(path)
+                        index.record(path, st.st_size, st.st_mtime, 'abandoned')
+                    except OSError:
+                        pass
+
+            def _submit_new(path, **options):
+                if os.path.abspath(path) in abandoned:
+                    return False
+                return scheduler.submit(path, **options)
+
+            for path, options in (journal.pending(on_abandoned=_abandon) if journal is not None else []):
+                try:
+                    st = os.stat(path)
+                    handled = index is not None and index.contains(path, st.st_size, st.st_mtime)
+                except OSError:
+                    handled = False
+                if handled:
+                    journal.done(path)  # finished just before the interruption
+                else:
+                    scheduler.submit(path, **options)
+            watcher = create_watcher(cfg, _submit_new, index)
+            watcher.start()
+        # Settings changed in the options window apply to the running components
+        config.subscribe(('poll_interval_seconds',), lambda c, _changed: watcher.set_intervals(c.poll_interval_seconds))
+        config.subscribe(('watch_folders',), lambda c, _changed: watcher.rescan())
+        set_toasts_enabled(getattr(cfg, 'show_toasts', True))
+        config.subscribe(('show_toasts',), lambda c, _changed: set_toasts_enabled(c.show_toasts))
+        # Before a hot reload: no new jobs, let running ones finish (bounded), save settings
+        def _drain_extractions():
+            watcher.stop()
+            if not scheduler.drain(getattr(cfg, 'restart_drain_seconds', 30.0)):
+                print('[Auto-Unzip] Restarting with extractions still running; they resume after the restart.')
+        add_drain_hook(_drain_extractions)
+        add_drain_hook(config.flush)
         # Only show the generic startup toast here; welcome modal handled on Qt thread
         show_startup_toast()
-        watcher = DirectoryWatcher(lambda: cfg.watch_folders, lambda p: process_archive(p, cfg), cfg.poll_interval_seconds)
-        watcher.start()
+        if profile.enabled:
+            if watcher.first_scan_started.wait(5):
+                profile.mark('first scan started', watcher.first_scan_at)
+            profile.report()
+        metrics = get_metrics()
+        metrics.gauge('autounzip_watcher_seen_entries', lambda: watcher.seen_count)
+        metrics.gauge('autounzip_queue_pending', lambda: scheduler.pending_count)
+        metrics.gauge('autounzip_queue_active', lambda: scheduler.active_count)
+        metrics_server = snapshots = None
+        if getattr(cfg, 'metrics_port', 0):
+            from modules.metrics_http_server import MetricsServer
+            metrics_server = MetricsServer(metrics, cfg.metrics_port)
+            if metrics_server.start():
+                print(f'[Auto-Unzip] Metrics at http://127.0.0.1:{metrics_server.port}/metrics')
+        if getattr(cfg, 'metrics_snapshot_seconds', 0) > 0:
+            from modules.metrics_snapshot_writer import MetricsSnapshotWriter
+            snapshots = MetricsSnapshotWriter(metrics, cfg.metrics_snapshot_seconds)
+            snapshots.start()
         project_root = os.path.dirname(os.path.abspath(__file__))
         event_handler = None
         observer = None
         if getattr(cfg, 'enable_hot_reload', True):
+            from watchdog.observers import Observer
+            from modules.reload_restart_handler import RestartHandler
             event_handler = RestartHandler(project_root=project_root)
             observer = Observer()
             observer.schedule(event_handler, path=project_root, recursive=True)
@@ -162,13 +252,19 @@ def main():
             pass
         finally:
             watcher.stop()
+            scheduler.stop()
+            if metrics_server is not None:
+                metrics_server.stop()
+            if snapshots is not None:
+                snapshots.stop()
+            get_dispatcher().stop()  # flush queued progress/completion notifications
             if observer:
                 observer.stop()
                 observer.join()
-            save_config(cfg)
+            config.flush()
 
-    # Tray + options scheduling (Qt main thread)
-    try:
+    def setup_ui():
+        """Tray + options scheduling (Qt main thread, once the QApplication exists)."""
         from PyQt6 import QtCore  # type: ignore
         ui_queue: "queue.Queue[callable]" = queue.Queue()
 
@@ -188,10 +284,14 @@ def main():
         def init_tray():
             cfg = initial_cfg
             def _open_options():
-                ui_queue.put(lambda: create_and_show_options_window(cfg, confirmed_graceful_exit, reload_app))
+                def _show():
+                    from modules.gui_options_window import create_and_show_options_window
+                    create_and_show_options_window(config, confirmed_graceful_exit, reload_app)
+                ui_queue.put(_show)
             def _request_quit():
                 # Must run on UI thread: enqueue dialog creation
                 ui_queue.put(_confirm_and_quit)
+            from modules.tray_tray_controller import TrayController
             tray = TrayController(open_options=_open_options, request_quit=_request_quit)
             tray.start()
         def _confirm_and_quit():
@@ -222,10 +322,8 @@ def main():
                     show_toast("Auto-Unzip", "Welcome! Monitoring your Downloads folder. Tray icon > Options to adjust.")
             # Defer a little so the QApplication is fully initialized and tray starting
             QtCore.QTimer.singleShot(200, _welcome_modal)
-    except Exception:
-        pass
 
-    integrate_qt_loop(app_logic)
+    integrate_qt_loop(app_logic, setup_ui)
 
 
 
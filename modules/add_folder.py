@@ -1,15 +1,14 @@
 """
 add_folder.py
 -------------
-Provides _add_folder(path: str, cfg: Config) to add a folder to the config's watch list and save config.
+Provides add_folder(path: str, config: ConfigService) to add a folder to the watch list
+(applied to the running watcher and saved by the service).
 """
 import os
-from modules.config_save_config import save_config
-from modules.config_dataclass import Config
+from modules.config_service import ConfigService
 
-def add_folder(path: str, cfg: Config):
+def add_folder(path: str, config: ConfigService):
     """Add a folder to the config's watch list if it exists and is not already present."""
     full = os.path.abspath(path)
-    if full not in cfg.watch_folders and os.path.isdir(full):
-        cfg.watch_folders.append(full)
-        save_config(cfg)
+    if full not in config.cfg.watch_folders and os.path.isdir(full):
+        config.update(watch_folders=config.cfg.watch_folders + [full])
@@ -0,0 +1,13 @@
+"""
+config_data_file_path.py
+------------------------
+Provides get_data_file_path() which returns the path of a runtime data file
+(indexes, journals, snapshots) stored next to settings.json in the top-level
+'config' directory.
+"""
+import os
+from .config_settings_file_path import get_settings_file_path
+
+def get_data_file_path(name: str) -> str:
+    """Return path to name inside the directory that holds settings.json."""
+    return os.path.join(os.path.dirname(get_settings_file_path()), name)
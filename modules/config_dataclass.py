@@ -17,3 +17,27 @@ class Config:
     enable_hot_reload: bool = True  # allow disabling automatic code reloads
     development: bool = False  # enables development mode features like hot reload toggle
     launch_on_startup: bool = True  # launch app on Windows startup by default
+    show_toasts: bool = True  # desktop notifications (console output either way)
+    max_concurrent_extractions: int = 2  # size of the extraction worker pool
+    max_extractions_per_folder: int = 1  # per watched folder cap (0 = no cap)
+    watch_mode: str = 'events'  # 'events' (watchdog observer) or 'poll' (scandir polling)
+    reconcile_interval_seconds: float = 60.0  # full rescan interval in 'events' mode
+    settle_seconds: float = 2.0  # archive size/mtime must be stable this long before extraction
+    remember_processed_archives: bool = True  # persist handled archives so restarts skip them
+    watcher_max_seen_entries: int = 50000  # LRU cap on archive versions the watcher remembers
+    zip_extract_workers: int = 0  # threads per zip extraction (0 = auto, 1 = serial)
+    decompression_backend: str = 'auto'  # gzip/bzip2/xz/zstd: 'auto', 'external', 'parallel' or 'stdlib'
+    decompression_workers: int = 0  # threads/processes for accelerated decompression (0 = all cores)
+    preflight_checks: bool = True  # check free space and archive-bomb limits before extracting
+    min_free_space_mb: int = 512  # space that must remain free on the target volume after extraction
+    max_uncompressed_gb: float = 0.0  # reject archives expanding to more than this (0 = no limit)
+    max_archive_files: int = 1000000  # reject archives with more members than this (0 = no limit)
+    max_compression_ratio: float = 10000.0  # reject archives expanding more than this many times (0 = no limit)
+    extract_nested_archives: bool = False  # also extract archives found inside extracted archives
+    nested_max_depth: int = 3  # how many archive levels below the original to extract
+    nested_stream_max_mb: int = 64  # inner archives up to this size are extracted in the same job
+    dedup_mode: str = 'off'  # archives identical to an earlier one: 'off', 'skip', 'link' or 'reflink'
+    metrics_port: int = 0  # serve metrics on http://127.0.0.1:<port>/metrics (0 = off)
+    metrics_snapshot_seconds: float = 60.0  # write config/metrics.json this often (0 = off)
+    job_journal: bool = True  # log extraction jobs so interrupted ones resume after a crash or restart
+    restart_drain_seconds: float = 30.0  # how long a restart waits for running extractions to finish
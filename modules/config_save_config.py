@@ -2,14 +2,25 @@
 config_save_config.py
 ---------------------
 Provides save_config() which persists the current Config to disk as JSON.
+The file is written to a temporary name and swapped in with os.replace(),
+so a crash mid-write leaves the previous settings intact instead of a
+truncated file that load_config() would have to repair. Transient
+attributes (names starting with '_', e.g. _was_new) are not written.
 """
 import json
+import os
 from .config_dataclass import Config
 from .config_settings_file_path import get_settings_file_path
 
 def save_config(cfg: Config) -> None:
+    path = get_settings_file_path()
+    tmp = path + '.tmp'
     try:
-        with open(get_settings_file_path(), 'w', encoding='utf-8') as f:
-            json.dump(cfg.__dict__, f, indent=2)
+        data = {k: v for k, v in dict(vars(cfg)).items() if not k.startswith('_')}
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
     except Exception:
         pass
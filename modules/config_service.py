@@ -0,0 +1,89 @@
+"""
+config_service.py
+-----------------
+Defines ConfigService which owns the shared Config at runtime:
+
+- update(**changes) sets fields and notifies subscribers of the fields that
+  actually changed, so running components (watcher intervals, scheduler
+  pool size, notifications) pick up new values without a restart
+- subscribe(fields, callback) registers callback(cfg, changed_fields) for
+  changes to any of fields (None = every change); returns an unsubscribe
+  function. Callbacks run on the thread that called update().
+- saves are write-behind: changes are persisted save_delay seconds after
+  the last one (a spin box emitting a value per tick writes once), using
+  the atomic save_config(). flush() writes pending changes immediately.
+"""
+from __future__ import annotations
+import threading
+from typing import Callable, Iterable, List, Optional, Set, Tuple
+
+from .config_dataclass import Config
+from .config_save_config import save_config
+
+Subscriber = Callable[[Config, Set[str]], None]
+
+
+class ConfigService:
+    def __init__(self, cfg: Config, save_delay: float = 1.0, saver: Callable[[Config], None] = save_config):
+        self.cfg = cfg
+        self.save_delay = save_delay
+        self._saver = saver
+        self._subscribers: List[Tuple[Optional[Set[str]], Subscriber]] = []
+        self._lock = threading.RLock()
+        self._timer: Optional[threading.Timer] = None
+        self._dirty = False
+
+    def subscribe(self, fields: Optional[Iterable[str]], callback: Subscriber) -> Callable[[], None]:
+        entry = (set(fields) if fields is not None else None, callback)
+        with self._lock:
+            self._subscribers.append(entry)
+
+        def _unsubscribe():
+            with self._lock:
+                if entry in self._subscribers:
+                    self._subscribers.remove(entry)
+        return _unsubscribe
+
+    def update(self, **changes) -> Set[str]:
+        """Apply changes; returns the names of fields whose value changed."""
+        with self._lock:
+            changed = set()
+            for name, value in changes.items():
+                if not hasattr(self.cfg, name):
+                    raise AttributeError(f'Unknown config field: {name}')
+                if getattr(self.cfg, name) != value:
+                    setattr(self.cfg, name, value)
+                    changed.add(name)
+            subscribers = list(self._subscribers)
+        if changed:
+            self._notify(subscribers, changed)
+            self.schedule_save()
+        return changed
+
+    def _notify(self, subscribers, changed: Set[str]):
+        for fields, callback in subscribers:
+            if fields is None or fields & changed:
+                try:
+                    callback(self.cfg, changed)
+                except Exception as e:
+                    print(f'[Auto-Unzip] Config change handler failed: {e}')
+
+    def schedule_save(self):
+        with self._lock:
+            self._dirty = True
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = threading.Timer(self.save_delay, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def flush(self):
+        """Write pending changes now (also called on shutdown)."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not self._dirty:
+                return
+            self._dirty = False
+            self._saver(self.cfg)
@@ -2,22 +2,60 @@
 extract_7z.py
 -------------
 Defines extract_7z() which extracts .7z archives using py7zr and reports progress.
+
+The whole archive is extracted with a single extractall() call so each solid
+block is decompressed exactly once (extracting member by member makes py7zr
+re-decompress the solid block from its start for every file). Progress is
+reported by uncompressed bytes written, using py7zr's extraction callback
+feeding the shared ProgressTracker.
 """
 import py7zr
+from py7zr.callbacks import ExtractCallback
 import os
+from .progress_tracker import ProgressTracker
+
+
+class _BytesProgressCallback(ExtractCallback):
+    """Feeds py7zr's per-file start/update/end events into a ProgressTracker."""
+    def __init__(self, tracker: ProgressTracker):
+        self.tracker = tracker
+        self.current = 0  # bytes already reported for the file being written
+
+    def report_start_preparation(self):
+        pass
+
+    def report_start(self, processing_file_path, processing_bytes):
+        self.current = 0
+
+    def report_update(self, decompressed_bytes):
+        n = int(decompressed_bytes)
+        self.current += n
+        self.tracker.add_written(n)
+
+    def report_end(self, processing_file_path, wrote_bytes):
+        # Only the part not already covered by report_update
+        rest = int(wrote_bytes) - self.current
+        if rest > 0:
+            self.tracker.add_written(rest)
+        self.current = 0
+
+    def report_warning(self, message):
+        print(f'[Auto-Unzip] 7z warning: {message}')
+
+    def report_postprocess(self):
+        pass
+
 
 def extract_7z(path: str, target_dir: str, progress_cb):
     try:
         with py7zr.SevenZipFile(path, mode='r') as archive:
-            all_files = archive.getnames()
-            total = len(all_files)
-            if total == 0:
+            entries = archive.list()
+            if not entries:
                 return False
-            for idx, name in enumerate(all_files):
-                archive.extract(target_dir, targets=[name])
-                percent = ((idx + 1) / total) * 100.0
-                progress_cb(percent)
-        progress_cb(100.0)
+            total = sum((e.uncompressed or 0) for e in entries if not e.is_directory)
+            tracker = ProgressTracker(progress_cb, total, compressed_total=os.path.getsize(path))
+            archive.extractall(path=target_dir, callback=_BytesProgressCallback(tracker))
+        tracker.finish()
         return True
     except Exception:
         return False
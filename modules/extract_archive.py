@@ -1,29 +1,95 @@
 
-
 """
 extract_archive.py
 ------------------
-Dispatches extraction based on file extension.
-Supports: .zip, .zipx, .7z, .rar, .tar, .gz, .bz2, .tgz, .tbz, .cab
+Dispatches extraction based on the archive's content.
+Supports: .zip, .zipx, .7z, .rar, .tar, .gz, .bz2, .xz, .zst, .tgz, .tbz, .txz, .tzst, .cab
+
+The format is identified by sniff_format() (magic bytes, cached per file)
+and routed through the extractor registry, so misnamed files and compound
+extensions such as .tar.gz are handled correctly. The built-in extractors
+are registered below; other modules can add formats via register_extractor().
+Each extractor module (and its third-party backend, e.g. py7zr) is imported
+on first use so that starting the watcher stays fast.
 """
 import os
-from .extract_zip import extract_zip
-from .extract_7z import extract_7z
-from .extract_rar import extract_rar
-from .extract_tar_gz_bz2 import extract_tar_gz_bz2
-
-def extract_archive(path: str, target_dir: str, progress_cb) -> bool:
-    ext = os.path.splitext(path)[1].lower()
-    if ext == '.zip':
-        return extract_zip(path, target_dir, progress_cb)
-    if ext == '.7z':
-        return extract_7z(path, target_dir, progress_cb)
-    if ext == '.rar':
-        return extract_rar(path, target_dir, progress_cb)
-    if ext in ['.tar', '.gz', '.bz2', '.tgz', '.tbz', '.tar.gz', '.tar.bz2']:
-        return extract_tar_gz_bz2(path, target_dir, progress_cb)
-    if ext == '.cab':
-        from .extract_cab import extract_cab
-        # CAB extraction does not support progress callback
-        return extract_cab(path, target_dir)
-    return False
+import time
+from typing import Optional, Set
+from .config_dataclass import Config
+from .extract_format_registry import get_extractor, register_extractor
+from .extract_sniff_format import sniff_format
+from .metrics_registry import get_metrics
+
+
+def _extract_zip(path, target_dir, progress_cb, cfg, fmt, resume=False, exclude=None, **_):
+    if fmt == 'zipx':
+        from .extract_zipx import extract_zipx
+        return extract_zipx(path, target_dir, progress_cb, resume, exclude)
+    from .extract_zip import extract_zip
+    return extract_zip(path, target_dir, progress_cb, getattr(cfg, 'zip_extract_workers', 1), resume, exclude)
+
+
+def _extract_tar(path, target_dir, progress_cb, cfg, fmt, resume=False, **_):
+    from .extract_tar_gz_bz2 import extract_tar_gz_bz2
+    return extract_tar_gz_bz2(path, target_dir, progress_cb, fmt, getattr(cfg, 'decompression_backend', 'auto'),
+                              getattr(cfg, 'decompression_workers', 0), resume)
+
+
+def _extract_7z(path, target_dir, progress_cb, cfg, fmt, **_):
+    from .extract_7z import extract_7z
+    return extract_7z(path, target_dir, progress_cb)
+
+
+def _extract_rar(path, target_dir, progress_cb, cfg, fmt, **_):
+    from .extract_rar import extract_rar
+    return extract_rar(path, target_dir, progress_cb)
+
+
+def _extract_cab(path, target_dir, progress_cb, cfg, fmt, **_):
+    from .extract_cab import extract_cab
+    return extract_cab(path, target_dir, progress_cb)
+
+
+register_extractor('zip', _extract_zip)
+register_extractor('zipx', _extract_zip)
+register_extractor('7z', _extract_7z)
+register_extractor('rar', _extract_rar)
+for _fmt in ('tar', 'tar.gz', 'tar.bz2', 'tar.xz', 'tar.zst', 'gzip', 'bzip2', 'xz', 'zstd'):
+    register_extractor(_fmt, _extract_tar)
+register_extractor('cab', _extract_cab)
+
+
+def extract_archive(path: str, target_dir: str, progress_cb, cfg: Optional[Config] = None,
+                    resume: bool = False, exclude: Optional[Set[str]] = None) -> bool:
+    """Extract path into target_dir.
+
+    resume=True tells extractors that target_dir may hold the output of an
+    interrupted attempt; zip and tar extractors then skip members that are
+    already complete, the others simply overwrite.
+    exclude names members the caller handles itself (zip/zipx only; nested
+    archives streamed straight out of the outer archive).
+    """
+    fmt = sniff_format(path)
+    extractor = get_extractor(fmt)
+    if extractor is None:
+        print(f"[Auto-Unzip] Unsupported archive format ({fmt or 'unknown'}): {os.path.basename(path)}")
+        return False
+    written = [0]
+
+    def _progress(percent, stats=None):
+        if stats is not None:
+            written[0] = stats.written_bytes
+        progress_cb(percent, stats)
+
+    start = time.perf_counter()
+    ok = extractor(path, target_dir, _progress, cfg, fmt, resume=resume, exclude=exclude)
+    metrics = get_metrics()
+    metrics.observe('autounzip_extract_seconds', time.perf_counter() - start, format=fmt)
+    metrics.inc('autounzip_extractions_total', format=fmt, outcome='success' if ok else 'failed')
+    if ok:
+        try:
+            metrics.inc('autounzip_extract_input_bytes_total', os.path.getsize(path), format=fmt)
+        except OSError:
+            pass
+        metrics.inc('autounzip_extract_output_bytes_total', written[0], format=fmt)
+    return ok
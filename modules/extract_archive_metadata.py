@@ -0,0 +1,110 @@
+"""
+extract_archive_metadata.py
+---------------------------
+Defines read_archive_metadata() which returns the total uncompressed size
+and file count of an archive from its directory/headers only, without
+decompressing payload data:
+
+- zip / zipx: central directory (infolist)
+- 7z: header database (py7zr list)
+- rar: block headers (rarfile infolist), across all volumes
+- cab: CFFILE table
+- tar: member headers (only for uncompressed tar, where skipping data is a seek)
+
+Compressed streams (.tar.gz, .gz, .bz2, .xz, .zst) don't record the size of
+their contents up front, so None is returned for them.
+
+read_archive_metadata_bytes() does the same for an archive held in memory
+(nested archives streamed out of a zip); only zip, 7z and plain tar are read.
+"""
+from __future__ import annotations
+import os
+from dataclasses import dataclass
+from typing import Optional
+
+from .extract_sniff_format import sniff_format
+
+
+@dataclass
+class ArchiveMetadata:
+    uncompressed_bytes: int
+    file_count: int
+    compressed_bytes: int  # size of the archive file(s) on disk
+
+    @property
+    def ratio(self) -> float:
+        return self.uncompressed_bytes / max(1, self.compressed_bytes)
+
+
+def _zip(path):
+    import zipfile
+    with zipfile.ZipFile(path) as zf:
+        files = [m for m in zf.infolist() if not m.is_dir()]
+    return sum(m.file_size for m in files), len(files)
+
+
+def _7z(path):
+    import py7zr
+    with py7zr.SevenZipFile(path, mode='r') as archive:
+        files = [e for e in archive.list() if not e.is_directory]
+    return sum(e.uncompressed or 0 for e in files), len(files)
+
+
+def _rar(path):
+    import rarfile
+    with rarfile.RarFile(path) as rf:
+        files = [m for m in rf.infolist() if not m.is_dir()]
+    return sum(m.file_size for m in files), len(files)
+
+
+def _cab(path):
+    from .extract_cab_reader import CabArchive
+    with CabArchive(path) as cab:
+        return cab.total_size, len(cab.files)
+
+
+def _tar(path):
+    import tarfile
+    total = count = 0
+    opened = tarfile.open(path, 'r:') if isinstance(path, str) else tarfile.open(fileobj=path, mode='r:')
+    with opened as tf:
+        for m in tf:
+            if m.isfile():
+                total += m.size
+                count += 1
+            tf.members = []
+    return total, count
+
+
+_READERS = {'zip': _zip, 'zipx': _zip, '7z': _7z, 'rar': _rar, 'cab': _cab, 'tar': _tar}
+_BYTES_READERS = {'zip': _zip, 'zipx': _zip, '7z': _7z, 'tar': _tar}
+
+
+def read_archive_metadata(path: str, fmt: Optional[str] = None) -> Optional[ArchiveMetadata]:
+    """Metadata for the archive at path, or None if the format doesn't record it (or it can't be read)."""
+    fmt = fmt or sniff_format(path)
+    reader = _READERS.get(fmt)
+    if reader is None:
+        return None
+    try:
+        uncompressed, count = reader(path)
+    except Exception:
+        return None  # unreadable headers; the extractor will report the real error
+    compressed = os.path.getsize(path)
+    if fmt == 'rar':
+        from .extract_rar_volumes import rar_volume_set
+        compressed = sum(os.path.getsize(v) for v in (rar_volume_set(path) or [path]))
+    return ArchiveMetadata(uncompressed, count, compressed)
+
+
+def read_archive_metadata_bytes(data: bytes, fmt: str) -> Optional[ArchiveMetadata]:
+    """Metadata for an archive held in memory, or None if it can't be read up front."""
+    import io
+    reader = _BYTES_READERS.get(fmt)
+    if reader is None:
+        return None
+    try:
+        uncompressed, count = reader(io.BytesIO(data))
+    except Exception:
+        return None
+    return ArchiveMetadata(uncompressed, count, len(data))
@@ -1,28 +1,104 @@
+"""
+extract_cab.py
+--------------
+Defines extract_cab() which extracts a .cab archive.
+
+Cabinets stored uncompressed or with MSZIP (by far the most common) are
+decoded in-process by CabArchive, with progress reported like the other
+extractors and no helper process per archive. LZX / Quantum cabinets and
+multi-cabinet sets are handed to `cabextract` when it is on PATH, otherwise
+to the Windows built-in `expand` command.
+"""
 import os
 import shutil
-import tempfile
 import subprocess
+from typing import Optional
+from .extract_cab_reader import CabArchive
+from .progress_tracker import ProgressTracker
+
+
+def _run_cabextract(exe, archive_path, extract_to, cab: Optional[CabArchive], progress_cb):
+    sizes = {}
+    if cab is not None:
+        for f in cab.files:
+            sizes[f.name.replace('\\', '/')] = f.size
+    tracker = ProgressTracker(progress_cb, sum(sizes.values()) or None, compressed_total=os.path.getsize(archive_path))
+    prefix = os.path.join(extract_to, '').replace('\\', '/')
+    proc = subprocess.Popen([exe, '-d', extract_to, archive_path], stdout=subprocess.PIPE,
+                            stderr=subprocess.PIPE, text=True, errors='replace')
+    # One "  extracting <dir>/<name>" line per file as it is written
+    for line in proc.stdout:
+        line = line.strip()
+        if line.startswith('extracting '):
+            name = line[len('extracting '):].replace('\\', '/')
+            if name.startswith(prefix):
+                name = name[len(prefix):]
+            tracker.add_written(sizes.get(name, 0))
+    err = proc.stderr.read()
+    if proc.wait() != 0:
+        print(f"Error extracting CAB file: {err}")
+        return False
+    tracker.finish()
+    return True
+
+
+def _run_expand(archive_path, extract_to):
+    # Use Windows 'expand' command (no progress reporting)
+    kwargs = {'creationflags': subprocess.CREATE_NO_WINDOW} if os.name == 'nt' else {}
+    result = subprocess.run([
+        'expand', archive_path, '-F:*', extract_to
+    ], capture_output=True, text=True, **kwargs)
+    if result.returncode != 0:
+        print(f"Error extracting CAB file: {result.stderr}")
+        return False
+    return True
 
-def extract_cab(archive_path, extract_to):
+
+def extract_cab(archive_path, extract_to, progress_cb=None):
     """
     Extracts a CAB (.cab) archive to the specified directory.
-    Uses Windows built-in 'expand' command for extraction.
+    Uses the built-in MSZIP decoder when possible, else cabextract or Windows 'expand'.
     """
     if not os.path.isfile(archive_path):
         print(f"CAB file not found: {archive_path}")
         return False
     if not os.path.exists(extract_to):
         os.makedirs(extract_to)
+    progress_cb = progress_cb or (lambda *a: None)
+    cab = None
+    try:
+        cab = CabArchive(archive_path)
+        if cab.supported:
+            tracker = ProgressTracker(progress_cb, cab.total_size, compressed_total=os.path.getsize(archive_path))
+
+            def _on_write(n, position):
+                tracker.add_written(n)
+                tracker.set_consumed(position)
+
+            cab.extractall(extract_to, _on_write)
+            tracker.finish()
+            print(f"Extracted CAB file to: {extract_to}")
+            return True
+    except Exception as e:
+        if cab is not None and cab.supported:
+            print(f"Exception during CAB extraction: {e}")
+            return False
+        # Header not understood: let the external tools have a go
+    finally:
+        if cab is not None:
+            cab.close()
     try:
-        # Use Windows 'expand' command
-        result = subprocess.run([
-            'expand', archive_path, '-F:*', extract_to
-        ], capture_output=True, text=True)
-        if result.returncode != 0:
-            print(f"Error extracting CAB file: {result.stderr}")
+        exe = shutil.which('cabextract')
+        if exe:
+            ok = _run_cabextract(exe, archive_path, extract_to, cab, progress_cb)
+        elif os.name == 'nt':
+            ok = _run_expand(archive_path, extract_to)
+        else:
+            print("Error extracting CAB file: LZX/Quantum cabinets need 'cabextract' on PATH")
             return False
-        print(f"Extracted CAB file to: {extract_to}")
-        return True
+        if ok:
+            print(f"Extracted CAB file to: {extract_to}")
+        return ok
     except Exception as e:
         print(f"Exception during CAB extraction: {e}")
         return False
@@ -0,0 +1,221 @@
+"""
+extract_cab_reader.py
+---------------------
+Defines CabArchive, a pure-Python reader for Microsoft Cabinet (.cab) files.
+
+Parses the CFHEADER / CFFOLDER / CFFILE tables and decodes folders stored
+uncompressed or with MSZIP (deflate blocks whose 32 KB history carries over
+from one CFDATA block to the next, decoded with zlib). Quantum and LZX
+folders and cabinets spanning several files are reported through
+`supported` so the caller can use an external tool instead.
+
+Folders are decoded as a stream: each CFDATA block (at most 32 KB) is
+written straight to the files it covers, so memory use does not depend on
+archive size.
+"""
+from __future__ import annotations
+import os
+import struct
+import zlib
+from dataclasses import dataclass
+from typing import Callable, List, Optional
+
+_HEADER = struct.Struct('<4sIIIIIBBHHHHH')
+_FOLDER = struct.Struct('<IHH')
+_FILE = struct.Struct('<IIHHHH')
+_DATA = struct.Struct('<IHH')
+
+_FLAG_PREV_CABINET = 0x1
+_FLAG_NEXT_CABINET = 0x2
+_FLAG_RESERVE_PRESENT = 0x4
+_ATTR_NAME_IS_UTF = 0x80
+
+COMPRESS_NONE = 0
+COMPRESS_MSZIP = 1
+COMPRESS_QUANTUM = 2
+COMPRESS_LZX = 3
+_HISTORY = 32 * 1024
+
+
+@dataclass
+class CabFolder:
+    data_offset: int
+    block_count: int
+    compression: int
+
+
+@dataclass
+class CabFile:
+    name: str
+    size: int
+    folder_offset: int
+    folder: int
+    date: int
+    time: int
+
+    @property
+    def mtime(self) -> Optional[float]:
+        """Local modification time from the DOS date/time fields, or None if invalid."""
+        import time as _time
+        try:
+            return _time.mktime((((self.date >> 9) & 0x7F) + 1980, (self.date >> 5) & 0x0F, self.date & 0x1F,
+                                 (self.time >> 11) & 0x1F, (self.time >> 5) & 0x3F, (self.time & 0x1F) * 2,
+                                 0, 0, -1))
+        except (OverflowError, ValueError):
+            return None
+
+
+def _read_cstring(f) -> bytes:
+    out = bytearray()
+    while True:
+        c = f.read(1)
+        if not c or c == b'\0':
+            return bytes(out)
+        out += c
+
+
+def _safe_relpath(name: str) -> str:
+    """Turn a stored CAB name into a relative path that cannot leave the target dir."""
+    parts = name.replace('\\', '/').split('/')
+    parts = [p for p in parts if p not in ('', '.', '..') and not p.endswith(':')]
+    return os.path.join(*parts) if parts else ''
+
+
+class CabArchive:
+    """Read-only view of a cabinet file; use as a context manager."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._f = open(path, 'rb')
+        try:
+            self._parse()
+        except Exception:
+            self._f.close()
+            raise
+
+    def _parse(self):
+        f = self._f
+        raw = f.read(_HEADER.size)
+        if len(raw) < _HEADER.size:
+            raise ValueError('Truncated CAB header')
+        (sig, _, self.size, _, files_offset, _, _, _, n_folders, n_files, flags, _, _) = _HEADER.unpack(raw)
+        if sig != b'MSCF':
+            raise ValueError('Not a CAB file')
+        folder_reserve = data_reserve = 0
+        if flags & _FLAG_RESERVE_PRESENT:
+            header_reserve, folder_reserve, data_reserve = struct.unpack('<HBB', f.read(4))
+            f.seek(header_reserve, os.SEEK_CUR)
+        if flags & _FLAG_PREV_CABINET:
+            _read_cstring(f)
+            _read_cstring(f)
+        if flags & _FLAG_NEXT_CABINET:
+            _read_cstring(f)
+            _read_cstring(f)
+        self.spanned = bool(flags & (_FLAG_PREV_CABINET | _FLAG_NEXT_CABINET))
+        self._data_reserve = data_reserve
+        self.folders: List[CabFolder] = []
+        for _ in range(n_folders):
+            offset, blocks, compression = _FOLDER.unpack(f.read(_FOLDER.size))
+            f.seek(folder_reserve, os.SEEK_CUR)
+            self.folders.append(CabFolder(offset, blocks, compression & 0x0F))
+        f.seek(files_offset)
+        self.files: List[CabFile] = []
+        for _ in range(n_files):
+            size, folder_offset, folder, date, time_, attribs = _FILE.unpack(f.read(_FILE.size))
+            raw_name = _read_cstring(f)
+            name = raw_name.decode('utf-8' if attribs & _ATTR_NAME_IS_UTF else 'cp437', errors='replace')
+            self.files.append(CabFile(name, size, folder_offset, folder, date, time_))
+
+    @property
+    def supported(self) -> bool:
+        """Whether extractall() can decode this cabinet without external tools."""
+        return (not self.spanned
+                and all(f.compression in (COMPRESS_NONE, COMPRESS_MSZIP) for f in self.folders)
+                and all(f.folder < len(self.folders) for f in self.files))
+
+    @property
+    def total_size(self) -> int:
+        return sum(f.size for f in self.files)
+
+    def _blocks(self, folder: CabFolder):
+        """Yield the decoded data of each CFDATA block in folder."""
+        f = self._f
+        f.seek(folder.data_offset)
+        history = b''
+        for _ in range(folder.block_count):
+            header = f.read(_DATA.size)
+            if len(header) < _DATA.size:
+                raise ValueError('Truncated CAB data block')
+            _, packed, unpacked = _DATA.unpack(header)
+            f.seek(self._data_reserve, os.SEEK_CUR)
+            data = f.read(packed)
+            if len(data) != packed:
+                raise ValueError('Truncated CAB data block')
+            if folder.compression == COMPRESS_MSZIP:
+                if data[:2] != b'CK':
+                    raise ValueError('Bad MSZIP block signature')
+                d = zlib.decompressobj(-zlib.MAX_WBITS, zdict=history) if history else zlib.decompressobj(-zlib.MAX_WBITS)
+                data = d.decompress(data[2:]) + d.flush()
+                history = (history + data)[-_HISTORY:]
+            if len(data) != unpacked:
+                raise ValueError('CAB data block has the wrong size')
+            yield data
+
+    def extractall(self, target_dir: str, on_write: Optional[Callable[[int, int], None]] = None):
+        """Extract every file into target_dir.
+
+        on_write(bytes_written, compressed_position) is called after each
+        block so callers can report progress.
+        """
+        os.makedirs(target_dir, exist_ok=True)
+        base = os.path.abspath(target_dir)
+        for index, folder in enumerate(self.folders):
+            members = sorted((m for m in self.files if m.folder == index), key=lambda m: m.folder_offset)
+            self._extract_folder(folder, members, base, on_write)
+
+    def _extract_folder(self, folder: CabFolder, members: List[CabFile], base: str, on_write):
+        # Members are laid out back to back, so only one output file is open at a time
+        blocks = self._blocks(folder)
+        data = b''
+        pos = 0  # folder offset of data[0]
+        for m in members:
+            rel = _safe_relpath(m.name)
+            target = os.path.join(base, rel) if rel else None
+            if target is not None:
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+            start, stop = m.folder_offset, m.folder_offset + m.size
+            written = 0
+            out = open(target, 'wb') if target is not None else None
+            try:
+                while True:
+                    lo = max(start, pos)
+                    hi = min(stop, pos + len(data))
+                    if lo < hi:
+                        if out is not None:
+                            out.write(data[lo - pos:hi - pos])
+                        written += hi - lo
+                    if stop <= pos + len(data):
+                        break
+                    pos += len(data)
+                    data = next(blocks, None)
+                    if data is None:
+                        break
+                    if on_write is not None:
+                        on_write(len(data), self._f.tell())
+            finally:
+                if out is not None:
+                    out.close()
+            if written != m.size:
+                raise ValueError(f'CAB member {m.name!r} is truncated')
+            mtime = m.mtime
+            if target is not None and mtime is not None:
+                os.utime(target, (mtime, mtime))
+
+    def close(self):
+        self._f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,142 @@
+"""
+extract_decompress_external.py
+------------------------------
+Defines ExternalDecompressReader, a read-only file object over the output of
+a system decompressor (pigz, lbzip2, pbzip2, xz, zstd) and
+find_external_decompressor() which picks the tool for a codec from PATH.
+
+The archive is fed to the tool's stdin from a background thread rather than
+passed by name, so the number of compressed bytes consumed is known for
+progress reporting. stderr is drained by a second thread (StderrTail), so a
+tool that writes a lot of diagnostics cannot block on a full pipe. A
+non-zero exit status surfaces as OSError on the read that reaches end of
+stream.
+"""
+from __future__ import annotations
+import os
+import shutil
+import subprocess
+import threading
+from typing import List, Optional
+
+_FEED_CHUNK = 1024 * 1024
+_STDERR_TAIL = 4096  # bytes of a tool's stderr kept for the error message
+
+# Tried in order; {n} is replaced by the worker count
+_TOOLS = {
+    'gzip': (('pigz', ['-dc', '-p', '{n}']),),
+    'bzip2': (('lbzip2', ['-dc', '-n', '{n}']), ('pbzip2', ['-dc', '-p{n}'])),
+    'xz': (('xz', ['-dc', '-T', '{n}']),),
+    'zstd': (('zstd', ['-dcq']),),
+}
+
+
+def find_external_decompressor(codec: str, workers: int, exclude=()) -> Optional[List[str]]:
+    """Return the command line for the first available tool for codec, or None."""
+    for name, args in _TOOLS.get(codec, ()):
+        if name in exclude:
+            continue
+        exe = shutil.which(name)
+        if exe:
+            return [exe] + [a.replace('{n}', str(workers)) for a in args]
+    return None
+
+
+class StderrTail:
+    """Read a child process's stderr on a background thread, keeping the last part."""
+
+    def __init__(self, stream, name: str):
+        self._stream = stream
+        self._buf = bytearray()
+        self._thread = threading.Thread(target=self._drain, name=f'Stderr-{name}', daemon=True)
+        self._thread.start()
+
+    def _drain(self):
+        try:
+            for chunk in iter(lambda: self._stream.read1(_FEED_CHUNK), b''):
+                self._buf += chunk
+                del self._buf[:-_STDERR_TAIL]
+        except (OSError, ValueError):
+            pass  # stream closed
+
+    def text(self) -> str:
+        """Everything kept so far, once the process has closed stderr."""
+        self._thread.join()
+        return self._buf.decode(errors='replace').strip()
+
+
+class ExternalDecompressReader:
+    """Stream the decompressed output of cmd run over the file at path."""
+
+    backend = 'external'
+
+    def __init__(self, path: str, cmd: List[str]):
+        self._raw = open(path, 'rb')
+        kwargs = {}
+        if os.name == 'nt':
+            kwargs['creationflags'] = subprocess.CREATE_NO_WINDOW
+        try:
+            self._proc = subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                          stderr=subprocess.PIPE, **kwargs)
+        except Exception:
+            self._raw.close()
+            raise
+        self._name = os.path.basename(cmd[0])
+        self._stderr = StderrTail(self._proc.stderr, self._name)
+        self.consumed = 0
+        self.closed = False
+        self._feeder = threading.Thread(target=self._feed, name=f'Decompress-{self._name}', daemon=True)
+        self._feeder.start()
+
+    def _feed(self):
+        try:
+            while True:
+                chunk = self._raw.read(_FEED_CHUNK)
+                if not chunk:
+                    break
+                self._proc.stdin.write(chunk)
+                self.consumed += len(chunk)
+        except (OSError, ValueError):
+            pass  # tool exited early or reader closed; reported through the exit status
+        finally:
+            try:
+                self._proc.stdin.close()
+            except OSError:
+                pass
+
+    def read(self, size: int = -1) -> bytes:
+        data = self._proc.stdout.read(size)
+        if not data and size != 0:
+            self._check_exit()
+        return data
+
+    def readinto(self, b) -> int:
+        n = self._proc.stdout.readinto(b)
+        if not n and len(b):
+            self._check_exit()
+        return n
+
+    def _check_exit(self):
+        self._feeder.join()
+        err = self._stderr.text()
+        if self._proc.wait() != 0:
+            raise OSError(f'{self._name} failed ({self._proc.returncode}): {err}')
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        if self._proc.poll() is None:
+            self._proc.kill()
+        self._proc.wait()
+        self._feeder.join()
+        self._stderr.text()
+        for stream in (self._proc.stdout, self._proc.stderr):
+            stream.close()
+        self._raw.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
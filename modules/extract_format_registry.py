@@ -0,0 +1,33 @@
+"""
+extract_format_registry.py
+--------------------------
+Provides register_extractor() / get_extractor(), the table extract_archive()
+uses to route a sniffed format id (see sniff_format) to an extractor.
+
+Registered extractors are called as
+    fn(path, target_dir, progress_cb, cfg, fmt, resume=False, exclude=None) -> bool
+where cfg may be None and fmt is the sniffed id, so one function can serve
+several related formats (e.g. all tar/gzip/bzip2/xz variants). resume=True
+means target_dir may already hold part of the output from an interrupted
+attempt; extractors that cannot skip finished members just overwrite them.
+exclude is a set of member names to leave out, honoured where the format
+allows it. Extractors should accept (and ignore) unknown keyword options.
+"""
+from __future__ import annotations
+import threading
+from typing import Callable, Dict, Optional
+
+Extractor = Callable[..., bool]
+
+_extractors: Dict[str, Extractor] = {}
+_lock = threading.Lock()
+
+def register_extractor(fmt: str, fn: Extractor) -> None:
+    """Register (or replace) the extractor for format id fmt."""
+    with _lock:
+        _extractors[fmt] = fn
+
+def get_extractor(fmt: Optional[str]) -> Optional[Extractor]:
+    if fmt is None:
+        return None
+    return _extractors.get(fmt)
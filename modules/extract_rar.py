@@ -1,23 +1,114 @@
 """
 extract_rar.py
 --------------
-Defines extract_rar() which extracts .rar archives using rarfile.
-Requires 'unrar' tool to be installed and available in PATH.
+Defines extract_rar() which extracts .rar archives (including multi-volume
+sets, given their first volume).
+
+When the `unrar` tool is available the whole archive is extracted by a
+single `unrar x` process whose streaming output drives progress (its
+running percentage plus the size of each file it reports as OK). Without it
+the archive is extracted member by member through rarfile, which starts one
+helper process per compressed member.
 """
 import rarfile
 import os
+import re
+import shutil
+import subprocess
+from typing import Optional
+from .extract_decompress_external import StderrTail
+from .extract_rar_volumes import rar_volume_set
+from .progress_tracker import ProgressTracker
+
+_PERCENT_RE = re.compile(rb'(\d{1,3})%')
+_WINRAR_UNRAR = os.path.join(os.environ.get('ProgramFiles', r'C:\Program Files'), 'WinRAR', 'UnRAR.exe')
+
+
+def find_unrar() -> Optional[str]:
+    """Path of the unrar executable (rarfile.UNRAR_TOOL, or WinRAR's UnRAR.exe), or None."""
+    tool = shutil.which(rarfile.UNRAR_TOOL) or shutil.which('unrar')
+    if tool is None and os.name == 'nt' and os.path.isfile(_WINRAR_UNRAR):
+        tool = _WINRAR_UNRAR
+    return tool
+
+
+class _UnrarProgress:
+    """Turns unrar console output into ProgressTracker updates."""
+
+    def __init__(self, tracker: ProgressTracker, sizes: dict, total: int):
+        self.tracker = tracker
+        self.sizes = sizes
+        self.total = total
+        self.done_files = 0  # bytes of files unrar reported as OK
+        self.percent = 0
+        self.reported = 0
+        self._pending = b''
+
+    def feed(self, chunk: bytes):
+        # The running total percentage is redrawn in place with backspaces;
+        # file lines ("Extracting  name ... OK") end with a newline
+        for m in _PERCENT_RE.finditer(chunk):
+            self.percent = max(self.percent, min(100, int(m.group(1))))
+        lines = (self._pending + chunk.replace(b'\r', b'\n')).split(b'\n')
+        self._pending = lines.pop()
+        for line in lines:
+            text = _PERCENT_RE.sub(b'', line.replace(b'\b', b'')).decode('utf-8', errors='replace').strip()
+            if text.startswith('Extracting  ') and text.endswith('OK'):
+                name = text[len('Extracting  '):-2].strip().replace('\\', '/')
+                self.done_files += self.sizes.get(name, 0)
+        self._update()
+
+    def _update(self):
+        written = max(self.done_files, self.total * self.percent // 100)
+        if written > self.reported:
+            self.tracker.add_written(written - self.reported)
+            self.reported = written
+
+
+def _extract_with_unrar(tool: str, path: str, target_dir: str, tracker: ProgressTracker, sizes: dict, total: int):
+    os.makedirs(target_dir, exist_ok=True)
+    cmd = [tool, 'x', '-y', '-o+', '-idc', '-p-', path, os.path.join(os.path.abspath(target_dir), '')]
+    kwargs = {'creationflags': subprocess.CREATE_NO_WINDOW} if os.name == 'nt' else {}
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, **kwargs)
+    # Read on its own thread: many damaged/encrypted members can fill the pipe while stdout is read
+    stderr = StderrTail(proc.stderr, 'unrar')
+    progress = _UnrarProgress(tracker, sizes, total)
+    try:
+        while True:
+            chunk = proc.stdout.read1(64 * 1024)
+            if not chunk:
+                break
+            progress.feed(chunk)
+        progress.feed(b'\n')
+    except BaseException:
+        proc.kill()
+        raise
+    finally:
+        proc.stdout.close()
+        err = stderr.text()
+        proc.stderr.close()
+    if proc.wait() != 0:
+        raise rarfile.Error(f'unrar exited with {proc.returncode}: {err}')
+
 
 def extract_rar(path: str, target_dir: str, progress_cb):
     try:
+        volumes = rar_volume_set(path) or [path]
         with rarfile.RarFile(path) as rf:
             members = rf.infolist()
-            total = sum(m.file_size for m in members) or 1
-            extracted = 0
-            for m in members:
-                rf.extract(m, target_dir)
-                extracted += m.file_size
-                progress_cb(min(100.0, (extracted / total) * 100.0))
-        progress_cb(100.0)
+            total = sum(m.file_size for m in members)
+            tracker = ProgressTracker(progress_cb, total,
+                                      compressed_total=sum(os.path.getsize(v) for v in volumes if os.path.exists(v)))
+            tool = find_unrar()
+            if tool:
+                sizes = {m.filename: m.file_size for m in members if not m.is_dir()}
+                _extract_with_unrar(tool, path, target_dir, tracker, sizes, total)
+            else:
+                for m in members:
+                    rf.extract(m, target_dir)
+                    tracker.add_consumed(m.compress_size)
+                    tracker.add_written(m.file_size)
+        tracker.finish()
         return True
     except Exception:
         return False
@@ -0,0 +1,200 @@
+"""
+extract_rar_volumes.py
+----------------------
+Helpers for multi-volume RAR sets ("name.part1.rar, name.part2.rar, ..." and
+the older "name.rar, name.r00, name.r01, ..." scheme).
+
+rar_volume_set() walks a set from its first volume, reading only block
+headers: each volume's end-of-archive block says whether another volume
+follows (RAR5 end flag 0x1, RAR4 ENDARC flag EARC_NEXT_VOLUME). The set is
+complete once a volume without that flag is reached; a missing or truncated
+volume means the download is still in progress.
+"""
+from __future__ import annotations
+import os
+import re
+import struct
+from typing import List, Optional
+
+_RAR4_SIGNATURE = b'Rar!\x1a\x07\x00'
+_RAR5_SIGNATURE = b'Rar!\x1a\x07\x01\x00'
+
+_PART_RE = re.compile(r'^(?P<stem>.*)\.part(?P<num>\d+)\.rar$', re.IGNORECASE)
+_OLD_RE = re.compile(r'^(?P<stem>.*)\.(?P<letter>[rs])(?P<num>\d\d)$', re.IGNORECASE)
+
+_RAR4_BLOCK = struct.Struct('<HBHH')
+_RAR4_MAIN, _RAR4_FILE, _RAR4_END = 0x73, 0x74, 0x7B
+_RAR4_MHD_VOLUME = 0x0001
+_RAR4_MHD_PASSWORD = 0x0080
+_RAR4_LONG_BLOCK = 0x8000
+_RAR4_LHD_LARGE = 0x0100
+_RAR4_EARC_NEXT_VOLUME = 0x0001
+
+_RAR5_MAIN, _RAR5_ENCRYPTION, _RAR5_END = 1, 4, 5
+_RAR5_HFL_EXTRA, _RAR5_HFL_DATA = 0x1, 0x2
+_RAR5_MHFL_VOLUME = 0x1
+_RAR5_EHFL_NEXTVOLUME = 0x1
+
+# Volume state when the headers can't tell (encrypted, or RAR 2.x without end blocks)
+_UNKNOWN = (True, None)
+
+
+def is_rar_volume_name(name: str) -> bool:
+    """Whether name looks like part of a multi-volume set (not a plain .rar)."""
+    base = os.path.basename(name)
+    return bool(_PART_RE.match(base) or _OLD_RE.match(base))
+
+
+def first_rar_volume(path: str) -> str:
+    """Path of the first volume of the set path belongs to (path itself if not a volume name)."""
+    folder, base = os.path.split(path)
+    m = _PART_RE.match(base)
+    if m:
+        num = m.group('num')
+        return os.path.join(folder, f"{m.group('stem')}.part{1:0{len(num)}d}.rar")
+    m = _OLD_RE.match(base)
+    if m:
+        return os.path.join(folder, m.group('stem') + '.rar')
+    return path
+
+
+def rar_set_stem(path: str) -> str:
+    """Archive name without volume/extension suffixes ('movie.part01.rar' -> 'movie')."""
+    base = os.path.basename(path)
+    for regex in (_PART_RE, _OLD_RE):
+        m = regex.match(base)
+        if m:
+            return m.group('stem')
+    return os.path.splitext(base)[0]
+
+
+def _next_volume(path: str) -> str:
+    folder, base = os.path.split(path)
+    m = _PART_RE.match(base)
+    if m:
+        num = m.group('num')
+        return os.path.join(folder, f"{m.group('stem')}.part{int(num) + 1:0{len(num)}d}.rar")
+    m = _OLD_RE.match(base)
+    if m:
+        num = int(m.group('num')) + 1
+        letter = m.group('letter')
+        if num > 99:
+            num, letter = 0, chr(ord(letter) + 1)
+        return os.path.join(folder, f"{m.group('stem')}.{letter}{num:02d}")
+    stem, _ = os.path.splitext(base)
+    return os.path.join(folder, stem + '.r00')
+
+
+def _vint(buf: bytes, pos: int):
+    value = shift = 0
+    while True:
+        if pos >= len(buf):
+            raise ValueError('Truncated vint')
+        b = buf[pos]
+        pos += 1
+        value |= (b & 0x7F) << shift
+        if not b & 0x80:
+            return value, pos
+        shift += 7
+
+
+def _scan_rar5(f, size: int):
+    """Return (is_volume, has_next) for a RAR5 volume; None if it is truncated."""
+    pos = len(_RAR5_SIGNATURE)
+    is_volume = False
+    while pos < size:
+        f.seek(pos + 4)  # skip header CRC
+        header_size, p = _vint(f.read(3), 0)
+        header_start = pos + 4 + p
+        f.seek(header_start)
+        header = f.read(header_size)
+        if len(header) != header_size:
+            return None
+        htype, p = _vint(header, 0)
+        flags, p = _vint(header, p)
+        if flags & _RAR5_HFL_EXTRA:
+            _, p = _vint(header, p)
+        data_size = 0
+        if flags & _RAR5_HFL_DATA:
+            data_size, p = _vint(header, p)
+        if htype == _RAR5_ENCRYPTION:
+            return _UNKNOWN  # encrypted headers: nothing more can be read
+        if htype == _RAR5_MAIN:
+            archive_flags, _ = _vint(header, p)
+            is_volume = bool(archive_flags & _RAR5_MHFL_VOLUME)
+        elif htype == _RAR5_END:
+            end_flags, _ = _vint(header, p)
+            return is_volume, bool(end_flags & _RAR5_EHFL_NEXTVOLUME)
+        pos = header_start + header_size + data_size
+    return None  # no end block: truncated
+
+
+def _scan_rar4(f, size: int):
+    """Return (is_volume, has_next) for a RAR4 volume; None if it is truncated."""
+    pos = len(_RAR4_SIGNATURE)
+    is_volume = False
+    while pos + _RAR4_BLOCK.size <= size:
+        f.seek(pos)
+        head = f.read(36)
+        _, htype, flags, head_size = _RAR4_BLOCK.unpack_from(head)
+        if head_size < _RAR4_BLOCK.size:
+            return None
+        add_size = 0
+        if flags & _RAR4_LONG_BLOCK and len(head) >= 11:
+            add_size = struct.unpack_from('<I', head, 7)[0]
+            if htype == _RAR4_FILE and flags & _RAR4_LHD_LARGE and len(head) >= 36:
+                add_size |= struct.unpack_from('<I', head, 32)[0] << 32
+        if htype == _RAR4_MAIN:
+            if flags & _RAR4_MHD_PASSWORD:
+                return _UNKNOWN
+            is_volume = bool(flags & _RAR4_MHD_VOLUME)
+        elif htype == _RAR4_END:
+            return is_volume, bool(flags & _RAR4_EARC_NEXT_VOLUME)
+        pos += head_size + add_size
+    if pos == size:
+        return _UNKNOWN if is_volume else (False, False)  # RAR 2.x volumes have no end block
+    return None
+
+
+def _volume_state(path: str):
+    try:
+        size = os.path.getsize(path)
+        with open(path, 'rb') as f:
+            sig = f.read(len(_RAR5_SIGNATURE))
+            if sig == _RAR5_SIGNATURE:
+                return _scan_rar5(f, size)
+            if sig.startswith(_RAR4_SIGNATURE):
+                return _scan_rar4(f, size)
+    except (OSError, ValueError, struct.error):
+        pass
+    return None
+
+
+def rar_volume_set(first: str) -> Optional[List[str]]:
+    """All volume paths of the set starting at first, or None while it is incomplete.
+
+    A plain (single-volume) archive returns [first]. When the headers can't
+    tell whether more volumes follow (encrypted headers, RAR 2.x), every
+    consecutive volume present on disk is returned.
+    """
+    volumes = [first]
+    current = first
+    while True:
+        state = _volume_state(current)
+        nxt = _next_volume(current)
+        if state is None:
+            if current == first and not is_rar_volume_name(first) and not os.path.isfile(nxt):
+                return volumes  # lone unreadable .rar: let the extractor report the problem
+            return None  # missing or truncated volume
+        is_volume, has_next = state
+        if has_next is None:
+            while os.path.isfile(nxt):
+                volumes.append(nxt)
+                nxt = _next_volume(nxt)
+            return volumes
+        if not is_volume or not has_next:
+            return volumes
+        if not os.path.isfile(nxt):
+            return None
+        volumes.append(nxt)
+        current = nxt
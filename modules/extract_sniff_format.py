@@ -0,0 +1,158 @@
+"""
+extract_sniff_format.py
+-----------------------
+Provides sniff_format() which identifies an archive's format from its magic
+bytes rather than its file name. The first few KB are read once; for gzip
+and xz streams that prefix is also decompressed far enough to see whether a
+tar header follows, so '.tgz' / '.tar.gz' / misnamed tarballs are told apart
+from single compressed files without a second pass over the file.
+
+Returned ids: 'zip', 'zipx', '7z', 'rar', 'cab', 'tar', 'tar.gz', 'tar.bz2',
+'tar.xz', 'tar.zst', 'gzip', 'bzip2', 'xz', 'zstd', or None.
+
+bzip2 cannot be decoded from a short prefix (a whole 100-900 KB block is
+needed), so bzip2 streams are reported as 'tar.bz2' only when the name says
+so; extractors double-check the first decompressed block.
+
+Results are cached per (path, size, mtime) so repeated lookups for the same
+archive (watcher, pre-flight, extractor) don't reopen the file.
+"""
+from __future__ import annotations
+import functools
+import lzma
+import os
+import zlib
+from typing import Optional
+
+SNIFF_BYTES = 8192
+
+_TAR_NAME_HINTS = {
+    'gzip': ('.tar.gz', '.tgz'),
+    'bzip2': ('.tar.bz2', '.tbz', '.tbz2'),
+    'xz': ('.tar.xz', '.txz'),
+    'zstd': ('.tar.zst', '.tzst'),
+}
+
+# Used when the content is not recognised
+_NAME_FALLBACK = (
+    ('.tar.gz', 'tar.gz'), ('.tgz', 'tar.gz'), ('.tar.bz2', 'tar.bz2'), ('.tbz2', 'tar.bz2'), ('.tbz', 'tar.bz2'),
+    ('.tar.xz', 'tar.xz'), ('.txz', 'tar.xz'), ('.tar.zst', 'tar.zst'), ('.tzst', 'tar.zst'), ('.tar', 'tar'),
+    ('.zipx', 'zipx'), ('.zip', 'zip'), ('.7z', '7z'), ('.rar', 'rar'), ('.cab', 'cab'), ('.gz', 'gzip'),
+    ('.bz2', 'bzip2'), ('.xz', 'xz'), ('.zst', 'zstd'),
+)
+
+
+def _is_tar_header(block: bytes) -> bool:
+    """Whether block starts with a tar header: 'ustar' magic, or a valid header
+    checksum for pre-POSIX (V7) tars that have no magic."""
+    if len(block) < 512:
+        return False
+    if block[257:262] == b'ustar':
+        return True
+    field = block[148:156].split(b'\0', 1)[0].strip()
+    try:
+        stored = int(field, 8)
+    except ValueError:
+        return False
+    # Checksum = sum of the header bytes with the checksum field read as spaces;
+    # some old tars summed signed chars
+    header = block[:148] + b' ' * 8 + block[156:512]
+    return stored in (sum(header), sum(b - 256 if b > 127 else b for b in header))
+
+
+def _compressed_tar(kind: str, head: bytes, lower_name: str) -> bool:
+    """Whether the compressed stream in head appears to wrap a tar archive."""
+    try:
+        if kind == 'gzip':
+            out = zlib.decompressobj(16 + zlib.MAX_WBITS).decompress(head, 512)
+            if len(out) >= 512:
+                return _is_tar_header(out)
+        elif kind == 'xz':
+            out = lzma.LZMADecompressor().decompress(head, 512)
+            if len(out) >= 512:
+                return _is_tar_header(out)
+    except Exception:
+        pass
+    # Not decodable from the prefix (bzip2, zstd, tiny files): trust the name
+    return lower_name.endswith(_TAR_NAME_HINTS[kind])
+
+
+def _detect(head: bytes, lower_name: str) -> Optional[str]:
+    if head.startswith((b'PK\x03\x04', b'PK\x05\x06', b'PK\x07\x08')):
+        return 'zipx' if lower_name.endswith('.zipx') else 'zip'
+    if head.startswith(b"7z\xbc\xaf'\x1c"):
+        return '7z'
+    if head.startswith(b'Rar!\x1a\x07'):
+        return 'rar'
+    if head.startswith(b'MSCF'):
+        return 'cab'
+    kind = None
+    if head.startswith(b'\x1f\x8b'):
+        kind = 'gzip'
+    elif head.startswith(b'BZh') and head[3:4].isdigit():
+        kind = 'bzip2'
+    elif head.startswith(b'\xfd7zXZ\x00'):
+        kind = 'xz'
+    elif head.startswith(b'\x28\xb5\x2f\xfd'):
+        kind = 'zstd'
+    if kind is not None:
+        if _compressed_tar(kind, head, lower_name):
+            return 'tar.' + {'gzip': 'gz', 'bzip2': 'bz2', 'xz': 'xz', 'zstd': 'zst'}[kind]
+        return kind
+    if _is_tar_header(head):
+        return 'tar'
+    return None
+
+
+def _name_format(lower_name: str) -> Optional[str]:
+    for ext, name_fmt in _NAME_FALLBACK:
+        if lower_name.endswith(ext):
+            return name_fmt
+    return None
+
+
+@functools.lru_cache(maxsize=1024)
+def _sniff_cached(path: str, size: int, mtime_ns: int) -> Optional[str]:
+    lower = os.path.basename(path).lower()
+    try:
+        with open(path, 'rb') as f:
+            head = f.read(SNIFF_BYTES)
+    except OSError:
+        head = b''
+    fmt = _detect(head, lower)
+    if fmt is None:
+        fmt = _name_format(lower)
+    return fmt
+
+
+def sniff_bytes(head: bytes, name: str) -> Optional[str]:
+    """Like sniff_format() for an archive held in memory (head = its first bytes)."""
+    lower = os.path.basename(name).lower()
+    fmt = _detect(head[:SNIFF_BYTES], lower)
+    if fmt is None:
+        fmt = _name_format(lower)
+    return fmt
+
+
+def archive_format_from_name(name: str) -> Optional[str]:
+    """Format id implied by a file name alone (None for non-archive names)."""
+    return _name_format(os.path.basename(name).lower())
+
+
+def strip_archive_extension(name: str) -> str:
+    """name without its archive extension ('logs.tar.gz' -> 'logs'); unchanged if it has none."""
+    lower = name.lower()
+    for ext, _ in _NAME_FALLBACK:
+        if lower.endswith(ext) and len(name) > len(ext):
+            return name[:-len(ext)]
+    return name
+
+
+def sniff_format(path: str) -> Optional[str]:
+    """Return the format id of the archive at path (None if unrecognised)."""
+    full = os.path.abspath(path)
+    try:
+        st = os.stat(full)
+    except OSError:
+        return None
+    return _sniff_cached(full, st.st_size, st.st_mtime_ns)
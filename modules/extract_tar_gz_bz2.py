@@ -1,41 +1,147 @@
 """
 extract_tar_gz_bz2.py
 ---------------------
-Defines extract_tar_gz_bz2() which extracts .tar, .gz, .bz2, .tgz, .tbz archives using tarfile/gzip/bz2.
+Defines extract_tar_gz_bz2() which extracts .tar, .gz, .bz2, .xz, .zst, .tgz, .tbz, .txz archives using
+tarfile and the decompressors from open_decompressed() (system tools, a
+parallel bzip2 decoder or gzip/bz2/lzma).
+Progress is reported through ProgressTracker by compressed bytes consumed;
+tar archives are streamed in a single pass (see _extract_tar_stream).
+
+fmt is the id from sniff_format(); when the caller already sniffed the file
+it is passed in so the archive is not probed again.
 """
 import tarfile
 import os
+from typing import Optional
+from .extract_decompress_stream import open_decompressed
+from .extract_sniff_format import sniff_format
+from .progress_tracker import ProgressTracker
+
+_COPY_CHUNK = 1024 * 1024
+_TAR_BUFSIZE = 64 * 1024
+_TAR_CODECS = {'tar.gz': 'gzip', 'tar.bz2': 'bzip2', 'tar.xz': 'xz', 'tar.zst': 'zstd'}
+_SINGLE_EXTS = {'gzip': ('.gz',), 'bzip2': ('.bz2',), 'xz': ('.xz',), 'zstd': ('.zst',)}
 
-def extract_tar_gz_bz2(path: str, target_dir: str, progress_cb):
+def _bzip2_is_tar(path: str) -> bool:
+    """bzip2 can't be sniffed from a prefix: decompress the first block and look for a tar header."""
     try:
-        # Handle .tar, .tgz, .tbz, .tar.gz, .tar.bz2
-        if tarfile.is_tarfile(path):
-            with tarfile.open(path, 'r:*') as tf:
-                members = tf.getmembers()
-                total = len(members)
-                for idx, m in enumerate(members):
-                    tf.extract(m, target_dir)
-                    percent = ((idx + 1) / total) * 100.0
-                    progress_cb(percent)
-            progress_cb(100.0)
-            return True
-        # Handle .gz, .bz2 (single file)
-        ext = os.path.splitext(path)[1].lower()
-        if ext in ['.gz', '.bz2']:
-            import shutil
-            import gzip
-            import bz2
-            base = os.path.basename(path)
-            out_path = os.path.join(target_dir, base.replace(ext, ''))
-            os.makedirs(target_dir, exist_ok=True)
-            if ext == '.gz':
-                with gzip.open(path, 'rb') as f_in, open(out_path, 'wb') as f_out:
-                    shutil.copyfileobj(f_in, f_out)
-            elif ext == '.bz2':
-                with bz2.open(path, 'rb') as f_in, open(out_path, 'wb') as f_out:
-                    shutil.copyfileobj(f_in, f_out)
-            progress_cb(100.0)
-            return True
-        return False
+        with open_decompressed(path, 'bzip2', 'stdlib') as f:
+            head = f.read(512)
+        return len(head) >= 262 and head[257:262] == b'ustar'
     except Exception:
         return False
+
+def _is_complete(dest: str, m: tarfile.TarInfo) -> bool:
+    """Whether a regular file member was already extracted (same size and mtime)."""
+    try:
+        st = os.stat(dest)
+    except OSError:
+        return False
+    return st.st_size == m.size and int(st.st_mtime) == int(m.mtime)
+
+def _extract_tar_stream(path: str, target_dir: str, progress_cb, fmt: str, backend: str, workers: int,
+                        resume: bool = False, used: Optional[list] = None):
+    """Extract a (compressed) tar in one sequential pass.
+
+    Members are extracted as they are read ('r|' stream mode) instead of
+    calling getmembers() first, which would decompress the whole archive
+    once just to list it. Progress follows compressed bytes consumed from
+    the raw file, and the member list is cleared as we go so memory stays
+    flat however many entries the archive has.
+
+    Decompression is done by open_decompressed() rather than tarfile's own
+    'r|gz' stream, whose buffer handling re-copies the decompressed backlog
+    on every header read and gets slow on highly compressible archives with
+    many small members.
+
+    Members go through tarfile's 'data' filter: absolute names are made
+    relative, and members or links that would land outside target_dir
+    (or device files) fail the extraction.
+
+    resume=True skips regular files an interrupted run already wrote (tar
+    stores no checksum, so size and mtime are compared). The backend the
+    decompressor picked is appended to used.
+    """
+    tracker = ProgressTracker(progress_cb, compressed_total=os.path.getsize(path))
+    if fmt == 'tar':
+        src = open(path, 'rb')
+        consumed = src.tell
+    else:
+        src = open_decompressed(path, _TAR_CODECS[fmt], backend, workers)
+        consumed = lambda: src.consumed
+        if used is not None:
+            used.append(src.backend)
+    with src, tarfile.open(fileobj=src, mode='r|', bufsize=_TAR_BUFSIZE) as tf:
+        for m in tf:
+            if not (resume and m.isfile() and _is_complete(os.path.join(target_dir, m.name.lstrip('/')), m)):
+                tf.extract(m, target_dir, set_attrs=not m.isdir(), filter='data')
+            if m.isfile():
+                tracker.add_written(m.size)
+            tracker.set_consumed(consumed())
+            tf.members = []
+    tracker.finish()
+
+def _extract_single(path: str, target_dir: str, progress_cb, fmt: str, backend: str, workers: int,
+                    resume: bool = False, used: Optional[list] = None):
+    base = os.path.basename(path)
+    for ext in _SINGLE_EXTS[fmt]:
+        if base.lower().endswith(ext):
+            base = base[: -len(ext)]
+            break
+    out_path = os.path.join(target_dir, base)
+    os.makedirs(target_dir, exist_ok=True)
+    tracker = ProgressTracker(progress_cb, compressed_total=os.path.getsize(path))
+    buf = bytearray(_COPY_CHUNK)
+    view = memoryview(buf)
+    try:
+        with open_decompressed(path, fmt, backend, workers) as f_in, open(out_path, 'wb') as f_out:
+            if used is not None:
+                used.append(f_in.backend)
+            while True:
+                n = f_in.readinto(view)
+                if not n:
+                    break
+                f_out.write(view[:n])
+                tracker.add_written(n)
+                tracker.set_consumed(f_in.consumed)
+    finally:
+        view.release()
+    tracker.finish()
+
+def extract_tar_gz_bz2(path: str, target_dir: str, progress_cb, fmt: Optional[str] = None,
+                       backend: str = 'auto', workers: int = 0, resume: bool = False):
+    """Extract path; backend/workers select the decompressor (see open_decompressed).
+
+    resume=True skips tar members left complete by an interrupted run; a
+    single compressed file is always decompressed again.
+
+    If an accelerated backend (external tool or parallel bzip2) was used and
+    fails, the archive is extracted again with the stdlib decoder before
+    giving up.
+    """
+    fmt = fmt or sniff_format(path)
+    if fmt == 'bzip2' and _bzip2_is_tar(path):
+        fmt = 'tar.bz2'
+    # Handle .tar, .tgz, .tbz, .txz, .tar.gz, .tar.bz2, .tar.xz, .tar.zst
+    if fmt in ('tar',) + tuple(_TAR_CODECS):
+        extract = _extract_tar_stream
+    # Handle .gz, .bz2, .xz, .zst (single file)
+    elif fmt in _SINGLE_EXTS:
+        extract = _extract_single
+    else:
+        return False
+    used = []
+    try:
+        extract(path, target_dir, progress_cb, fmt, backend, workers, resume, used)
+        return True
+    except Exception as e:
+        if not used or used[-1] == 'stdlib':
+            print(f"[Auto-Unzip] Could not extract {os.path.basename(path)}: {e}")
+            return False
+        print(f"[Auto-Unzip] {used[-1]} decompression of {os.path.basename(path)} failed ({e}); retrying with stdlib")
+    try:
+        extract(path, target_dir, progress_cb, fmt, 'stdlib', workers, resume)
+        return True
+    except Exception as e:
+        print(f"[Auto-Unzip] Could not extract {os.path.basename(path)} with stdlib either: {e}")
+        return False
@@ -2,21 +2,43 @@
 extract_zip.py
 --------------
 Defines extract_zip() which extracts the contents of a .zip archive while
-invoking a progress callback based on cumulative file sizes.
+invoking a progress callback based on cumulative file sizes. The actual
+copying is done by extract_zip_members() (large buffers, preallocation,
+mmap fast path for stored entries). Large archives with several members are
+split across worker threads by extract_zip_parallel() when workers != 1.
+resume=True skips members an interrupted run already extracted; members named
+in exclude are left out.
 """
+import os
 import zipfile
+from typing import Optional, Set
+from .extract_zip_members import extract_zip_members
+from .extract_zip_parallel import extract_zip_parallel
+from .progress_tracker import ProgressTracker
 
-def extract_zip(path: str, target_dir: str, progress_cb):
+# Below this much compressed data thread start-up outweighs the gain
+PARALLEL_MIN_BYTES = 16 * 1024 * 1024
+
+def resolve_zip_workers(workers: int) -> int:
+    """Map the zip_extract_workers setting (0 = auto) to a thread count."""
+    if workers and workers > 0:
+        return int(workers)
+    return max(1, min(8, os.cpu_count() or 1))
+
+def extract_zip(path: str, target_dir: str, progress_cb, workers: int = 1, resume: bool = False,
+                exclude: Optional[Set[str]] = None):
     try:
         with zipfile.ZipFile(path, 'r') as zf:
-            members = zf.infolist()
-            total = sum(m.file_size for m in members) or 1
-            extracted = 0
-            for m in members:
-                zf.extract(m, target_dir)
-                extracted += m.file_size
-                progress_cb(min(100.0, (extracted / total) * 100.0))
-        progress_cb(100.0)
+            members = [m for m in zf.infolist() if not exclude or m.filename not in exclude]
+            tracker = ProgressTracker(progress_cb, sum(m.file_size for m in members),
+                                      compressed_total=os.path.getsize(path))
+            workers = resolve_zip_workers(workers)
+            files = sum(1 for m in members if not m.is_dir())
+            if workers > 1 and files > 1 and sum(m.compress_size for m in members) >= PARALLEL_MIN_BYTES:
+                extract_zip_parallel(path, target_dir, members, tracker, min(workers, files), resume)
+            else:
+                extract_zip_members(zf, path, target_dir, members, tracker, resume=resume)
+        tracker.finish()
         return True
     except Exception:
         return False
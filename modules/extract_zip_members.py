@@ -0,0 +1,182 @@
+"""
+extract_zip_members.py
+----------------------
+Defines extract_zip_members(), the zip extraction engine used by extract_zip()
+and extract_zipx() in place of ZipFile.extract():
+
+- The directory tree is created once up front from infolist() instead of
+  re-checking parent folders for every member.
+- Compressed members are streamed through one large reusable buffer with
+  readinto() into a preallocated bytearray/memoryview.
+- Output files are preallocated from file_size (posix_fallocate where
+  available) so large files are laid out contiguously.
+- STORED (uncompressed) members are copied straight out of an mmap of the
+  archive with memoryview slices, skipping zipfile's read path; their CRC is
+  still verified.
+
+Member paths are sanitised exactly like ZipFile.extract() does, so entries
+cannot escape target_dir.
+
+With resume=True, members whose output file already exists with the right
+size and CRC-32 (left by an interrupted run) are skipped.
+"""
+from __future__ import annotations
+import mmap
+import os
+import struct
+import zipfile
+import zlib
+from typing import Dict, Iterable, List, Optional
+
+from .progress_tracker import ProgressTracker
+
+BUFFER_SIZE = 1024 * 1024
+_PREALLOCATE_MIN = 1024 * 1024  # below this preallocation costs more than it saves
+_LOCAL_HEADER = struct.Struct('<4s2B4HL2L2H')  # zip local file header (30 bytes)
+_LOCAL_SIGNATURE = b'PK\003\004'
+
+
+def _member_target(target_dir: str, info: zipfile.ZipInfo) -> str:
+    """Return the sanitised output path for info (mirrors ZipFile._extract_member)."""
+    arcname = info.filename.replace('/', os.path.sep)
+    if os.path.altsep:
+        arcname = arcname.replace(os.path.altsep, os.path.sep)
+    arcname = os.path.splitdrive(arcname)[1]
+    invalid_path_parts = ('', os.path.curdir, os.path.pardir)
+    arcname = os.path.sep.join(x for x in arcname.split(os.path.sep) if x not in invalid_path_parts)
+    if os.path.sep == '\\':
+        arcname = zipfile.ZipFile._sanitize_windows_name(arcname, os.path.sep)  # type: ignore[attr-defined]
+    if not arcname and not info.is_dir():
+        raise ValueError('Empty filename.')
+    return os.path.normpath(os.path.join(target_dir, arcname))
+
+
+def prepare_zip_tree(target_dir: str, members: Iterable[zipfile.ZipInfo], create_dirs: bool = True) -> Dict[str, str]:
+    """Create every needed directory once; return filename -> output path for files."""
+    dirs = {os.path.normpath(target_dir)}
+    targets: Dict[str, str] = {}
+    for info in members:
+        target = _member_target(target_dir, info)
+        if info.is_dir():
+            dirs.add(target)
+        else:
+            dirs.add(os.path.dirname(target))
+            targets[info.filename] = target
+    if create_dirs:
+        for d in sorted(dirs):
+            os.makedirs(d, exist_ok=True)
+    return targets
+
+
+def _preallocate(f, size: int) -> bool:
+    if size < _PREALLOCATE_MIN or not hasattr(os, 'posix_fallocate'):
+        return False
+    try:
+        os.posix_fallocate(f.fileno(), 0, size)
+        return True
+    except OSError:
+        return False  # unsupported filesystem; plain writes still work
+
+
+def _stored_data_offset(mm: mmap.mmap, info: zipfile.ZipInfo) -> Optional[int]:
+    """Offset of a member's raw data in the archive, or None if the header looks wrong."""
+    start = info.header_offset
+    if start + _LOCAL_HEADER.size > len(mm):
+        return None
+    header = _LOCAL_HEADER.unpack_from(mm, start)
+    if header[0] != _LOCAL_SIGNATURE:
+        return None
+    offset = start + _LOCAL_HEADER.size + header[10] + header[11]  # + name length + extra length
+    if offset + info.compress_size > len(mm):
+        return None
+    return offset
+
+
+def _copy_stored(mm: mmap.mmap, offset: int, info: zipfile.ZipInfo, out, tracker: ProgressTracker):
+    crc = 0
+    end = offset + info.file_size
+    pos = offset
+    with memoryview(mm) as view:
+        while pos < end:
+            with view[pos:min(pos + BUFFER_SIZE, end)] as chunk:
+                crc = zlib.crc32(chunk, crc)
+                out.write(chunk)
+                n = len(chunk)
+            pos += n
+            tracker.add_consumed(n)
+            tracker.add_written(n)
+    if crc != info.CRC:
+        raise zipfile.BadZipFile(f'Bad CRC-32 for file {info.filename!r}')
+
+
+def _is_complete(target: str, info: zipfile.ZipInfo, view: memoryview) -> bool:
+    """Whether target already holds exactly the member's data (size and CRC-32)."""
+    try:
+        if os.path.getsize(target) != info.file_size:
+            return False
+        crc = 0
+        with open(target, 'rb') as f:
+            while True:
+                n = f.readinto(view)
+                if not n:
+                    break
+                crc = zlib.crc32(view[:n], crc)
+        return crc == info.CRC
+    except OSError:
+        return False
+
+
+def _copy_stream(zf: zipfile.ZipFile, info: zipfile.ZipInfo, out, view: memoryview, tracker: ProgressTracker):
+    with zf.open(info) as src:
+        while True:
+            n = src.readinto(view)
+            if not n:
+                break
+            out.write(view[:n])
+            tracker.add_written(n)
+    tracker.add_consumed(info.compress_size)
+
+
+def extract_zip_members(zf: zipfile.ZipFile, archive_path: str, target_dir: str,
+                        members: List[zipfile.ZipInfo], tracker: ProgressTracker, create_dirs: bool = True,
+                        resume: bool = False):
+    """Extract members of zf into target_dir.
+
+    create_dirs=False skips directory creation when the caller already built
+    the tree (parallel extraction prepares it once for all workers).
+    resume=True skips members that are already extracted completely.
+    """
+    targets = prepare_zip_tree(target_dir, members, create_dirs)
+    fast_path = any(m.compress_type == zipfile.ZIP_STORED and not (m.flag_bits & 0x1) and m.file_size
+                    for m in members if not m.is_dir())
+    buf = bytearray(BUFFER_SIZE)
+    view = memoryview(buf)
+    raw = open(archive_path, 'rb') if fast_path else None
+    mm = mmap.mmap(raw.fileno(), 0, access=mmap.ACCESS_READ) if raw is not None else None
+    try:
+        for info in members:
+            if info.is_dir():
+                continue
+            target = targets[info.filename]
+            if resume and _is_complete(target, info, view):
+                tracker.add_consumed(info.compress_size)
+                tracker.add_written(info.file_size)
+                continue
+            with open(target, 'wb') as out:
+                preallocated = _preallocate(out, info.file_size)
+                offset = None
+                if (mm is not None and info.compress_type == zipfile.ZIP_STORED and not (info.flag_bits & 0x1)
+                        and info.compress_size == info.file_size):
+                    offset = _stored_data_offset(mm, info)
+                if offset is not None:
+                    _copy_stored(mm, offset, info, out, tracker)
+                else:
+                    _copy_stream(zf, info, out, view, tracker)
+                if preallocated:
+                    out.truncate()  # drop any preallocated tail if the member came up short
+    finally:
+        view.release()
+        if mm is not None:
+            mm.close()
+        if raw is not None:
+            raw.close()
@@ -0,0 +1,48 @@
+"""
+extract_zip_parallel.py
+-----------------------
+Defines extract_zip_parallel() which extracts zip members on several threads.
+ZIP entries are compressed independently, and zlib releases the GIL while
+inflating and computing CRCs, so threads scale across cores.
+
+Members are partitioned by uncompressed size (largest first onto the least
+loaded worker) so workers finish at about the same time. Each worker opens
+its own ZipFile handle and runs extract_zip_members() on its share, in
+archive order to keep reads sequential; all of them report into the same
+thread-safe ProgressTracker. The directory tree is created once beforehand.
+"""
+from __future__ import annotations
+import heapq
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+from .extract_zip_members import extract_zip_members, prepare_zip_tree
+from .progress_tracker import ProgressTracker
+
+
+def _partition(members: List[zipfile.ZipInfo], workers: int) -> List[List[zipfile.ZipInfo]]:
+    heap = [(0, i) for i in range(workers)]
+    buckets: List[List[zipfile.ZipInfo]] = [[] for _ in range(workers)]
+    for info in sorted(members, key=lambda m: m.file_size, reverse=True):
+        load, i = heapq.heappop(heap)
+        buckets[i].append(info)
+        heapq.heappush(heap, (load + max(1, info.file_size), i))
+    for bucket in buckets:
+        bucket.sort(key=lambda m: m.header_offset)
+    return [b for b in buckets if b]
+
+
+def extract_zip_parallel(archive_path: str, target_dir: str, members: List[zipfile.ZipInfo],
+                         tracker: ProgressTracker, workers: int, resume: bool = False):
+    prepare_zip_tree(target_dir, members)
+    files = [m for m in members if not m.is_dir()]
+    buckets = _partition(files, max(1, workers))
+
+    def _work(bucket: List[zipfile.ZipInfo]):
+        with zipfile.ZipFile(archive_path, 'r') as zf:
+            extract_zip_members(zf, archive_path, target_dir, bucket, tracker, create_dirs=False, resume=resume)
+
+    with ThreadPoolExecutor(max_workers=len(buckets), thread_name_prefix='ZipWorker') as pool:
+        for future in [pool.submit(_work, b) for b in buckets]:
+            future.result()  # re-raise the first worker error
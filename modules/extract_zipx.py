@@ -6,19 +6,19 @@ Note: Python's zipfile can open some .zipx files if they use standard compressio
 For advanced .zipx features, third-party tools may be needed.
 """
 import zipfile
+from typing import Optional, Set
 import os
+from .extract_zip_members import extract_zip_members
+from .progress_tracker import ProgressTracker
 
-def extract_zipx(path: str, target_dir: str, progress_cb):
+def extract_zipx(path: str, target_dir: str, progress_cb, resume: bool = False, exclude: Optional[Set[str]] = None):
     try:
         with zipfile.ZipFile(path, 'r') as zf:
-            members = zf.infolist()
-            total = sum(m.file_size for m in members) or 1
-            extracted = 0
-            for m in members:
-                zf.extract(m, target_dir)
-                extracted += m.file_size
-                progress_cb(min(100.0, (extracted / total) * 100.0))
-        progress_cb(100.0)
+            members = [m for m in zf.infolist() if not exclude or m.filename not in exclude]
+            tracker = ProgressTracker(progress_cb, sum(m.file_size for m in members),
+                                      compressed_total=os.path.getsize(path))
+            extract_zip_members(zf, path, target_dir, members, tracker, resume=resume)
+        tracker.finish()
         return True
     except Exception:
         return False
@@ -3,7 +3,8 @@ gui_options_window.py
 ---------------------
 Defines create_and_show_options_window() which builds and shows the PyQt6
 options GUI (700x500, non-resizable) with scrollable sections for General and
-Advanced settings. Provides simple controls bound to the Config object.
+Advanced settings. Controls write through the ConfigService, which applies
+changes to the running watcher/scheduler and saves them debounced.
 """
 from __future__ import annotations
 import sys
@@ -17,13 +18,12 @@ except ImportError:  # pragma: no cover
     QtWidgets = None  # type: ignore
     QtCore = None  # type: ignore
 
-from .config_dataclass import Config
-from .config_save_config import save_config
+from .config_service import ConfigService
 from .config_settings_file_path import get_settings_file_path
 
 _window_ref = None  # prevent GC
 
-def create_and_show_options_window(cfg: Config, on_quit: Callable[[], None], on_reload: Callable[[], None] | None = None):
+def create_and_show_options_window(config: ConfigService, on_quit: Callable[[], None], on_reload: Callable[[], None] | None = None):
     global _window_ref
     if QtWidgets is None:
         print('[Auto-Unzip] PyQt6 not installed. Install with pip install PyQt6.')
@@ -40,6 +40,7 @@ def create_and_show_options_window(cfg: Config, on_quit: Callable[[], None], on_
         return
 
     app = QtWidgets.QApplication.instance() or QtWidgets.QApplication(sys.argv)
+    cfg = config.cfg
 
     class OptionsWindow(QtWidgets.QWidget):
         def closeEvent(self, event):  # type: ignore
@@ -67,8 +68,7 @@ def create_and_show_options_window(cfg: Config, on_quit: Callable[[], None], on_
     launch_checkbox.setChecked(getattr(cfg, 'launch_on_startup', True))
     def _toggle_launch_on_startup(state):
         checked = state == QtCore.Qt.CheckState.Checked
-        cfg.launch_on_startup = checked
-        save_config(cfg)
+        config.update(launch_on_startup=checked)
         try:
             from modules.startup_shortcut import create_startup_shortcut, remove_startup_shortcut
             if checked:
@@ -83,19 +83,24 @@ def create_and_show_options_window(cfg: Config, on_quit: Callable[[], None], on_
     delete_checkbox = QtWidgets.QCheckBox('Delete archives after extraction')
     delete_checkbox.setChecked(cfg.delete_archives_after_extract)
     def _toggle_delete(state):
-        cfg.delete_archives_after_extract = state == QtCore.Qt.CheckState.Checked
-        save_config(cfg)
+        config.update(delete_archives_after_extract=state == QtCore.Qt.CheckState.Checked)
     delete_checkbox.stateChanged.connect(_toggle_delete)  # type: ignore
     general_layout.addRow(delete_checkbox)
 
+    toasts_checkbox = QtWidgets.QCheckBox('Show desktop notifications')
+    toasts_checkbox.setChecked(getattr(cfg, 'show_toasts', True))
+    def _toggle_toasts(state):
+        config.update(show_toasts=state == QtCore.Qt.CheckState.Checked)
+    toasts_checkbox.stateChanged.connect(_toggle_toasts)  # type: ignore
+    general_layout.addRow(toasts_checkbox)
+
     # Poll interval
     poll_spin = QtWidgets.QDoubleSpinBox()
     poll_spin.setRange(0.5, 60.0)
     poll_spin.setSingleStep(0.5)
     poll_spin.setValue(cfg.poll_interval_seconds)
     def _poll_changed(val: float):
-        cfg.poll_interval_seconds = float(val)
-        save_config(cfg)
+        config.update(poll_interval_seconds=float(val))
     poll_spin.valueChanged.connect(_poll_changed)  # type: ignore
     general_layout.addRow('Poll Interval (s):', poll_spin)
 
@@ -120,27 +125,23 @@ def create_and_show_options_window(cfg: Config, on_quit: Callable[[], None], on_
                 except Exception:
                     pass
                 if path not in cfg.watch_folders:
-                    cfg.watch_folders.append(path)
+                    # New list: the watcher thread may be iterating the old one
+                    config.update(watch_folders=cfg.watch_folders + [path])
                     folders_list.addItem(path)
-                    save_config(cfg)
     def _remove_selected():
         # Collect selected items first (can't modify while iterating selection)
         selected = list(folders_list.selectedItems())
         if not selected:
             return
-        removed_any = False
+        removed = set()
         for item in selected:
             path = item.text()
             if path in cfg.watch_folders:
-                try:
-                    cfg.watch_folders.remove(path)
-                except ValueError:
-                    pass
+                removed.add(path)
                 row = folders_list.row(item)
                 folders_list.takeItem(row)
-                removed_any = True
-        if removed_any:
-            save_config(cfg)
+        if removed:
+            config.update(watch_folders=[f for f in cfg.watch_folders if f not in removed])
     remove_btn.clicked.connect(_remove_selected)  # type: ignore
     add_btn.clicked.connect(_add_folder)  # type: ignore
     general_layout.addRow('Watched Folders:', folders_list)
@@ -184,14 +185,13 @@ def create_and_show_options_window(cfg: Config, on_quit: Callable[[], None], on_
         hot_reload_checkbox = QtWidgets.QCheckBox('Enable hot reload (auto-restart on code changes)')
         hot_reload_checkbox.setChecked(getattr(cfg, 'enable_hot_reload', True))
         def _toggle_hot_reload(state):
-            cfg.enable_hot_reload = state == QtCore.Qt.CheckState.Checked
-            save_config(cfg)
+            config.update(enable_hot_reload=state == QtCore.Qt.CheckState.Checked)
         hot_reload_checkbox.stateChanged.connect(_toggle_hot_reload)  # type: ignore
         advanced_layout.addWidget(hot_reload_checkbox)
         advanced_layout.addWidget(QtWidgets.QLabel('Disabling may require manual reload to pick up code changes. (Not recommended)'))
     else:
         # In non-development mode, always disable hot reload
-        cfg.enable_hot_reload = False
+        config.update(enable_hot_reload=False)
     inner_layout.addWidget(advanced_group)
 
     inner_layout.addStretch(1)
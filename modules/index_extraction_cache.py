@@ -0,0 +1,162 @@
+"""
+index_extraction_cache.py
+-------------------------
+Defines ExtractionCache, a persistent record of which output folder each
+extracted archive produced, keyed by the archive's content rather than its
+path, so a re-download ('file (1).zip') can be recognised as identical.
+
+- archive_fingerprint(): archive size plus a BLAKE2b hash of evenly spaced
+  sample blocks (the whole file when it is small). Cheap enough to compute
+  for every archive.
+- full_digest(): BLAKE2b of the whole file. Recorded for every cached
+  extraction (the archive may be deleted afterwards) and computed for a new
+  archive only when its fingerprint matches a cached one.
+
+Entries also keep the file count and total size of the output tree; an
+entry whose folder was removed or changed no longer matches. Storage is an
+append-only JSON-lines log under config/, compacted like the
+processed-archive index.
+"""
+from __future__ import annotations
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from .config_data_file_path import get_data_file_path
+
+CACHE_FILE_NAME = 'extraction_cache.jsonl'
+SAMPLE_BLOCK = 64 * 1024
+SAMPLE_COUNT = 16
+_READ_CHUNK = 1024 * 1024
+
+
+def archive_fingerprint(path: str) -> str:
+    """'<size>:<hex>' over SAMPLE_COUNT blocks spread across the file."""
+    size = os.path.getsize(path)
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        if size <= SAMPLE_BLOCK * SAMPLE_COUNT:
+            h.update(f.read())
+        else:
+            step = (size - SAMPLE_BLOCK) // (SAMPLE_COUNT - 1)
+            for i in range(SAMPLE_COUNT):
+                f.seek(i * step)
+                h.update(f.read(SAMPLE_BLOCK))
+    return f'{size}:{h.hexdigest()}'
+
+
+def full_digest(path: str) -> str:
+    h = hashlib.blake2b()
+    with open(path, 'rb') as f:
+        while True:
+            chunk = f.read(_READ_CHUNK)
+            if not chunk:
+                break
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def tree_stats(root: str) -> Tuple[int, int]:
+    """(file count, total bytes) of the files under root."""
+    count = total = 0
+    for folder, _, names in os.walk(root):
+        for n in names:
+            try:
+                total += os.lstat(os.path.join(folder, n)).st_size
+            except OSError:
+                continue
+            count += 1
+    return count, total
+
+
+class ExtractionCache:
+    def __init__(self, path: Optional[str] = None, min_compact_lines: int = 1000):
+        self.path = os.path.abspath(path or get_data_file_path(CACHE_FILE_NAME))
+        self.min_compact_lines = min_compact_lines
+        # fingerprint -> list of entries {'output', 'digest', 'files', 'bytes'}
+        self._entries: Dict[str, List[dict]] = {}
+        self._log_lines = 0
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    self._log_lines += 1
+                    try:
+                        rec = json.loads(line)
+                        self._add(rec['fingerprint'], {k: rec[k] for k in ('output', 'digest', 'files', 'bytes')})
+                    except Exception:
+                        continue  # torn line from a crash mid-append
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            print(f'[Auto-Unzip] Could not read extraction cache: {e}')
+
+    def _add(self, fingerprint: str, entry: dict):
+        entries = self._entries.setdefault(fingerprint, [])
+        key = os.path.normcase(entry['output'])
+        entries[:] = [e for e in entries if os.path.normcase(e['output']) != key] + [entry]
+
+    def __len__(self) -> int:
+        return sum(len(v) for v in self._entries.values())
+
+    def find(self, archive_path: str, fingerprint: str) -> Optional[str]:
+        """Output folder of an earlier extraction of identical content, or None.
+
+        Hashes archive_path in full only if some entry shares its fingerprint.
+        """
+        with self._lock:
+            candidates = list(self._entries.get(fingerprint, ()))
+        if not candidates:
+            return None
+        digest = full_digest(archive_path)
+        for entry in candidates:
+            if entry['digest'] != digest or not os.path.isdir(entry['output']):
+                continue
+            if tree_stats(entry['output']) == (entry['files'], entry['bytes']):
+                return entry['output']
+        return None
+
+    def record(self, fingerprint: str, digest: str, output_dir: str):
+        """Remember that the archive with this content was extracted to output_dir."""
+        files, total = tree_stats(output_dir)
+        entry = {'output': os.path.abspath(output_dir), 'digest': digest, 'files': files, 'bytes': total}
+        line = json.dumps({'fingerprint': fingerprint, **entry, 'time': time.time()})
+        with self._lock:
+            self._add(fingerprint, entry)
+            self._append(line)
+            needs_compact = self._log_lines > max(self.min_compact_lines, 2 * len(self))
+        if needs_compact:
+            self.compact()
+
+    def _append(self, line: str):
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(line + '\n')
+            self._log_lines += 1
+        except Exception as e:
+            print(f'[Auto-Unzip] Could not update extraction cache: {e}')
+
+    def compact(self):
+        """Rewrite the log without entries whose output folder is gone."""
+        with self._lock:
+            live = {fp: [e for e in entries if os.path.isdir(e['output'])] for fp, entries in self._entries.items()}
+            live = {fp: entries for fp, entries in live.items() if entries}
+            tmp = self.path + '.tmp'
+            try:
+                with open(tmp, 'w', encoding='utf-8') as f:
+                    for fp, entries in live.items():
+                        for e in entries:
+                            f.write(json.dumps({'fingerprint': fp, **e}) + '\n')
+                os.replace(tmp, self.path)
+            except Exception as e:
+                print(f'[Auto-Unzip] Could not compact extraction cache: {e}')
+                return
+            self._entries = live
+            self._log_lines = len(self)
@@ -0,0 +1,171 @@
+"""
+index_job_journal.py
+--------------------
+Defines JobJournal, a write-ahead log of extraction jobs so work interrupted
+by a crash, kill or hot reload is picked up by the next process.
+
+Every job moves through queued -> running -> done; each transition is
+appended to a JSON-lines file under config/ and fsynced before the job
+proceeds. While a job runs, the number of bytes written so far is appended
+every few seconds (not fsynced) for reporting. At start-up pending() returns
+the jobs that never reached done; the caller submits them again and
+process_archive() resumes from the staging directory the interrupted run
+left behind.
+
+A job that was running during max_attempts consecutive crashes is given up
+(recorded as done with outcome 'abandoned') so one bad archive cannot crash
+the app in a loop; pending() reports it through on_abandoned so the caller
+can keep the watcher from queueing the archive again. A job still running
+when a restart's drain times out is recorded as 'interrupted' instead: it is
+queued again and that start does not count as an attempt. The log is
+compacted to the unfinished jobs once it holds min_compact_lines lines.
+"""
+from __future__ import annotations
+import json
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .config_data_file_path import get_data_file_path
+
+JOURNAL_FILE_NAME = 'jobs.jsonl'
+PROGRESS_INTERVAL = 5.0  # seconds between byte-offset records of one job
+
+
+class JobJournal:
+    def __init__(self, path: Optional[str] = None, min_compact_lines: int = 1000):
+        self.path = os.path.abspath(path or get_data_file_path(JOURNAL_FILE_NAME))
+        self.min_compact_lines = min_compact_lines
+        # path -> {'state', 'options', 'attempts', 'written'} for jobs not done
+        self._jobs: Dict[str, dict] = {}
+        self._last_progress: Dict[str, float] = {}
+        self._log_lines = 0
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    self._log_lines += 1
+                    try:
+                        self._apply(json.loads(line))
+                    except Exception:
+                        continue  # torn line from a crash mid-append
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            print(f'[Auto-Unzip] Could not read job journal: {e}')
+
+    def _apply(self, rec: dict):
+        path, state = rec['path'], rec['state']
+        if state == 'done':
+            self._jobs.pop(path, None)
+            return
+        job = self._jobs.setdefault(path, {'state': 'queued', 'options': {}, 'attempts': 0, 'written': 0})
+        if state == 'queued':
+            job.update(state='queued', options=rec.get('options') or {})
+        elif state == 'running':
+            job.update(state='running', attempts=int(rec.get('attempts', job['attempts'] + 1)), written=0)
+        elif state == 'interrupted':
+            job.update(state='queued', attempts=int(rec.get('attempts', max(0, job['attempts'] - 1))))
+        elif state == 'progress':
+            job['written'] = int(rec.get('written', 0))
+
+    def _write(self, rec: dict, sync: bool):
+        """Apply rec and append it to the log. Must be called with self._lock held."""
+        self._apply(rec)
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps({**rec, 'time': time.time()}) + '\n')
+                if sync:
+                    f.flush()
+                    os.fsync(f.fileno())
+            self._log_lines += 1
+        except Exception as e:
+            print(f'[Auto-Unzip] Could not update job journal: {e}')
+
+    def __len__(self) -> int:
+        return len(self._jobs)
+
+    def queued(self, path: str, options: Optional[dict] = None):
+        with self._lock:
+            self._write({'path': path, 'state': 'queued', 'options': options or {}}, sync=True)
+
+    def running(self, path: str):
+        with self._lock:
+            attempts = self._jobs.get(path, {}).get('attempts', 0) + 1
+            self._write({'path': path, 'state': 'running', 'attempts': attempts}, sync=True)
+
+    def interrupted(self, path: str):
+        """Record that a running job is being cut short on purpose (drained restart)."""
+        with self._lock:
+            if self._jobs.get(path, {}).get('state') != 'running':
+                return
+            attempts = max(0, self._jobs[path]['attempts'] - 1)
+            self._write({'path': path, 'state': 'interrupted', 'attempts': attempts}, sync=True)
+
+    def progress(self, path: str, written: int):
+        """Record bytes written so far (throttled to one line per PROGRESS_INTERVAL)."""
+        now = time.monotonic()
+        with self._lock:
+            if now - self._last_progress.get(path, 0.0) < PROGRESS_INTERVAL or path not in self._jobs:
+                return
+            self._last_progress[path] = now
+            self._write({'path': path, 'state': 'progress', 'written': int(written)}, sync=False)
+
+    def done(self, path: str, outcome: str = 'finished'):
+        with self._lock:
+            self._last_progress.pop(path, None)
+            self._write({'path': path, 'state': 'done', 'outcome': outcome}, sync=True)
+            needs_compact = self._log_lines >= self.min_compact_lines and self._log_lines > 2 * len(self._jobs)
+        if needs_compact:
+            self.compact()
+
+    def pending(self, max_attempts: int = 3,
+                on_abandoned: Optional[Callable[[str], None]] = None) -> List[Tuple[str, dict]]:
+        """(path, options) of unfinished jobs to submit again, oldest first.
+
+        Jobs whose archive is gone are closed; jobs already started
+        max_attempts times are abandoned and passed to on_abandoned.
+        """
+        with self._lock:
+            jobs = list(self._jobs.items())
+        resume = []
+        for path, job in jobs:
+            if not os.path.exists(path):
+                self.done(path, 'missing')
+            elif job['state'] == 'running' and job['attempts'] >= max_attempts:
+                print(f'[Auto-Unzip] Giving up on {path}: interrupted {job["attempts"]} times')
+                self.done(path, 'abandoned')
+                if on_abandoned is not None:
+                    on_abandoned(path)
+            else:
+                if job['state'] == 'running':
+                    print(f'[Auto-Unzip] Resuming interrupted extraction of {path} '
+                          f'({job["written"] // (1024 * 1024)} MB were written)')
+                resume.append((path, dict(job['options'])))
+        return resume
+
+    def compact(self):
+        """Rewrite the log with only the unfinished jobs."""
+        with self._lock:
+            tmp = self.path + '.tmp'
+            try:
+                with open(tmp, 'w', encoding='utf-8') as f:
+                    for path, job in self._jobs.items():
+                        f.write(json.dumps({'path': path, 'state': 'queued', 'options': job['options']}) + '\n')
+                        if job['state'] == 'running':
+                            f.write(json.dumps({'path': path, 'state': 'running', 'attempts': job['attempts']}) + '\n')
+                        elif job['attempts']:
+                            f.write(json.dumps({'path': path, 'state': 'interrupted',
+                                                'attempts': job['attempts']}) + '\n')
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp, self.path)
+            except Exception as e:
+                print(f'[Auto-Unzip] Could not compact job journal: {e}')
+                return
+            self._log_lines = sum(2 if j['state'] == 'running' or j['attempts'] else 1 for j in self._jobs.values())
@@ -0,0 +1,124 @@
+"""
+index_processed_archives.py
+---------------------------
+Defines ProcessedArchiveIndex, a persistent record of archives that were
+already handled (successfully or not). Entries are keyed by path and only
+match while the archive's size and mtime are unchanged, so a re-downloaded
+file with the same name is still extracted. contains() only reports
+archives whose outcome is final (HANDLED_OUTCOMES); one that failed, e.g.
+because it was still locked, is tried again after a restart.
+
+Storage is an append-only JSON-lines log under config/. It is loaded into a
+dict at start-up for O(1) lookups; every outcome appends one line. When the
+log holds many superseded lines it is compacted (written to a temp file and
+atomically swapped in), dropping entries for archives that no longer exist.
+"""
+from __future__ import annotations
+import json
+import os
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from .config_data_file_path import get_data_file_path
+
+INDEX_FILE_NAME = 'processed_archives.jsonl'
+# Outcomes after which an unchanged archive is not extracted again
+HANDLED_OUTCOMES = frozenset({'success', 'duplicate', 'abandoned'})
+
+class ProcessedArchiveIndex:
+    def __init__(self, path: Optional[str] = None, min_compact_lines: int = 1000):
+        self.path = path or get_data_file_path(INDEX_FILE_NAME)
+        self.min_compact_lines = min_compact_lines
+        # key -> (size, mtime, outcome, digest)
+        self._entries: Dict[str, Tuple[int, float, str, Optional[str]]] = {}
+        self._log_lines = 0
+        self._lock = threading.Lock()
+        self._load()
+
+    @staticmethod
+    def _key(path: str) -> str:
+        return os.path.normcase(os.path.abspath(path))
+
+    def _load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    self._log_lines += 1
+                    try:
+                        rec = json.loads(line)
+                        key = self._key(rec['path'])
+                        if rec.get('forget'):
+                            self._entries.pop(key, None)
+                        else:
+                            self._entries[key] = (int(rec['size']), float(rec['mtime']), str(rec['outcome']), rec.get('digest'))
+                    except Exception:
+                        continue  # torn line from a crash mid-append
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            print(f'[Auto-Unzip] Could not read processed-archive index: {e}')
+            return
+        if self._log_lines > max(self.min_compact_lines, 2 * len(self._entries)):
+            self.compact()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def lookup(self, path: str, size: int, mtime: float) -> Optional[str]:
+        """Return the recorded outcome if path was processed with this exact size/mtime."""
+        entry = self._entries.get(self._key(path))
+        if entry is None or entry[0] != size or entry[1] != mtime:
+            return None
+        return entry[2]
+
+    def contains(self, path: str, size: int, mtime: float) -> bool:
+        """Whether this version of path was handled for good (not merely attempted)."""
+        return self.lookup(path, size, mtime) in HANDLED_OUTCOMES
+
+    def record(self, path: str, size: int, mtime: float, outcome: str, digest: Optional[str] = None):
+        """Remember the outcome ('success', 'failed', ...) for this version of path."""
+        key = self._key(path)
+        line = json.dumps({'path': os.path.abspath(path), 'size': size, 'mtime': mtime, 'outcome': outcome,
+                           'digest': digest, 'time': time.time()})
+        with self._lock:
+            self._entries[key] = (size, mtime, outcome, digest)
+            self._append(line)
+            needs_compact = self._log_lines > max(self.min_compact_lines, 2 * len(self._entries))
+        if needs_compact:
+            self.compact()
+
+    def forget(self, path: str):
+        key = self._key(path)
+        with self._lock:
+            if self._entries.pop(key, None) is not None:
+                self._append(json.dumps({'path': os.path.abspath(path), 'forget': True}))
+
+    def _append(self, line: str):
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(line + '\n')
+            self._log_lines += 1
+        except Exception as e:
+            print(f'[Auto-Unzip] Could not update processed-archive index: {e}')
+
+    def compact(self):
+        """Rewrite the log with one line per still-existing archive."""
+        with self._lock:
+            live = {}
+            for key, entry in self._entries.items():
+                if os.path.exists(key):
+                    live[key] = entry
+            tmp = self.path + '.tmp'
+            try:
+                with open(tmp, 'w', encoding='utf-8') as f:
+                    for key, (size, mtime, outcome, digest) in live.items():
+                        f.write(json.dumps({'path': key, 'size': size, 'mtime': mtime, 'outcome': outcome,
+                                            'digest': digest}) + '\n')
+                os.replace(tmp, self.path)
+            except Exception as e:
+                print(f'[Auto-Unzip] Could not compact processed-archive index: {e}')
+                return
+            self._entries = live
+            self._log_lines = len(live)
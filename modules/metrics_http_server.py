@@ -0,0 +1,69 @@
+"""
+metrics_http_server.py
+----------------------
+Defines MetricsServer which serves a MetricsRegistry over HTTP on the
+loopback interface:
+
+- GET /metrics: Prometheus text format
+- GET /metrics.json: the same data as JSON (MetricsRegistry.snapshot())
+
+Runs in a daemon thread; only binds 127.0.0.1 since the data includes
+folder paths.
+"""
+from __future__ import annotations
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+from .metrics_registry import MetricsRegistry
+
+
+class MetricsServer:
+    def __init__(self, registry: MetricsRegistry, port: int, host: str = '127.0.0.1'):
+        self.registry = registry
+        self.port = port
+        self.host = host
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> bool:
+        registry = self.registry
+
+        class _Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                path = self.path.split('?', 1)[0]
+                if path == '/metrics':
+                    body = registry.render_prometheus().encode('utf-8')
+                    ctype = 'text/plain; version=0.0.4; charset=utf-8'
+                elif path == '/metrics.json':
+                    body = json.dumps(registry.snapshot()).encode('utf-8')
+                    ctype = 'application/json'
+                else:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header('Content-Type', ctype)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):  # noqa: A002 - keep scrapes out of the console
+                pass
+
+        try:
+            self._server = ThreadingHTTPServer((self.host, self.port), _Handler)
+        except OSError as e:
+            print(f'[Auto-Unzip] Could not start metrics endpoint on port {self.port}: {e}')
+            return False
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True, name='MetricsServer')
+        self._thread.start()
+        return True
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
@@ -0,0 +1,183 @@
+"""
+metrics_registry.py
+-------------------
+Defines MetricsRegistry, an in-process store of pipeline metrics, and
+get_metrics() which returns the process-wide instance:
+
+- inc(name, value, **labels): counters (monotonic totals)
+- observe(name, seconds, **labels): latency histograms with fixed buckets
+- gauge(name, fn): values read from a callback when metrics are exported
+
+render_prometheus() produces the Prometheus text exposition format (served
+by metrics_http_server.py); snapshot() a JSON-friendly dict (written by
+metrics_snapshot_writer.py). Recording is a dict update under a lock, cheap
+enough to stay enabled at all times.
+"""
+from __future__ import annotations
+import bisect
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Seconds; covers a folder scan (milliseconds) up to a large extraction (tens of minutes)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0,
+                   600.0, 1800.0)
+
+# Metrics recorded by the pipeline (HELP text in the Prometheus output)
+METRIC_HELP = {
+    'autounzip_folder_scan_seconds': 'Duration of one directory listing of a watched folder',
+    'autounzip_detect_seconds': 'Archive modification time to hand-off to the scheduler (includes settling)',
+    'autounzip_archives_detected_total': 'Archives handed to the scheduler',
+    'autounzip_queue_wait_seconds': 'Time an archive waited in the scheduler queue',
+    'autounzip_extract_seconds': 'Extractor run time by format',
+    'autounzip_extract_input_bytes_total': 'Archive bytes extracted by format (divide by extract seconds for MB/s)',
+    'autounzip_extract_output_bytes_total': 'Uncompressed bytes written by format',
+    'autounzip_extractions_total': 'Extractor runs by format and outcome',
+    'autounzip_process_seconds': 'Whole job time (checks, extraction, move into place, delete) by outcome',
+    'autounzip_delete_seconds': 'Time to delete the archive (all volumes) after extraction',
+    'autounzip_watcher_seen_entries': 'Archive versions remembered by the watcher',
+    'autounzip_queue_pending': 'Archives waiting in the scheduler queue',
+    'autounzip_queue_active': 'Extractions running',
+}
+
+_LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: dict) -> _LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _format_labels(key: _LabelKey, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(key) + ([extra] if extra else [])
+    if not pairs:
+        return ''
+    escaped = (v.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, v in pairs)
+    return '{' + ','.join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + '}'
+
+
+def _format_value(value: float) -> str:
+    """Exact sample value: whole numbers as integers, others as repr() (no rounding)."""
+    value = float(value)
+    if value != value:
+        return 'NaN'
+    if value in (float('inf'), float('-inf')):
+        return '+Inf' if value > 0 else '-Inf'
+    if value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+class _Histogram:
+    __slots__ = ('counts', 'sum', 'count')
+
+    def __init__(self, buckets: int):
+        self.counts = [0] * buckets  # per bucket, not cumulative
+        self.sum = 0.0
+        self.count = 0
+
+
+class MetricsRegistry:
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.started = time.time()
+        self._counters: Dict[str, Dict[_LabelKey, float]] = {}
+        self._histograms: Dict[str, Dict[_LabelKey, _Histogram]] = {}
+        self._gauges: Dict[str, Callable[[], float]] = {}
+        self._help: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def describe(self, name: str, text: str):
+        """Set the HELP text shown for name in the Prometheus output."""
+        self._help[name] = text
+
+    def inc(self, name: str, value: float = 1, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def observe(self, name: str, value: float, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            hist = series.get(key)
+            if hist is None:
+                hist = series[key] = _Histogram(len(self.buckets) + 1)
+            hist.counts[bisect.bisect_left(self.buckets, value)] += 1
+            hist.sum += value
+            hist.count += 1
+
+    def gauge(self, name: str, fn: Callable[[], float]):
+        """Export fn() as gauge name; registering the same name again replaces it."""
+        with self._lock:
+            self._gauges[name] = fn
+
+    def _read_gauges(self) -> Dict[str, float]:
+        with self._lock:
+            gauges = list(self._gauges.items())
+        values = {}
+        for name, fn in gauges:
+            try:
+                values[name] = float(fn())
+            except Exception:
+                continue  # owner already stopped
+        return values
+
+    def render_prometheus(self) -> str:
+        lines: List[str] = []
+
+        def header(name, kind):
+            if name in self._help:
+                lines.append(f'# HELP {name} {self._help[name]}')
+            lines.append(f'# TYPE {name} {kind}')
+
+        with self._lock:
+            counters = {n: dict(s) for n, s in self._counters.items()}
+            histograms = {n: {k: (list(h.counts), h.sum, h.count) for k, h in s.items()}
+                          for n, s in self._histograms.items()}
+        for name in sorted(counters):
+            header(name, 'counter')
+            for key, value in sorted(counters[name].items()):
+                lines.append(f'{name}{_format_labels(key)} {_format_value(value)}')
+        for name in sorted(histograms):
+            header(name, 'histogram')
+            for key, (counts, total, count) in sorted(histograms[name].items()):
+                running = 0
+                for bound, n in zip(self.buckets, counts):
+                    running += n
+                    lines.append(f'{name}_bucket{_format_labels(key, ("le", f"{bound:g}"))} {running}')
+                lines.append(f'{name}_bucket{_format_labels(key, ("le", "+Inf"))} {count}')
+                lines.append(f'{name}_sum{_format_labels(key)} {_format_value(total)}')
+                lines.append(f'{name}_count{_format_labels(key)} {count}')
+        for name, value in sorted(self._read_gauges().items()):
+            header(name, 'gauge')
+            lines.append(f'{name} {_format_value(value)}')
+        return '\n'.join(lines) + '\n'
+
+    def snapshot(self) -> dict:
+        """All metrics as plain JSON types; histograms as count/sum/mean/max bucket bound."""
+        with self._lock:
+            counters = {n: [{'labels': dict(k), 'value': v} for k, v in sorted(s.items())]
+                        for n, s in self._counters.items()}
+            histograms = {}
+            for n, s in self._histograms.items():
+                histograms[n] = [{'labels': dict(k), 'count': h.count, 'sum': round(h.sum, 6),
+                                  'mean': round(h.sum / h.count, 6) if h.count else 0.0,
+                                  'buckets': dict(zip([f'{b:g}' for b in self.buckets] + ['+Inf'], h.counts))}
+                                 for k, h in sorted(s.items())]
+        return {'time': time.time(), 'uptime_seconds': round(time.time() - self.started, 3),
+                'counters': counters, 'histograms': histograms, 'gauges': self._read_gauges()}
+
+
+_registry: Optional[MetricsRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_metrics() -> MetricsRegistry:
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = MetricsRegistry()
+            for name, text in METRIC_HELP.items():
+                _registry.describe(name, text)
+        return _registry
@@ -0,0 +1,54 @@
+"""
+metrics_snapshot_writer.py
+--------------------------
+Defines MetricsSnapshotWriter which periodically writes
+MetricsRegistry.snapshot() to config/metrics.json (written to a temp file
+and swapped in, so readers never see a partial file). A final snapshot is
+written on stop().
+"""
+from __future__ import annotations
+import json
+import os
+import threading
+from typing import Optional
+
+from .config_data_file_path import get_data_file_path
+from .metrics_registry import MetricsRegistry
+
+SNAPSHOT_FILE_NAME = 'metrics.json'
+
+
+class MetricsSnapshotWriter:
+    def __init__(self, registry: MetricsRegistry, interval: float, path: Optional[str] = None):
+        self.registry = registry
+        self.interval = max(1.0, float(interval))
+        self.path = os.path.abspath(path or get_data_file_path(SNAPSHOT_FILE_NAME))
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True, name='MetricsSnapshotWriter')
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=2)
+        self.write()
+
+    def write(self):
+        tmp = self.path + '.tmp'
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(self.registry.snapshot(), f, indent=1)
+            os.replace(tmp, self.path)
+        except Exception as e:
+            print(f'[Auto-Unzip] Could not write metrics snapshot: {e}')
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.write()
@@ -0,0 +1,165 @@
+"""
+notifications_dispatcher.py
+---------------------------
+Defines NotificationDispatcher, a background thread that owns all progress
+and completion output so extractor threads never block on console prints or
+on notifications_toast_backend.show_toast().
+
+- Progress updates are coalesced per archive (latest value wins), keyed by
+  the archive's absolute path so same-named archives in different folders
+  are tracked separately. Console
+  lines are rate-limited to one per archive every console_interval seconds;
+  milestone toasts (0%, 50%, 100%) fire once each when the milestone is
+  crossed, even if the exact value was never reported.
+- Completions arriving within batch_window seconds of each other are
+  combined into one summary toast instead of a burst of toasts. Progress
+  still pending for a completed archive is shown first, so the final
+  update (usually the 100% milestone) is not lost.
+"""
+from __future__ import annotations
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from .notifications_toast_backend import show_toast
+from .progress_stats import ProgressStats
+
+_MILESTONES = (0, 50, 100)
+
+
+def _format_eta(seconds: float) -> str:
+    seconds = int(seconds)
+    if seconds >= 3600:
+        return f"{seconds // 3600}h{(seconds % 3600) // 60:02d}m"
+    if seconds >= 60:
+        return f"{seconds // 60}m{seconds % 60:02d}s"
+    return f"{seconds}s"
+
+
+class NotificationDispatcher:
+    def __init__(self, console_interval: float = 1.0, batch_window: float = 1.5):
+        self.console_interval = console_interval
+        self.batch_window = batch_window
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        # archive key -> latest (name, percent, stats) not yet handled
+        self._progress: Dict[str, Tuple[str, float, Optional[ProgressStats]]] = {}
+        self._milestone_done: Dict[str, int] = {}  # archive key -> highest milestone toasted
+        self._last_print: Dict[str, float] = {}  # archive key -> time of last console line
+        self._finished = set()  # archive keys completed while progress was still pending
+        self._completions: List[Tuple[str, bool, str, Optional[str]]] = []
+        self._last_completion = 0.0
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True, name='NotificationDispatcher')
+        self._thread.start()
+
+    def stop(self, timeout: float = 2.0):
+        """Stop the thread after flushing everything still queued."""
+        self._stop.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout=timeout)
+
+    @staticmethod
+    def _key(archive_name: str, archive_path: Optional[str]) -> str:
+        return os.path.abspath(archive_path) if archive_path else archive_name
+
+    def _forget(self, key: str):
+        """Drop per-archive state once it is finished (caller holds the lock)."""
+        self._milestone_done.pop(key, None)
+        self._last_print.pop(key, None)
+        self._finished.discard(key)
+
+    def post_progress(self, archive_name: str, percent: float, stats: Optional[ProgressStats] = None,
+                      archive_path: Optional[str] = None):
+        with self._lock:
+            self._progress[self._key(archive_name, archive_path)] = (archive_name, percent, stats)
+        self._wake.set()
+
+    def post_completion(self, archive_name: str, success: bool, target_dir: str, reason: Optional[str] = None,
+                        archive_path: Optional[str] = None):
+        key = self._key(archive_name, archive_path)
+        with self._lock:
+            if key in self._progress:
+                self._finished.add(key)  # shown by the next _flush_progress(), before the completion
+            else:
+                self._forget(key)
+            self._completions.append((archive_name, success, target_dir, reason))
+            self._last_completion = time.monotonic()
+        self._wake.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.wait(timeout=0.25)
+            self._wake.clear()
+            self._flush_progress()
+            self._flush_completions(force=False)
+        self._flush_progress(force=True)
+        self._flush_completions(force=True)
+
+    def _flush_progress(self, force: bool = False):
+        now = time.monotonic()
+        with self._lock:
+            due = []
+            for key, (name, percent, stats) in list(self._progress.items()):
+                crossed = self._crossed_milestone(key, percent)
+                finished = key in self._finished
+                if (crossed is not None or force or finished
+                        or now - self._last_print.get(key, 0.0) >= self.console_interval):
+                    due.append((name, percent, stats, crossed))
+                    del self._progress[key]
+                    self._last_print[key] = now
+                    if finished:
+                        self._forget(key)
+        for name, percent, stats, crossed in due:
+            msg = f"Extracting {name} - {int(percent)}%"
+            if crossed is not None:
+                show_toast("Auto-Unzip", msg)
+                continue
+            if stats is not None and stats.written_bytes:
+                msg += f" ({stats.rate_mb_s:.1f} MB/s"
+                if stats.eta_seconds is not None:
+                    msg += f", ETA {_format_eta(stats.eta_seconds)}"
+                msg += ")"
+            print(f"[Auto-Unzip] {msg}")
+
+    def _crossed_milestone(self, key: str, percent: float) -> Optional[int]:
+        """Return the highest milestone newly reached by percent (caller holds the lock)."""
+        done = self._milestone_done.get(key, -1)
+        reached = [m for m in _MILESTONES if m > done and percent >= m]
+        if not reached:
+            return None
+        self._milestone_done[key] = reached[-1]
+        return reached[-1]
+
+    def _flush_completions(self, force: bool):
+        with self._lock:
+            if not self._completions:
+                return
+            if not force and time.monotonic() - self._last_completion < self.batch_window:
+                return  # more may be about to finish; wait for the burst to end
+            batch, self._completions = self._completions, []
+        if len(batch) == 1:
+            name, success, target_dir, reason = batch[0]
+            if success:
+                show_toast("Auto-Unzip", f"Extracted {name} to {target_dir}")
+            else:
+                show_toast("Auto-Unzip Error", f"Failed to extract {name}" + (f": {reason}" if reason else ""))
+            return
+        failed = [b for b in batch if not b[1]]
+        for name, success, target_dir, reason in batch:
+            line = f"Extracted {name} to {target_dir}" if success else f"Failed to extract {name}"
+            if reason and not success:
+                line += f": {reason}"
+            print(f"[Auto-Unzip] {line}")
+        body = f"Extracted {len(batch) - len(failed)} of {len(batch)} archives"
+        if failed:
+            body += f" ({len(failed)} failed: {', '.join(b[0] for b in failed[:3])}{'...' if len(failed) > 3 else ''})"
+        show_toast("Auto-Unzip Error" if failed else "Auto-Unzip", body)
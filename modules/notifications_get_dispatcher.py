@@ -0,0 +1,25 @@
+"""
+notifications_get_dispatcher.py
+-------------------------------
+Provides get_dispatcher() which returns the process-wide
+NotificationDispatcher, starting its thread on first use. Pending
+notifications are flushed when the interpreter exits.
+"""
+from __future__ import annotations
+import atexit
+import threading
+from typing import Optional
+
+from .notifications_dispatcher import NotificationDispatcher
+
+_dispatcher: Optional[NotificationDispatcher] = None
+_dispatcher_lock = threading.Lock()
+
+def get_dispatcher() -> NotificationDispatcher:
+    global _dispatcher
+    with _dispatcher_lock:
+        if _dispatcher is None:
+            _dispatcher = NotificationDispatcher()
+            _dispatcher.start()
+            atexit.register(_dispatcher.stop)
+        return _dispatcher
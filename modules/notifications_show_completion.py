@@ -1,13 +1,16 @@
 """
 notifications_show_completion.py
 --------------------------------
-Defines show_completion_toast() which displays a toast for success or failure
-of archive extraction.
+Defines show_completion_toast() which queues a toast for success or failure
+of archive extraction. Completions that arrive together are batched into a
+single summary toast by the NotificationDispatcher. reason, if given, is
+shown with a failure (e.g. why pre-flight checks rejected the archive);
+archive_path ties the completion to that archive's pending progress.
 """
 from __future__ import annotations
-from .notifications_toast_backend import show_toast
+from typing import Optional
+from .notifications_get_dispatcher import get_dispatcher
 
-def show_completion_toast(archive_name: str, success: bool, target_dir: str):
-    title = "Auto-Unzip" if success else "Auto-Unzip Error"
-    body = f"Extracted {archive_name} to {target_dir}" if success else f"Failed to extract {archive_name}"
-    show_toast(title, body)
+def show_completion_toast(archive_name: str, success: bool, target_dir: str, reason: Optional[str] = None,
+                          archive_path: Optional[str] = None):
+    get_dispatcher().post_completion(archive_name, success, target_dir, reason, archive_path)
@@ -1,19 +1,17 @@
 """
 notifications_show_progress.py
 ------------------------------
-Defines show_progress_toast() which displays an intermittent toast at major
-progress milestones (0%, 50%, 100%) to avoid spamming notifications. For
-intermediate updates it logs to console only.
+Defines show_progress_toast() which hands a progress update to the
+NotificationDispatcher. The dispatcher thread coalesces updates per archive,
+shows a toast at major milestones (0%, 50%, 100%) and rate-limits console
+lines (with throughput and ETA when available), so callers never block.
+archive_path, if given, tells apart archives with the same name.
 """
 from __future__ import annotations
-from .notifications_toast_backend import show_toast
+from typing import Optional
+from .notifications_get_dispatcher import get_dispatcher
+from .progress_stats import ProgressStats
 
-_milestones = {0, 50, 100}
-
-def show_progress_toast(archive_name: str, percent: float):
-    rounded = int(percent)
-    msg = f"Extracting {archive_name} - {rounded}%"
-    if rounded in _milestones:
-        show_toast("Auto-Unzip", msg)
-    else:
-        print(f"[Auto-Unzip] {msg}")
+def show_progress_toast(archive_name: str, percent: float, stats: Optional[ProgressStats] = None,
+                        archive_path: Optional[str] = None):
+    get_dispatcher().post_progress(archive_name, percent, stats, archive_path)
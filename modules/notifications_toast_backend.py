@@ -33,6 +33,14 @@ except Exception:
 	Notification = None  # type: ignore
 
 
+_toasts_enabled = True
+
+def set_toasts_enabled(enabled: bool) -> None:
+	"""Disable desktop toasts (console output only), e.g. for headless runs."""
+	global _toasts_enabled
+	_toasts_enabled = enabled
+
+
 _last_message_key = None
 _last_message_time = 0.0
 _SUPPRESS_REPEAT_SECONDS = 2.0
@@ -51,7 +59,7 @@ def show_toast(title: str, msg: str, duration: int = 5) -> None:
 	_last_message_time = now
 
 	with _toast_lock:
-		if _use_winotify and Notification is not None:  # pragma: no cover
+		if _toasts_enabled and _use_winotify and Notification is not None:  # pragma: no cover
 			try:
 				n = Notification(app_id="Auto-Unzip", title=title, msg=msg)
 				n.show()
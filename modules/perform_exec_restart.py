@@ -2,14 +2,34 @@
 perform_exec_restart.py
 ----------------------
 Provides perform_exec_restart() to restart the application process.
+
+Components register drain hooks with add_drain_hook(); before the new
+process is spawned every hook is called in registration order (e.g. the
+scheduler lets running extractions finish within restart_drain_seconds,
+pending config changes are saved). Hooks bound their own waiting; work
+still running afterwards is resumed by the new process from the job journal.
 """
 import os
 import sys
 import subprocess
+from typing import Callable, List
 from modules.write_pid_file import write_pid_file
 
+_drain_hooks: List[Callable[[], None]] = []
+
+
+def add_drain_hook(hook: Callable[[], None]):
+    """Call hook() before the process restarts."""
+    _drain_hooks.append(hook)
+
+
 def perform_exec_restart():
-    """Spawn a fresh process running the same script then exit current one."""
+    """Drain, spawn a fresh process running the same script, then exit the current one."""
+    for hook in list(_drain_hooks):
+        try:
+            hook()
+        except Exception as e:
+            print(f'[Auto-Unzip] Drain before restart failed: {e}')
     script_path = os.path.abspath(sys.argv[0])
     write_pid_file()  # refresh our pid timestamp
     args = [sys.executable, script_path] + sys.argv[1:]
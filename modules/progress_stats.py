@@ -0,0 +1,26 @@
+"""
+progress_stats.py
+-----------------
+Defines ProgressStats, the snapshot ProgressTracker passes to progress
+callbacks alongside the percentage: bytes written / consumed, elapsed time,
+throughput and estimated time remaining.
+"""
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass
+class ProgressStats:
+    percent: float
+    written_bytes: int  # uncompressed bytes written so far
+    total_bytes: Optional[int]  # uncompressed total, if the format exposes it up front
+    consumed_bytes: int  # compressed bytes read from the archive so far
+    compressed_total: Optional[int]  # archive size
+    elapsed: float  # seconds since extraction started
+    rate: float  # uncompressed bytes per second
+    eta_seconds: Optional[float]
+
+    @property
+    def rate_mb_s(self) -> float:
+        return self.rate / (1024 * 1024)
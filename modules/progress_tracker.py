@@ -0,0 +1,94 @@
+"""
+progress_tracker.py
+-------------------
+Defines ProgressTracker, the progress engine shared by all extractors.
+
+Extractors report uncompressed bytes written (add_written) and, where they
+can see it, compressed bytes consumed from the archive (set_consumed /
+add_consumed). The tracker derives a percentage from whichever total is
+known (uncompressed preferred), computes throughput and ETA, and throttles
+the callback so it fires at most every min_interval seconds unless the
+percentage moved by at least min_step. finish() always reports 100%.
+
+The callback is called as progress_cb(percent, stats) with a ProgressStats
+snapshot. The tracker is thread-safe so parallel workers can share one.
+"""
+from __future__ import annotations
+import threading
+import time
+from typing import Callable, Optional
+
+from .progress_stats import ProgressStats
+
+
+class ProgressTracker:
+    def __init__(self, progress_cb: Callable[..., None], total_bytes: Optional[int] = None,
+                 compressed_total: Optional[int] = None, min_interval: float = 0.5, min_step: float = 1.0):
+        self.progress_cb = progress_cb
+        self.total_bytes = total_bytes if total_bytes else None
+        self.compressed_total = compressed_total if compressed_total else None
+        self.min_interval = min_interval
+        self.min_step = min_step
+        self.written = 0
+        self.consumed = 0
+        self._start = time.monotonic()
+        self._last_emit = 0.0
+        self._last_percent = -1.0
+        self._lock = threading.Lock()
+
+    def add_written(self, n: int):
+        with self._lock:
+            self.written += n
+            self._maybe_emit()
+
+    def add_consumed(self, n: int):
+        with self._lock:
+            self.consumed += n
+            self._maybe_emit()
+
+    def set_consumed(self, pos: int):
+        """Record the absolute compressed position reached in the archive."""
+        with self._lock:
+            self.consumed = pos
+            self._maybe_emit()
+
+    def percent(self) -> float:
+        if self.total_bytes:
+            return min(100.0, (self.written / self.total_bytes) * 100.0)
+        if self.compressed_total:
+            return min(100.0, (self.consumed / self.compressed_total) * 100.0)
+        return 0.0
+
+    def stats(self) -> ProgressStats:
+        elapsed = max(1e-6, time.monotonic() - self._start)
+        percent = self.percent()
+        rate = self.written / elapsed
+        eta = None
+        if 0.0 < percent < 100.0:
+            eta = elapsed * (100.0 - percent) / percent
+        elif percent >= 100.0:
+            eta = 0.0
+        return ProgressStats(percent, self.written, self.total_bytes, self.consumed, self.compressed_total,
+                             elapsed, rate, eta)
+
+    def _maybe_emit(self):
+        # Caller holds self._lock
+        percent = self.percent()
+        if percent == self._last_percent:
+            return
+        now = time.monotonic()
+        if percent - self._last_percent < self.min_step and now - self._last_emit < self.min_interval:
+            return
+        self._last_percent = percent
+        self._last_emit = now
+        self.progress_cb(percent, self.stats())
+
+    def finish(self):
+        with self._lock:
+            if self.compressed_total:
+                self.consumed = self.compressed_total
+            stats = self.stats()
+            stats.percent = 100.0
+            stats.eta_seconds = 0.0
+            self._last_percent = 100.0
+            self.progress_cb(100.0, stats)
@@ -1,27 +1,32 @@
 """
 qt_event_loop.py
 -----------------
-Provides integrate_qt_loop(run_fn) which, if PyQt6 is available, creates a
-QApplication on the main thread, starts run_fn in a background thread (run_fn
-MUST NOT create Qt widgets), then enters the Qt event loop. GUI creation must
-be scheduled onto the main thread (e.g., via QTimer.singleShot). If PyQt6 is
-not available, run_fn is executed synchronously.
+Provides integrate_qt_loop(run_fn, setup_ui) which, if PyQt6 is available,
+starts run_fn in a background thread (run_fn MUST NOT create Qt widgets),
+then imports PyQt6, creates a QApplication on the main thread, calls
+setup_ui() there and enters the Qt event loop. run_fn starts before PyQt6
+is imported so folder watching does not wait for Qt to load. GUI creation
+must be scheduled onto the main thread (e.g., via QTimer.singleShot from
+setup_ui). If PyQt6 is not available, run_fn is executed synchronously.
 """
 from __future__ import annotations
+import importlib.util
 import threading
 import sys
-from typing import Callable
+from typing import Callable, Optional
 
-try:  # pragma: no cover
-    from PyQt6 import QtWidgets  # type: ignore
-except Exception:  # pragma: no cover
-    QtWidgets = None  # type: ignore
 
-
-def integrate_qt_loop(run_fn: Callable[[], None]):
-    if QtWidgets is None:
+def integrate_qt_loop(run_fn: Callable[[], None], setup_ui: Optional[Callable[[], None]] = None):
+    if importlib.util.find_spec('PyQt6') is None:
         run_fn()
         return
+    t = threading.Thread(target=lambda: _run_wrapper(run_fn), daemon=True, name='AppLogicThread')
+    t.start()
+    try:  # pragma: no cover
+        from PyQt6 import QtWidgets  # type: ignore
+    except Exception:  # pragma: no cover
+        t.join()  # broken install: keep running headless
+        return
     app = QtWidgets.QApplication.instance()
     if app is None:
         app = QtWidgets.QApplication([])
@@ -30,8 +35,11 @@ def integrate_qt_loop(run_fn: Callable[[], None]):
         app.setQuitOnLastWindowClosed(False)
     except Exception:
         pass
-    t = threading.Thread(target=lambda: _run_wrapper(run_fn), daemon=True, name='AppLogicThread')
-    t.start()
+    if setup_ui is not None:
+        try:
+            setup_ui()
+        except Exception as e:  # noqa
+            print('[Auto-Unzip] UI setup error:', e, file=sys.stderr)
     app.exec()
 
 
@@ -0,0 +1,70 @@
+"""
+reload_restart_handler.py
+-------------------------
+Defines RestartHandler, the watchdog event handler behind hot reload: it
+re-execs the process when a project source file changes. Imported only when
+enable_hot_reload is set, so watchdog is not loaded at start-up otherwise.
+"""
+import os
+import time
+from watchdog.events import FileSystemEventHandler
+from modules.perform_exec_restart import perform_exec_restart
+
+
+class RestartHandler(FileSystemEventHandler):
+    """Debounced project file change restarter.
+
+    Watches for modifications to .py / .pyw files under the project root.
+    Ignores changes in temporary / runtime folders (e.g. __pycache__).
+    On first qualifying change after the debounce window, re-execs the process.
+    """
+    def __init__(self, project_root: str, min_interval: float = 1.5, initial_delay: float = 2.0):
+        super().__init__()
+        self.project_root = os.path.abspath(project_root)
+        self.min_interval = min_interval
+        self.initial_delay = initial_delay
+        self._start_time = time.time()
+        self._last_restart = 0.0
+        self._pending = False
+ 
+    def _should_consider(self, path: str) -> bool:
+        if not path.endswith(('.py', '.pyw')):
+            return False
+        # ignore __pycache__ or hidden
+        parts = path.lower().split(os.sep)
+        if '__pycache__' in parts:
+            return False
+        # Exclude any file inside the 'testing' folder
+        if 'testing' in parts:
+            return False
+        return True
+
+    def on_modified(self, event):  # pragma: no cover
+        try:
+            changed = os.path.abspath(event.src_path)
+        except Exception:
+            return
+        # Ignore early events right after startup to prevent immediate restart loop
+        if (time.time() - self._start_time) < self.initial_delay:
+            return
+        if not self._should_consider(changed):
+            return
+        now = time.time()
+        if now - self._last_restart < self.min_interval:
+            # debounce; mark pending but do not restart yet
+            self._pending = True
+            return
+        self._trigger_restart(changed)
+
+    def _trigger_restart(self, changed: str):
+        self._last_restart = time.time()
+        self._pending = False
+        print(f'[Auto-Unzip] Source changed ({changed}), restarting...')
+        try:
+            perform_exec_restart()
+        except Exception as e:
+            print(f'[Auto-Unzip] Restart failed: {e}')
+
+    def poll(self):  # periodic check if a pending restart can now occur
+        if self._pending and (time.time() - self._last_restart) >= self.min_interval:
+            self._trigger_restart('pending-change')
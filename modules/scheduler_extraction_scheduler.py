@@ -0,0 +1,177 @@
+"""
+scheduler_extraction_scheduler.py
+---------------------------------
+Defines ExtractionScheduler which sits between DirectoryWatcher and
+process_archive(). The watcher only enqueues archive paths; a bounded pool of
+worker threads pulls jobs from the queue and runs the extraction handler.
+This keeps folder scanning running at its normal interval no matter how long
+individual extractions take.
+
+Concurrency is limited globally (max_workers) and per watched folder
+(per_folder_limit) so one busy folder cannot starve the others.
+
+With a JobJournal every job's queued/running/done transitions are written
+ahead, so jobs cut short by a crash or restart can be submitted again by the
+next process. drain() stops starting jobs and waits (bounded) for the running
+ones, e.g. before a hot-reload restart; jobs still queued stay in the journal,
+and jobs still running when the wait times out are journaled as interrupted
+so the restart does not count against their crash limit.
+
+Keyword options given to submit() are passed on to the handler, e.g.
+submit(path, depth=1) for an archive found inside another archive.
+"""
+from __future__ import annotations
+import os
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, List, Optional, Set
+
+from .index_job_journal import JobJournal
+from .metrics_registry import get_metrics
+
+
+class ExtractionScheduler:
+    def __init__(self, handler: Callable[..., None], max_workers: int = 2, per_folder_limit: int = 1,
+                 journal: Optional[JobJournal] = None):
+        self.handler = handler
+        self.journal = journal
+        self.max_workers = max(1, int(max_workers))
+        # 0 (or less) disables the per-folder cap
+        self.per_folder_limit = int(per_folder_limit)
+        self._pending: Deque[str] = deque()
+        self._tracked: Set[str] = set()  # queued or running paths (avoids duplicate jobs)
+        self._options: Dict[str, dict] = {}  # path -> handler keyword arguments
+        self._queued_at: Dict[str, float] = {}  # path -> submit time (queue wait metric)
+        self._active_per_folder: Dict[str, int] = {}
+        self._running = 0
+        self._cond = threading.Condition()
+        self._stop = False
+        self._draining = False
+        self._workers: List[threading.Thread] = []
+
+    def start(self):
+        with self._cond:
+            self._stop = False
+            alive = [t for t in self._workers if t.is_alive()]
+            self._workers = alive
+            for i in range(len(alive), self.max_workers):
+                t = threading.Thread(target=self._worker, daemon=True, name=f'ExtractionWorker-{i + 1}')
+                self._workers.append(t)
+                t.start()
+
+    def stop(self, timeout: float = 2.0):
+        with self._cond:
+            self._stop = True
+            self._cond.notify_all()
+        for t in list(self._workers):
+            t.join(timeout=timeout)
+
+    def submit(self, path: str, **options) -> bool:
+        """Queue an archive for extraction; options are passed to the handler.
+
+        Returns False if the same path is already queued or being extracted.
+        Never blocks, so it is safe to call from the watcher's scan loop.
+        """
+        full = os.path.abspath(path)
+        with self._cond:
+            if full in self._tracked:
+                return False
+            self._tracked.add(full)
+            if options:
+                self._options[full] = options
+            self._queued_at[full] = time.monotonic()
+            if self.journal is None:
+                self._pending.append(full)
+                self._cond.notify()
+        if self.journal is not None:
+            # Logged before a worker can pick it up, so 'running' never precedes 'queued'
+            self.journal.queued(full, options)
+            with self._cond:
+                self._pending.append(full)
+                self._cond.notify()
+        return True
+
+    def drain(self, timeout: float) -> bool:
+        """Stop starting queued jobs and wait up to timeout seconds for running ones.
+
+        Returns True if no job is running any more.
+        """
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            self._draining = True
+            while self._running > 0:
+                left = deadline - time.monotonic()
+                if left <= 0:
+                    running = self._tracked.difference(self._pending)
+                    break
+                self._cond.wait(left)
+            else:
+                return True
+        if self.journal is not None:
+            for path in running:
+                self.journal.interrupted(path)
+        return False
+
+    @property
+    def pending_count(self) -> int:
+        with self._cond:
+            return len(self._pending)
+
+    @property
+    def active_count(self) -> int:
+        with self._cond:
+            return self._running
+
+    def _take_next(self) -> Optional[str]:
+        """Pop the first queued job whose folder is below its concurrency cap.
+
+        Must be called with self._cond held.
+        """
+        for idx, path in enumerate(self._pending):
+            folder = os.path.dirname(path)
+            if self.per_folder_limit > 0 and self._active_per_folder.get(folder, 0) >= self.per_folder_limit:
+                continue
+            del self._pending[idx]
+            self._active_per_folder[folder] = self._active_per_folder.get(folder, 0) + 1
+            self._running += 1
+            return path
+        return None
+
+    def _worker(self):
+        while True:
+            with self._cond:
+                path = None
+                while not self._stop:
+                    path = None if self._draining else self._take_next()
+                    if path is not None:
+                        break
+                    self._cond.wait()
+                if path is None:
+                    return
+                options = self._options.pop(path, {})
+                queued_at = self._queued_at.pop(path, None)
+            if queued_at is not None:
+                get_metrics().observe('autounzip_queue_wait_seconds', time.monotonic() - queued_at)
+            if self.journal is not None:
+                self.journal.running(path)
+            outcome = 'finished'
+            try:
+                self.handler(path, **options)
+            except Exception as e:
+                outcome = 'error'
+                print(f'[Auto-Unzip] Extraction job failed for {path}: {e}')
+            finally:
+                if self.journal is not None:
+                    self.journal.done(path, outcome)
+                with self._cond:
+                    folder = os.path.dirname(path)
+                    left = self._active_per_folder.get(folder, 1) - 1
+                    if left > 0:
+                        self._active_per_folder[folder] = left
+                    else:
+                        self._active_per_folder.pop(folder, None)
+                    self._running -= 1
+                    self._tracked.discard(path)
+                    # A freed folder slot may unblock jobs other workers skipped
+                    self._cond.notify_all()
@@ -0,0 +1,57 @@
+"""
+startup_profile.py
+------------------
+Defines StartupProfile, a phase timer for application start-up.
+auto-unzip.pyw wraps each group of imports and start-up steps in
+profile.phase(name); with --startup-profile the phases (start offset and
+duration in milliseconds, measured from when the script began executing)
+are printed once the first folder scan has started. Kept dependency-free so
+it can be imported before anything else.
+"""
+from __future__ import annotations
+import threading
+import time
+from contextlib import contextmanager
+from typing import List, Optional, Tuple
+
+# Budget for launch -> first scan; exceeding it is flagged in the report
+FIRST_SCAN_TARGET_MS = 200.0
+
+
+class StartupProfile:
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.t0 = time.perf_counter()
+        self._phases: List[Tuple[str, float, float]] = []  # (name, start offset, duration) in seconds
+        self._lock = threading.Lock()
+        self._reported = False
+
+    @contextmanager
+    def phase(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._phases.append((name, start - self.t0, time.perf_counter() - start))
+
+    def mark(self, name: str, at: Optional[float] = None):
+        """Record a point in time (perf_counter value, default now) without duration."""
+        at = time.perf_counter() if at is None else at
+        with self._lock:
+            self._phases.append((name, at - self.t0, 0.0))
+
+    def report(self):
+        """Print the recorded phases (once, and only when enabled)."""
+        with self._lock:
+            if not self.enabled or self._reported:
+                return
+            self._reported = True
+            phases = sorted(self._phases, key=lambda p: p[1])
+        print('[Auto-Unzip] Startup profile (ms since launch / phase duration):')
+        for name, start, duration in phases:
+            print(f'  {start * 1000:8.1f}  {duration * 1000:8.1f}  {name}')
+        first_scan = next((start for name, start, _ in phases if name == 'first scan started'), None)
+        if first_scan is not None:
+            verdict = 'ok' if first_scan * 1000 <= FIRST_SCAN_TARGET_MS else 'over budget'
+            print(f'  first scan after {first_scan * 1000:.1f} ms (target {FIRST_SCAN_TARGET_MS:.0f} ms: {verdict})')
@@ -4,6 +4,7 @@ tray_tray_controller.py
 Defines TrayController for creating an optional system tray icon with pystray
 (if installed). Provides a single menu entry "Options" which opens the options
 GUI window. The GUI itself will offer controls and a Quit button.
+pystray and Pillow are imported by start(), not at module import.
 """
 from __future__ import annotations
 import threading
@@ -11,13 +12,22 @@ import queue
 import time
 from typing import Callable, Any, Optional
 
-try:
-    import pystray  # type: ignore
-    from PIL import Image, ImageDraw  # type: ignore
-except ImportError:  # pragma: no cover
-    pystray = None  # type: ignore
-    Image = None  # type: ignore
-    ImageDraw = None  # type: ignore
+pystray = None  # type: ignore
+Image = None  # type: ignore
+ImageDraw = None  # type: ignore
+
+
+def _load_backend() -> bool:  # pragma: no cover
+    """Import pystray and Pillow on first use; False if either is missing."""
+    global pystray, Image, ImageDraw
+    if pystray is None:
+        try:
+            import pystray as _pystray  # type: ignore
+            from PIL import Image as _Image, ImageDraw as _ImageDraw  # type: ignore
+        except ImportError:
+            return False
+        pystray, Image, ImageDraw = _pystray, _Image, _ImageDraw
+    return True
 
 class TrayController:
     def __init__(self, open_options: Callable[[], None], request_quit: Optional[Callable[[], None]] = None):
@@ -69,7 +79,7 @@ class TrayController:
             self._action_queue.put(self.open_options)
 
     def start(self):  # pragma: no cover
-        if not pystray:
+        if not _load_backend():
             print('[Auto-Unzip] pystray not installed, skipping tray icon.')
             return
         if self._icon:
@@ -0,0 +1,26 @@
+"""
+watcher_create_watcher.py
+-------------------------
+Provides create_watcher() which builds the directory watcher selected by
+Config.watch_mode: 'events' (watchdog observer with periodic reconciliation
+scans) or 'poll' (plain scandir polling).
+"""
+from __future__ import annotations
+from typing import Callable, Optional
+from .config_dataclass import Config
+from .index_processed_archives import ProcessedArchiveIndex
+from .watcher_directory_watcher import DirectoryWatcher
+
+
+def create_watcher(cfg: Config, on_new_archive: Callable[[str], None],
+                   index: Optional[ProcessedArchiveIndex] = None) -> DirectoryWatcher:
+    mode = str(getattr(cfg, 'watch_mode', 'events')).lower()
+    if mode == 'events':
+        from .watcher_event_watcher import EventDirectoryWatcher
+        return EventDirectoryWatcher(lambda: cfg.watch_folders, on_new_archive, cfg.poll_interval_seconds,
+                                     cfg.reconcile_interval_seconds, cfg.settle_seconds, index,
+                                     cfg.watcher_max_seen_entries)
+    if mode != 'poll':
+        print(f"[Auto-Unzip] Unknown watch_mode '{mode}', using polling.")
+    return DirectoryWatcher(lambda: cfg.watch_folders, on_new_archive, cfg.poll_interval_seconds, cfg.settle_seconds, index,
+                            cfg.watcher_max_seen_entries)
@@ -3,52 +3,230 @@ watcher_directory_watcher.py
 ----------------------------
 Defines DirectoryWatcher which polls watch folders for new archive files and
 calls a callback for each new archive found. Polling keeps dependencies minimal.
+The callback should return quickly (normally ExtractionScheduler.submit) so a
+long extraction never delays the next scan.
+
+New or modified archives first go through a settling stage: an archive is
+only dispatched once its size and mtime have not changed for settle_seconds
+and probe_file_ready() confirms nobody still has it open for writing. This
+stops half-downloaded files from being extracted (and re-extracted on every
+mtime bump).
+
+An optional ProcessedArchiveIndex lets archives handled by a previous run
+(same path, size and mtime) be skipped after a restart. Dispatched versions
+are remembered in a bounded SeenCache that is pruned as files disappear.
+
+Volumes of a multi-volume RAR set are not dispatched on their own: when any
+volume settles, the set's first volume is dispatched once every volume has
+arrived (see rar_volume_set).
 """
 from __future__ import annotations
 import os
 import threading
 import time
-from typing import Callable, Iterable, Set
+from typing import Callable, Iterable, Optional, Set
+
+from .extract_rar_volumes import first_rar_volume, is_rar_volume_name, rar_volume_set
+from .index_processed_archives import ProcessedArchiveIndex
+from .metrics_registry import get_metrics
+from .watcher_probe_file_ready import probe_file_ready
+from .watcher_seen_cache import SeenCache
 
 ARCHIVE_EXTENSIONS = {
-    '.zip', '.zipx', '.7z', '.rar', '.tar', '.gz', '.bz2', '.tgz', '.tbz', '.tar.gz', '.tar.bz2', '.cab'
+    '.zip', '.zipx', '.7z', '.rar', '.tar', '.gz', '.bz2', '.xz', '.tgz', '.tbz', '.tbz2', '.txz', '.tar.gz', '.tar.bz2',
+    '.tar.xz', '.zst', '.tzst', '.tar.zst', '.cab'
 }
 
+# In-progress download names used by browsers / download managers
+TEMP_DOWNLOAD_SUFFIXES = ('.crdownload', '.part', '.partial', '.tmp', '.download', '.opdownload')
+
+# How often pending (settling) archives are re-checked between scans
+SETTLE_CHECK_INTERVAL = 0.5
+
 class DirectoryWatcher:
-    def __init__(self, get_folders: Callable[[], Iterable[str]], on_new_archive: Callable[[str], None], interval: float = 2.0):
+    def __init__(self, get_folders: Callable[[], Iterable[str]], on_new_archive: Callable[[str], None], interval: float = 2.0,
+                 settle_seconds: float = 2.0, index: Optional[ProcessedArchiveIndex] = None,
+                 max_seen_entries: int = 50000):
         self.get_folders = get_folders
         self.on_new_archive = on_new_archive
         self.interval = interval
-        self._seen = {}  # type: dict[str, float]
+        self.settle_seconds = settle_seconds
+        self.index = index
+        self._seen = SeenCache(max_seen_entries)
+        # path -> (size, mtime, time the signature was first observed)
+        self._settling = {}  # type: dict[str, tuple[int, float, float]]
+        self._seen_lock = threading.Lock()  # event backends report from other threads
         self._stop = threading.Event()
+        self._wake = threading.Event()  # set by stop() and set_intervals() to cut a wait short
+        self._rescan_requested = False
         self._thread = None
+        # Set when the first folder scan begins (start-up profiling)
+        self.first_scan_started = threading.Event()
+        self.first_scan_at: Optional[float] = None  # time.perf_counter() value
 
     def start(self):
         if self._thread and self._thread.is_alive():
             return
-        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True, name='DirectoryWatcher')
         self._thread.start()
 
     def stop(self):
         self._stop.set()
+        self._wake.set()
         if self._thread:
             self._thread.join(timeout=2)
 
+    def set_intervals(self, interval: Optional[float] = None, settle_seconds: Optional[float] = None):
+        """Apply new timing settings to the running watcher (next wait uses them)."""
+        if interval is not None:
+            self.interval = interval
+        if settle_seconds is not None:
+            self.settle_seconds = settle_seconds
+        self._wake.set()
+
+    def rescan(self):
+        """Scan all folders soon (e.g. after the folder list changed)."""
+        self._rescan_requested = True
+        self._wake.set()
+
+    def _sleep(self, seconds: float):
+        self._wake.wait(seconds)
+        self._wake.clear()
+
+    @property
+    def seen_count(self) -> int:
+        """Number of archive versions currently remembered (for metrics)."""
+        return len(self._seen)
+
+    @staticmethod
+    def _is_archive_name(name: str) -> bool:
+        lower = name.lower()
+        if lower.endswith(TEMP_DOWNLOAD_SUFFIXES):
+            return False
+        return os.path.splitext(lower)[1] in ARCHIVE_EXTENSIONS or is_rar_volume_name(lower)
+
+    def _consider(self, full: str, size: int, mtime: float):
+        """Start (or restart) settling for full if it is new or modified since last dispatch."""
+        now = time.time()
+        with self._seen_lock:
+            last_seen = self._seen.get(full)
+            if last_seen is not None and mtime <= last_seen:
+                return
+            if self.index is not None and self.index.contains(full, size, mtime):
+                self._seen.set(full, mtime)  # handled by an earlier run
+                return
+            pending = self._settling.get(full)
+            if pending is not None and pending[0] == size and pending[1] == mtime:
+                return  # unchanged, keep the original stability timer
+            # A file untouched for settle_seconds already counts as stable
+            since = now if now - mtime < self.settle_seconds else now - self.settle_seconds
+            self._settling[full] = (size, mtime, since)
+
+    def _check_settled(self):
+        """Dispatch settling archives whose size/mtime stayed unchanged long enough."""
+        with self._seen_lock:
+            candidates = list(self._settling.items())
+        if not candidates:
+            return
+        now = time.time()
+        ready = []
+        for full, (size, mtime, since) in candidates:
+            try:
+                st = os.stat(full)
+            except OSError:
+                with self._seen_lock:
+                    self._settling.pop(full, None)  # renamed away or deleted before settling
+                continue
+            if st.st_size != size or st.st_mtime != mtime:
+                with self._seen_lock:
+                    self._settling[full] = (st.st_size, st.st_mtime, now)
+                continue
+            if now - since < self.settle_seconds or not probe_file_ready(full):
+                continue
+            with self._seen_lock:
+                if self._settling.get(full, (None, None))[:2] != (size, mtime):
+                    continue  # changed concurrently; re-check next round
+                del self._settling[full]
+                self._seen.set(full, mtime)
+            ready.append((full, mtime))
+        dispatched = set()
+        metrics = get_metrics()
+        for full, mtime in ready:
+            target = self._dispatch_target(full)
+            if target is not None and target not in dispatched:
+                dispatched.add(target)
+                metrics.observe('autounzip_detect_seconds', max(0.0, time.time() - mtime))
+                metrics.inc('autounzip_archives_detected_total')
+                self.on_new_archive(target)
+
+    def _dispatch_target(self, full: str) -> Optional[str]:
+        """Path to hand out for a settled archive: itself, the first volume of its
+        now complete RAR set, or None while volumes are still missing."""
+        if not (full.lower().endswith('.rar') or is_rar_volume_name(full)):
+            return full
+        first = first_rar_volume(full)
+        volumes = rar_volume_set(first)
+        if volumes is None:
+            return None  # the next volume to arrive checks again
+        if first != full:
+            try:
+                st = os.stat(first)
+            except OSError:
+                return None
+            with self._seen_lock:
+                if self.index is not None and self.index.contains(first, st.st_size, st.st_mtime):
+                    return None
+                self._seen.set(first, st.st_mtime)
+        return first
+
+    def _forget(self, full: str):
+        """Drop all state for an archive that no longer exists."""
+        with self._seen_lock:
+            self._seen.discard(full)
+            self._settling.pop(full, None)
+
+    def _scan_folder(self, folder: str):
+        present = set()
+        for entry in os.scandir(folder):
+            if not entry.is_file():
+                continue
+            if self._is_archive_name(entry.name):
+                full = os.path.abspath(entry.path)
+                present.add(full)
+                st = entry.stat()
+                self._consider(full, st.st_size, st.st_mtime)
+        # Complete listing: anything remembered for this folder but not present is gone
+        with self._seen_lock:
+            self._seen.prune_folder(os.path.abspath(folder), present)
+
+    def _scan_all(self):
+        if self.first_scan_at is None:
+            self.first_scan_at = time.perf_counter()
+            self.first_scan_started.set()
+        metrics = get_metrics()
+        for folder in list(self.get_folders()):
+            start = time.perf_counter()
+            try:
+                self._scan_folder(folder)
+            except FileNotFoundError:
+                continue
+            metrics.observe('autounzip_folder_scan_seconds', time.perf_counter() - start, folder=folder)
+
+    def _next_wait(self, until: float) -> float:
+        """Seconds to sleep before the next loop iteration (shorter while files are settling)."""
+        wait = until - time.monotonic()
+        if self._settling:
+            wait = min(wait, SETTLE_CHECK_INTERVAL)
+        return max(0.05, wait)
+
     def _run(self):
+        last_scan = None
         while not self._stop.is_set():
-            for folder in list(self.get_folders()):
-                try:
-                    for entry in os.scandir(folder):
-                        if not entry.is_file():
-                            continue
-                        ext = os.path.splitext(entry.name)[1].lower()
-                        if ext in ARCHIVE_EXTENSIONS:
-                            full = os.path.abspath(entry.path)
-                            mtime = entry.stat().st_mtime
-                            last_seen = self._seen.get(full)
-                            if last_seen is None or mtime > last_seen:
-                                self._seen[full] = mtime
-                                self.on_new_archive(full)
-                except FileNotFoundError:
-                    continue
-            time.sleep(self.interval)
+            # Deadline recomputed every round so a changed interval applies at once
+            if last_scan is None or self._rescan_requested or time.monotonic() >= last_scan + self.interval:
+                self._rescan_requested = False
+                self._scan_all()
+                last_scan = time.monotonic()
+            self._check_settled()
+            self._sleep(self._next_wait(last_scan + self.interval))
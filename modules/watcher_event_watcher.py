@@ -0,0 +1,140 @@
+"""
+watcher_event_watcher.py
+------------------------
+Defines EventDirectoryWatcher, a DirectoryWatcher variant driven by watchdog
+filesystem events instead of re-scanning every folder each poll interval.
+Created / moved / modified / closed events for archive files are fed to the
+settling stage almost immediately. A full scan still runs at start-up and
+then every reconcile_interval seconds as a safety net for missed events (network
+shares, event buffer overflows, folders that did not exist yet).
+
+If watchdog is not installed the watcher falls back to plain polling.
+watchdog is imported by the watcher thread after its first scan, so archives
+already present are picked up without waiting for the import.
+"""
+from __future__ import annotations
+import os
+import time
+from typing import Callable, Dict, Iterable, Optional
+
+from .index_processed_archives import ProcessedArchiveIndex
+from .watcher_directory_watcher import DirectoryWatcher
+
+
+class _ArchiveEventHandler:
+    """Forwards file events for archive names to the owning watcher.
+
+    Implements watchdog's handler protocol (dispatch) directly so watchdog
+    need not be imported to define it.
+    """
+    def __init__(self, watcher: 'EventDirectoryWatcher'):
+        self._watcher = watcher
+
+    def dispatch(self, event):  # pragma: no cover
+        handler = getattr(self, f'on_{event.event_type}', None)
+        if handler is not None:
+            handler(event)
+
+    def on_created(self, event):  # pragma: no cover
+        if not event.is_directory:
+            self._watcher._on_event_path(event.src_path)
+
+    def on_moved(self, event):  # pragma: no cover
+        # Browsers finish downloads by renaming *.crdownload / *.part to the final name
+        if not event.is_directory:
+            self._watcher._forget(os.path.abspath(event.src_path))
+            self._watcher._on_event_path(event.dest_path)
+
+    def on_deleted(self, event):  # pragma: no cover
+        if not event.is_directory:
+            self._watcher._forget(os.path.abspath(event.src_path))
+
+    def on_modified(self, event):  # pragma: no cover
+        if not event.is_directory:
+            self._watcher._on_event_path(event.src_path)
+
+    def on_closed(self, event):  # pragma: no cover
+        if not event.is_directory:
+            self._watcher._on_event_path(event.src_path)
+
+
+class EventDirectoryWatcher(DirectoryWatcher):
+    def __init__(self, get_folders: Callable[[], Iterable[str]], on_new_archive: Callable[[str], None],
+                 interval: float = 2.0, reconcile_interval: float = 60.0, settle_seconds: float = 2.0,
+                 index: Optional[ProcessedArchiveIndex] = None, max_seen_entries: int = 50000):
+        super().__init__(get_folders, on_new_archive, interval, settle_seconds, index, max_seen_entries)
+        self.reconcile_interval = reconcile_interval
+        self._observer = None
+        self._handler = _ArchiveEventHandler(self)
+        self._watches: Dict[str, object] = {}  # folder -> watchdog ObservedWatch
+
+    def stop(self):
+        super().stop()
+        if self._observer is not None:
+            try:
+                self._observer.stop()
+                self._observer.join(timeout=2)
+            except Exception:
+                pass
+            self._observer = None
+            self._watches.clear()
+
+    def _on_event_path(self, path: str):
+        if not self._is_archive_name(os.path.basename(path)):
+            return
+        full = os.path.abspath(path)
+        try:
+            st = os.stat(full)
+        except OSError:
+            return  # already gone (temp file, moved away, deleted)
+        self._consider(full, st.st_size, st.st_mtime)
+
+    def _sync_watches(self):
+        """Schedule new watch folders and drop removed ones."""
+        wanted = set()
+        for folder in list(self.get_folders()):
+            full = os.path.abspath(folder)
+            if os.path.isdir(full):
+                wanted.add(full)
+        for folder in list(self._watches):
+            if folder not in wanted:
+                try:
+                    self._observer.unschedule(self._watches.pop(folder))
+                except Exception:
+                    pass
+        for folder in wanted:
+            if folder in self._watches:
+                continue
+            try:
+                self._watches[folder] = self._observer.schedule(self._handler, folder, recursive=False)
+                self._scan_folder(folder)  # archives already in a newly added folder
+            except Exception as e:
+                # Leave it to the reconciliation scan; retried on the next sync
+                print(f'[Auto-Unzip] Could not watch {folder} for events: {e}')
+
+    def _run(self):
+        self._scan_all()
+        try:
+            from watchdog.observers import Observer  # type: ignore
+        except ImportError:  # pragma: no cover
+            print('[Auto-Unzip] watchdog not installed, falling back to polling.')
+            super()._run()
+            return
+        self._observer = Observer()
+        self._observer.start()
+        # The sync also scans every folder, catching archives created since the first scan
+        self._sync_watches()
+        last_reconcile = last_sync = time.monotonic()
+        while not self._stop.is_set():
+            # Deadlines recomputed every round so changed intervals apply at once
+            now = time.monotonic()
+            if self._rescan_requested or now >= last_sync + self.interval:
+                # Cheap: only compares the configured folder list with active watches
+                self._rescan_requested = False
+                self._sync_watches()
+                last_sync = now
+            if now >= last_reconcile + self.reconcile_interval:
+                self._scan_all()
+                last_reconcile = time.monotonic()
+            self._check_settled()
+            self._sleep(self._next_wait(min(last_sync + self.interval, last_reconcile + self.reconcile_interval)))
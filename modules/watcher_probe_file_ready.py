@@ -0,0 +1,26 @@
+"""
+watcher_probe_file_ready.py
+---------------------------
+Provides probe_file_ready() which checks whether another process still holds
+a file open for writing. On Windows browsers and copy tools keep a write
+handle open without sharing write access, so opening the file for update
+fails until the download completes. On other platforms there is no mandatory
+locking, so the probe only checks the file can be opened; size/mtime
+stability in the watcher does the rest.
+"""
+import os
+import sys
+
+
+def probe_file_ready(path: str) -> bool:
+    """Return True if path can be opened now (i.e. nobody is still writing it)."""
+    mode = 'rb'
+    if sys.platform.startswith('win') and os.access(path, os.W_OK):
+        # Read-only files can't be opened for update; only probe writable ones
+        mode = 'r+b'
+    try:
+        with open(path, mode):
+            pass
+        return True
+    except OSError:
+        return False
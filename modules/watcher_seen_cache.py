@@ -0,0 +1,74 @@
+"""
+watcher_seen_cache.py
+---------------------
+Defines SeenCache, the bounded memory DirectoryWatcher uses to remember which
+archive versions (path -> mtime) it already dispatched.
+
+- Entries for files that disappeared from a folder scan are pruned, so
+  archives removed by delete_archives_after_extract don't linger.
+- The cache is an LRU capped at max_entries; every scan touches the files it
+  still sees, so only long-unseen paths are evicted first.
+- Keys are interned strings and values plain floats, with a per-folder key
+  set so pruning a folder never walks the whole cache.
+"""
+from __future__ import annotations
+import os
+import sys
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Set
+
+
+class SeenCache:
+    def __init__(self, max_entries: int = 50000):
+        self.max_entries = max(1, int(max_entries))
+        self._entries: "OrderedDict[str, float]" = OrderedDict()
+        self._by_folder: Dict[str, Set[str]] = {}
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, path: str) -> bool:
+        return path in self._entries
+
+    def get(self, path: str) -> Optional[float]:
+        mtime = self._entries.get(path)
+        if mtime is not None:
+            self._entries.move_to_end(path)
+        return mtime
+
+    def set(self, path: str, mtime: float):
+        path = sys.intern(path)
+        if path not in self._entries:
+            self._by_folder.setdefault(os.path.dirname(path), set()).add(path)
+        self._entries[path] = mtime
+        self._entries.move_to_end(path)
+        while len(self._entries) > self.max_entries:
+            old, _ = self._entries.popitem(last=False)
+            self._drop_from_folder(old)
+            self.evictions += 1
+
+    def discard(self, path: str):
+        if self._entries.pop(path, None) is not None:
+            self._drop_from_folder(path)
+
+    def prune_folder(self, folder: str, present: Iterable[str]) -> int:
+        """Forget entries in folder that are not in present; return how many were removed."""
+        keys = self._by_folder.get(folder)
+        if not keys:
+            return 0
+        gone = keys.difference(present)
+        for path in gone:
+            self._entries.pop(path, None)
+        keys.difference_update(gone)
+        if not keys:
+            del self._by_folder[folder]
+        return len(gone)
+
+    def _drop_from_folder(self, path: str):
+        folder = os.path.dirname(path)
+        keys = self._by_folder.get(folder)
+        if keys is not None:
+            keys.discard(path)
+            if not keys:
+                del self._by_folder[folder]
@@ -0,0 +1,108 @@
+"""
+workflow_batch_extract.py
+-------------------------
+Defines run_batch() which extracts every archive found under a set of paths
+with a pool of worker threads and returns a summary, for the headless
+`--headless --once PATH...` mode (cron jobs, CI) that runs without the
+watcher, tray or Qt.
+
+- discover_archives(): files given directly plus archives found by walking
+  given folders recursively; in-progress downloads, staging folders of
+  interrupted runs and non-first RAR volumes are skipped
+- each archive goes through process_archive(), so staging, pre-flight
+  checks, nested archives, dedup and deletion behave as in the service;
+  large nested archives are queued onto the same pool
+"""
+from __future__ import annotations
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Dict, Iterable, List
+
+from .config_dataclass import Config
+from .extract_rar_volumes import first_rar_volume, is_rar_volume_name
+from .extract_sniff_format import archive_format_from_name
+from .index_extraction_cache import ExtractionCache
+from .metrics_registry import get_metrics
+from .watcher_directory_watcher import TEMP_DOWNLOAD_SUFFIXES
+from .workflow_process_archive import process_archive
+from .workflow_staged_extraction import STAGING_SUFFIX
+
+
+def _is_archive_file(name: str) -> bool:
+    lower = name.lower()
+    if lower.endswith(TEMP_DOWNLOAD_SUFFIXES) or archive_format_from_name(lower) is None:
+        return False
+    return not is_rar_volume_name(name) or first_rar_volume(name) == name
+
+
+def discover_archives(paths: Iterable[str]) -> List[str]:
+    found: List[str] = []
+    for path in paths:
+        path = os.path.abspath(path)
+        if os.path.isfile(path):
+            found.append(path)
+            continue
+        for folder, dirs, names in os.walk(path):
+            dirs[:] = sorted(d for d in dirs if not (d.startswith('.') and d.endswith(STAGING_SUFFIX)))
+            found += [os.path.join(folder, n) for n in sorted(names) if _is_archive_file(n)]
+    return list(dict.fromkeys(found))
+
+
+def _output_bytes() -> float:
+    series = get_metrics().snapshot()['counters'].get('autounzip_extract_output_bytes_total', [])
+    return sum(s['value'] for s in series)
+
+
+def run_batch(paths: Iterable[str], cfg: Config, jobs: int = 0) -> Dict:
+    """Extract all archives under paths; returns the summary printed by --headless."""
+    jobs = jobs if jobs > 0 else max(1, cfg.max_concurrent_extractions)
+    cache = ExtractionCache() if getattr(cfg, 'dedup_mode', 'off') != 'off' else None
+    archives = discover_archives(paths)
+    started = time.perf_counter()
+    output_before = _output_bytes()
+    results: List[Dict] = []
+    queued: List[tuple] = [(p, 0) for p in archives]
+    lock = threading.Lock()
+
+    def _submit(path: str, depth: int = 0, **_) -> bool:
+        with lock:
+            queued.append((os.path.abspath(path), depth))
+        return True
+
+    def _job(path: str, depth: int) -> Dict:
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            size = 0
+        start = time.perf_counter()
+        try:
+            ok = process_archive(path, cfg, None, depth, _submit, cache)
+        except Exception as e:
+            print(f'[Auto-Unzip] Extraction job failed for {path}: {e}')
+            ok = False
+        return {'path': path, 'success': ok, 'archive_bytes': size, 'depth': depth,
+                'seconds': round(time.perf_counter() - start, 3)}
+
+    with ThreadPoolExecutor(max_workers=jobs, thread_name_prefix='BatchWorker') as pool:
+        running = set()
+        while True:
+            with lock:
+                batch, queued[:] = list(queued), []
+            running |= {pool.submit(_job, p, d) for p, d in batch}
+            if not running:
+                break
+            done, running = wait(running, return_when=FIRST_COMPLETED)
+            results += [f.result() for f in done]
+    succeeded = sum(1 for r in results if r['success'])
+    return {
+        'archives': len(results),
+        'succeeded': succeeded,
+        'failed': len(results) - succeeded,
+        'archive_bytes': sum(r['archive_bytes'] for r in results),
+        'output_bytes': int(_output_bytes() - output_before),
+        'duration_seconds': round(time.perf_counter() - started, 3),
+        'jobs': jobs,
+        'results': sorted(results, key=lambda r: r['path']),
+    }
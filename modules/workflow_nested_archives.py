@@ -0,0 +1,214 @@
+"""
+workflow_nested_archives.py
+---------------------------
+Recursive extraction of archives found inside an extracted archive (a zip of
+.tar.gz files, say). Used by process_archive() when extract_nested_archives
+is enabled; depth counts archive levels below the one being processed and
+stops at nested_max_depth.
+
+- plan_streamed_members(): for a zip (or zipx) outer archive, picks inner
+  archives whose uncompressed member size is at most nested_stream_max_mb.
+  They are left out of the normal extraction and extract_streamed_members()
+  unpacks them straight from the outer archive's member stream, so the inner
+  archive itself is never written to disk. Only the inner archive file is
+  held in memory; its contents are streamed to disk.
+- extract_nested_in_tree(): walks an extracted tree for remaining archives.
+  Small ones are extracted in place within the same job; larger ones are
+  returned as (relative path, depth) pairs so the caller can queue them on
+  the worker pool, at the depth they were found, once the tree has been
+  moved to its final location.
+
+Each inner archive is extracted into a folder named after it, next to where
+the archive would have been. The inner archive file is removed after a
+successful extraction when delete_archives_after_extract is set. A failed
+inner extraction never fails the outer job; the inner archive is kept as a
+plain file instead. Every inner archive goes through preflight_check() (file
+count, size, compression ratio, free space) like a top-level one, and one
+that fails it is kept as a file too.
+"""
+from __future__ import annotations
+import io
+import os
+import shutil
+import tarfile
+import zipfile
+from typing import Dict, List, Tuple
+
+from .config_dataclass import Config
+from .extract_archive import extract_archive
+from .extract_rar_volumes import first_rar_volume, is_rar_volume_name
+from .extract_sniff_format import (SNIFF_BYTES, archive_format_from_name, sniff_bytes, sniff_format,
+                                   strip_archive_extension)
+from .extract_zip_members import prepare_zip_tree
+from .workflow_preflight import preflight_check, preflight_check_bytes
+
+_MB = 1024 * 1024
+_STREAMABLE = {'zip', 'zipx', 'tar', 'tar.gz', 'tar.bz2', 'tar.xz', 'gzip', 'bzip2', 'xz', '7z'}
+_COPY_CHUNK = 1024 * 1024
+
+
+def nested_enabled(cfg: Config, depth: int) -> bool:
+    """Whether archives found at depth + 1 should still be extracted."""
+    return bool(getattr(cfg, 'extract_nested_archives', False)) and depth < getattr(cfg, 'nested_max_depth', 3)
+
+
+def _stream_limit(cfg: Config) -> int:
+    return int(getattr(cfg, 'nested_stream_max_mb', 64) * _MB)
+
+
+def _is_inner_archive(name: str) -> bool:
+    if archive_format_from_name(name) is None:
+        return False
+    # Only the first volume of a multi-volume RAR stands for the whole set
+    return not is_rar_volume_name(name) or first_rar_volume(name) == name
+
+
+def _output_dir(archive_file: str) -> str:
+    folder, name = os.path.split(archive_file)
+    return os.path.join(folder, strip_archive_extension(name))
+
+
+def plan_streamed_members(archive_path: str, cfg: Config, depth: int) -> Dict[str, zipfile.ZipInfo]:
+    """Inner archives of a zip outer archive to extract from memory, by member name.
+
+    The limit applies to the member's uncompressed size, which is what
+    zf.read() holds in memory; larger members are extracted to disk and
+    handled by extract_nested_in_tree() (or the worker pool).
+    """
+    if not nested_enabled(cfg, depth) or sniff_format(archive_path) not in ('zip', 'zipx'):
+        return {}
+    limit = _stream_limit(cfg)
+    try:
+        with zipfile.ZipFile(archive_path) as zf:
+            return {m.filename: m for m in zf.infolist()
+                    if not m.is_dir() and m.file_size <= limit and _is_inner_archive(m.filename)
+                    and archive_format_from_name(m.filename) in _STREAMABLE}
+    except (OSError, zipfile.BadZipFile):
+        return {}
+
+
+def _unpack_single(fileobj, fmt: str, out_path: str):
+    import gzip
+    import bz2
+    import lzma
+    opener = {'gzip': gzip.GzipFile, 'bzip2': bz2.BZ2File, 'xz': lzma.LZMAFile}[fmt]
+    with opener(fileobj=fileobj) if fmt == 'gzip' else opener(fileobj) as src, open(out_path, 'wb') as out:
+        shutil.copyfileobj(src, out, _COPY_CHUNK)
+
+
+def _check_inside(out_dir: str, name: str):
+    root = os.path.realpath(out_dir)
+    if os.path.commonpath([root, os.path.realpath(os.path.join(root, name))]) != root:
+        raise ValueError(f"member {name!r} would be written outside the output folder")
+
+
+def _unpack_bytes(data: bytes, fmt: str, name: str, out_dir: str) -> bool:
+    """Extract an archive held in memory into out_dir; False if the format is not handled.
+
+    Member paths are confined to out_dir: zip names are sanitised like
+    extract_zip_members does, tars go through tarfile's 'data' filter (as in
+    extract_tar_gz_bz2), and a 7z member pointing outside out_dir fails the
+    whole inner archive.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    if fmt in ('zip', 'zipx'):
+        with zipfile.ZipFile(io.BytesIO(data)) as zf:
+            infos = zf.infolist()
+            for member, target in prepare_zip_tree(out_dir, infos).items():
+                with zf.open(member) as src, open(target, 'wb') as out:
+                    shutil.copyfileobj(src, out, _COPY_CHUNK)
+    elif fmt in ('tar', 'tar.gz', 'tar.bz2', 'tar.xz', 'bzip2'):
+        try:
+            with tarfile.open(fileobj=io.BytesIO(data), mode='r|*') as tf:
+                tf.extractall(out_dir, filter='data')
+        except tarfile.ReadError:
+            if fmt != 'bzip2':
+                raise
+            _unpack_single(io.BytesIO(data), fmt, os.path.join(out_dir, strip_archive_extension(name)))
+    elif fmt in ('gzip', 'xz'):
+        _unpack_single(io.BytesIO(data), fmt, os.path.join(out_dir, strip_archive_extension(name)))
+    elif fmt == '7z':
+        import py7zr
+        with py7zr.SevenZipFile(io.BytesIO(data), mode='r') as archive:
+            for member in archive.getnames():
+                _check_inside(out_dir, member)
+            archive.extractall(path=out_dir)
+    else:
+        return False
+    return True
+
+
+def extract_streamed_members(archive_path: str, target_dir: str, members: Dict[str, zipfile.ZipInfo],
+                             cfg: Config, depth: int) -> List[Tuple[str, int]]:
+    """Extract the planned inner archives of archive_path from memory into target_dir.
+
+    Returns (relative path, depth) of archives found inside them that are too
+    large to handle in this job (see extract_nested_in_tree).
+    """
+    deferred: List[Tuple[str, int]] = []
+    targets = prepare_zip_tree(target_dir, members.values())
+    with zipfile.ZipFile(archive_path) as zf:
+        for name, info in members.items():
+            data = zf.read(info)
+            archive_file = targets[name]
+            out_dir = _output_dir(archive_file)
+            fmt = sniff_bytes(data[:SNIFF_BYTES], os.path.basename(archive_file))
+            reason = preflight_check_bytes(data, fmt, out_dir, cfg)
+            if reason:
+                print(f"[Auto-Unzip] Skipped nested archive {name}: {reason}")
+                ok = False
+            else:
+                try:
+                    ok = _unpack_bytes(data, fmt, os.path.basename(archive_file), out_dir)
+                except Exception as e:
+                    print(f"[Auto-Unzip] Could not extract nested archive {name}: {e}")
+                    ok = False
+            if not ok or not getattr(cfg, 'delete_archives_after_extract', True):
+                # Keep the inner archive as a plain file, as a normal extraction would
+                with open(archive_file, 'wb') as f:
+                    f.write(data)
+            if not ok:
+                continue
+            deferred += [(os.path.join(os.path.relpath(out_dir, target_dir), rel), found_depth)
+                         for rel, found_depth in extract_nested_in_tree(out_dir, cfg, depth + 1)]
+    return deferred
+
+
+def extract_nested_in_tree(root: str, cfg: Config, depth: int) -> List[Tuple[str, int]]:
+    """Extract archives found under root (already extracted at depth) in place.
+
+    Archives larger than nested_stream_max_mb are not extracted here; their
+    paths relative to root are returned for the caller to queue, each with
+    the depth to process it at.
+    """
+    if not nested_enabled(cfg, depth):
+        return []
+    found = []
+    for folder, _, names in os.walk(root):
+        found += [os.path.join(folder, n) for n in names if _is_inner_archive(n)]
+    limit = _stream_limit(cfg)
+    deferred: List[Tuple[str, int]] = []
+    for path in found:
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            continue
+        if size > limit:
+            deferred.append((os.path.relpath(path, root), depth + 1))
+            continue
+        out_dir = _output_dir(path)
+        reason = preflight_check(path, out_dir, cfg)
+        if reason:
+            print(f"[Auto-Unzip] Skipped nested archive {os.path.relpath(path, root)}: {reason}")
+            continue
+        if not extract_archive(path, out_dir, lambda *a: None, cfg):
+            print(f"[Auto-Unzip] Could not extract nested archive {os.path.relpath(path, root)}")
+            continue
+        if getattr(cfg, 'delete_archives_after_extract', True):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        deferred += [(os.path.join(os.path.relpath(out_dir, root), rel), found_depth)
+                     for rel, found_depth in extract_nested_in_tree(out_dir, cfg, depth + 1)]
+    return deferred
@@ -0,0 +1,70 @@
+"""
+workflow_preflight.py
+---------------------
+Defines preflight_check() which process_archive() runs before extracting.
+It reads the archive's directory (read_archive_metadata, no payload data)
+and rejects archives that:
+
+- would not fit on the target volume (keeping min_free_space_mb spare),
+- exceed max_uncompressed_gb or max_archive_files,
+- expand by more than max_compression_ratio (zip bombs); the ratio is only
+  enforced once the output exceeds RATIO_MIN_BYTES, so small highly
+  compressible files are not flagged.
+
+Formats without up-front size information (gzip/bzip2/xz/zstd streams) pass
+unchecked. preflight_check_bytes() applies the same limits to a nested
+archive held in memory.
+"""
+from __future__ import annotations
+import os
+import shutil
+from typing import Optional
+
+from .config_dataclass import Config
+from .extract_archive_metadata import ArchiveMetadata, read_archive_metadata, read_archive_metadata_bytes
+
+RATIO_MIN_BYTES = 64 * 1024 * 1024
+_MB = 1024 * 1024
+_GB = 1024 * _MB
+
+
+def _format_bytes(n: float) -> str:
+    if n >= _GB:
+        return f"{n / _GB:.1f} GB"
+    return f"{n / _MB:.1f} MB"
+
+
+def _check_metadata(meta: Optional[ArchiveMetadata], target_dir: str, cfg: Config) -> Optional[str]:
+    if meta is None:
+        return None
+    max_files = getattr(cfg, 'max_archive_files', 0)
+    if max_files and meta.file_count > max_files:
+        return f"{meta.file_count} files exceeds the limit of {max_files}"
+    max_bytes = getattr(cfg, 'max_uncompressed_gb', 0) * _GB
+    if max_bytes and meta.uncompressed_bytes > max_bytes:
+        return f"{_format_bytes(meta.uncompressed_bytes)} uncompressed exceeds the limit of {_format_bytes(max_bytes)}"
+    max_ratio = getattr(cfg, 'max_compression_ratio', 0)
+    if max_ratio and meta.uncompressed_bytes > RATIO_MIN_BYTES and meta.ratio > max_ratio:
+        return f"compression ratio {meta.ratio:.0f}:1 exceeds {max_ratio:.0f}:1 (possible archive bomb)"
+    try:
+        free = shutil.disk_usage(os.path.dirname(os.path.abspath(target_dir))).free
+    except OSError:
+        return None
+    needed = meta.uncompressed_bytes + getattr(cfg, 'min_free_space_mb', 0) * _MB
+    if needed > free:
+        return f"needs {_format_bytes(meta.uncompressed_bytes)} but only {_format_bytes(free)} is free"
+    return None
+
+
+def preflight_check(archive_path: str, target_dir: str, cfg: Config) -> Optional[str]:
+    """Return why archive_path must not be extracted into target_dir, or None if it may."""
+    if not getattr(cfg, 'preflight_checks', True):
+        return None
+    return _check_metadata(read_archive_metadata(archive_path), target_dir, cfg)
+
+
+def preflight_check_bytes(data: bytes, fmt: str, target_dir: str, cfg: Config) -> Optional[str]:
+    """preflight_check() for an archive of format fmt held in memory."""
+    if not getattr(cfg, 'preflight_checks', True):
+        return None
+    return _check_metadata(read_archive_metadata_bytes(data, fmt), target_dir, cfg)
@@ -2,36 +2,159 @@
 workflow_process_archive.py
 ---------------------------
 Defines process_archive() which orchestrates:
-- create target directory
-- perform extraction with progress notifications
+- skip (or link/clone the earlier output of) archives identical to one
+  extracted before, when given an ExtractionCache and dedup_mode is not 'off'
+- pre-flight checks (free space, size/count/ratio limits) from archive metadata
+- extract into a hidden staging directory next to the target (resuming a
+  staging directory left by an interrupted run), with progress notifications
+- optionally extract archives nested inside it (see workflow_nested_archives);
+  large inner archives are queued through `submit` as jobs of their own
+- move the finished tree into place in one rename, or discard it on failure
 - issue completion notification
-- optionally delete the original archive
+- optionally delete the original archive (every volume of a multi-volume RAR)
+- record the outcome in the processed-archive index (if given)
+- report bytes written to the job journal (if given)
+- record job and delete durations in the metrics registry
 """
 import os
+import time
+from typing import Callable, Optional
 from .config_dataclass import Config
+from .index_job_journal import JobJournal
+from .index_extraction_cache import ExtractionCache, archive_fingerprint, full_digest
+from .index_processed_archives import ProcessedArchiveIndex
 from .extract_archive import extract_archive
+from .metrics_registry import get_metrics
+from .extract_rar_volumes import is_rar_volume_name, rar_set_stem, rar_volume_set
 from .notifications_show_progress import show_progress_toast
 from .notifications_show_completion import show_completion_toast
+from .workflow_nested_archives import extract_nested_in_tree, extract_streamed_members, plan_streamed_members
+from .workflow_preflight import preflight_check
+from .workflow_reuse_extraction import clone_tree
+from .workflow_staged_extraction import commit_staging, discard_staging, staging_dir_for
 
-def process_archive(archive_path: str, cfg: Config) -> None:
+def process_archive(archive_path: str, cfg: Config, index: Optional[ProcessedArchiveIndex] = None,
+                    depth: int = 0, submit: Optional[Callable[..., bool]] = None,
+                    cache: Optional[ExtractionCache] = None, journal: Optional[JobJournal] = None) -> bool:
+    """Extract archive_path next to itself; depth > 0 for an archive found inside another one."""
+    start = time.perf_counter()
+    success = _process_archive(archive_path, cfg, index, depth, submit, cache, journal)
+    get_metrics().observe('autounzip_process_seconds', time.perf_counter() - start,
+                          outcome='success' if success else 'failed')
+    return success
+
+
+def _process_archive(archive_path: str, cfg: Config, index: Optional[ProcessedArchiveIndex], depth: int,
+                     submit: Optional[Callable[..., bool]], cache: Optional[ExtractionCache],
+                     journal: Optional[JobJournal]) -> bool:
     archive_name = os.path.basename(archive_path)
     # Remove all known archive extensions for folder naming
-    _exts = ['.tar.gz', '.tar.bz2', '.zipx', '.zip', '.7z', '.rar', '.tar', '.gz', '.bz2', '.tgz', '.tbz', '.cab']
+    _exts = ['.tar.gz', '.tar.bz2', '.tar.xz', '.tar.zst', '.zipx', '.zip', '.7z', '.rar', '.tar', '.gz', '.bz2', '.xz', '.tgz',
+             '.tbz', '.tbz2', '.txz', '.zst', '.tzst', '.cab']
     base = archive_name
     for ext in sorted(_exts, key=len, reverse=True):
         if base.lower().endswith(ext):
             base = base[: -len(ext)]
             break
+    volumes = [archive_path]
+    if archive_name.lower().endswith('.rar') or is_rar_volume_name(archive_name):
+        volumes = rar_volume_set(archive_path) or volumes
+        if len(volumes) > 1 or is_rar_volume_name(archive_name):
+            base = rar_set_stem(archive_path)  # 'movie.part1.rar' -> 'movie'
     target_dir = os.path.join(os.path.dirname(archive_path), base)
-    os.makedirs(target_dir, exist_ok=True)
+    try:
+        # Captured up front: the archive may be deleted once extracted
+        st = os.stat(archive_path)
+    except OSError:
+        return False
+    dedup_mode = getattr(cfg, 'dedup_mode', 'off')
+    fingerprint = previous = None
+    # A multi-volume set is not identified by its first volume alone
+    if cache is not None and dedup_mode != 'off' and len(volumes) == 1:
+        try:
+            fingerprint = archive_fingerprint(archive_path)
+            previous = cache.find(archive_path, fingerprint)
+        except OSError as e:
+            print(f"[Auto-Unzip] Could not fingerprint {archive_name}: {e}")
+    if previous is not None and (dedup_mode == 'skip' or os.path.normcase(previous) == os.path.normcase(target_dir)):
+        print(f"[Auto-Unzip] {archive_name} was already extracted to {previous}; skipping")
+        show_completion_toast(archive_name, True, previous, archive_path=archive_path)
+        if index is not None:
+            index.record(archive_path, st.st_size, st.st_mtime, 'duplicate')
+        if cfg.delete_archives_after_extract:
+            try:
+                os.remove(archive_path)
+            except OSError:
+                pass
+        return True
+    reason = None if previous is not None else preflight_check(archive_path, target_dir, cfg)
+    if reason is not None:
+        print(f"[Auto-Unzip] Skipping {archive_name}: {reason}")
+        # Not recorded in the index: after space is freed or limits raised a restart retries it
+        show_completion_toast(archive_name, False, target_dir, reason, archive_path)
+        return False
+    staging = staging_dir_for(target_dir)
+    resume = os.path.isdir(staging) and previous is None  # left behind by a crashed or killed run
+    if previous is not None:
+        discard_staging(staging)
+    os.makedirs(staging, exist_ok=True)
 
-    def _progress(p: float):
-        show_progress_toast(archive_name, p)
+    def _progress(p: float, stats=None):
+        show_progress_toast(archive_name, p, stats, archive_path)
+        if journal is not None and stats is not None:
+            journal.progress(os.path.abspath(archive_path), stats.written_bytes)
 
-    success = extract_archive(archive_path, target_dir, _progress)
-    show_completion_toast(archive_name, success, target_dir)
-    if success and cfg.delete_archives_after_extract:
+    deferred = []
+    if previous is not None:
+        print(f"[Auto-Unzip] {archive_name} is identical to the archive extracted to {previous}; reusing its files")
         try:
-            os.remove(archive_path)
-        except OSError:
-            pass
+            clone_tree(previous, staging, dedup_mode)
+            success = True
+        except OSError as e:
+            print(f"[Auto-Unzip] Could not reuse {previous}: {e}")
+            success = False
+    else:
+        streamed = plan_streamed_members(archive_path, cfg, depth)
+        success = extract_archive(archive_path, staging, _progress, cfg, resume=resume, exclude=set(streamed))
+        if success:
+            try:
+                # Tree walk first: the streamed members' output is already handled recursively
+                deferred += extract_nested_in_tree(staging, cfg, depth)
+                if streamed:
+                    deferred += extract_streamed_members(archive_path, staging, streamed, cfg, depth)
+            except Exception as e:
+                print(f"[Auto-Unzip] Nested extraction failed in {archive_name}: {e}")
+    if success:
+        try:
+            commit_staging(staging, target_dir)
+        except OSError as e:
+            print(f"[Auto-Unzip] Could not move extracted files into {target_dir}: {e}")
+            success = False
+    if not success:
+        discard_staging(staging)
+    show_completion_toast(archive_name, success, target_dir, archive_path=archive_path)
+    digest = None
+    if success and fingerprint is not None:
+        try:
+            # Hashed now: the archive may be deleted below
+            digest = full_digest(archive_path)
+            cache.record(fingerprint, digest, target_dir)
+        except OSError as e:
+            print(f"[Auto-Unzip] Could not record {archive_name} in the extraction cache: {e}")
+    if index is not None:
+        index.record(archive_path, st.st_size, st.st_mtime, 'success' if success else 'failed', digest)
+    if success and cfg.delete_archives_after_extract:
+        delete_start = time.perf_counter()
+        for volume in volumes:
+            try:
+                os.remove(volume)
+            except OSError:
+                pass
+        get_metrics().observe('autounzip_delete_seconds', time.perf_counter() - delete_start)
+    for rel, inner_depth in (deferred if success else []):
+        inner = os.path.join(target_dir, rel)
+        if submit is not None:
+            submit(inner, depth=inner_depth)
+        else:
+            process_archive(inner, cfg, index, inner_depth, cache=cache)
+    return success
@@ -0,0 +1,64 @@
+"""
+workflow_reuse_extraction.py
+----------------------------
+Defines clone_tree() which recreates an earlier extraction's output folder
+instead of decompressing an identical archive again (see ExtractionCache).
+The dedup_mode setting picks how files are recreated:
+
+- 'link': hard links (no data written; the copies share edits)
+- 'reflink': copy-on-write clones on filesystems that support FICLONE
+  (Btrfs, XFS); independent files that share storage until modified
+- 'skip' doesn't call clone_tree at all: the archive is only marked as done
+
+Files that cannot be linked or cloned (another volume, unsupported
+filesystem) are copied.
+"""
+from __future__ import annotations
+import os
+import shutil
+
+_FICLONE = 0x40049409  # linux/fs.h
+
+
+def _reflink(src: str, dst: str) -> bool:
+    try:
+        import fcntl
+    except ImportError:
+        return False  # not available outside Unix
+    try:
+        with open(src, 'rb') as s, open(dst, 'wb') as d:
+            fcntl.ioctl(d.fileno(), _FICLONE, s.fileno())
+        shutil.copystat(src, dst)
+        return True
+    except OSError:
+        try:
+            os.remove(dst)
+        except OSError:
+            pass
+        return False
+
+
+def _clone_file(src: str, dst: str, mode: str):
+    if mode == 'link':
+        try:
+            os.link(src, dst)
+            return
+        except OSError:
+            pass
+    elif mode == 'reflink' and _reflink(src, dst):
+        return
+    shutil.copy2(src, dst)
+
+
+def clone_tree(src: str, dst: str, mode: str):
+    """Recreate the files under src in dst (which may already exist)."""
+    os.makedirs(dst, exist_ok=True)
+    for entry in os.scandir(src):
+        target = os.path.join(dst, entry.name)
+        if entry.is_symlink():
+            os.symlink(os.readlink(entry.path), target)
+        elif entry.is_dir():
+            clone_tree(entry.path, target, mode)
+            shutil.copystat(entry.path, target)
+        else:
+            _clone_file(entry.path, target, mode)
@@ -0,0 +1,56 @@
+"""
+workflow_staged_extraction.py
+-----------------------------
+Helpers for extracting into a hidden staging directory next to the final
+output folder and moving the finished tree into place:
+
+- staging_dir_for(target_dir) -> '<parent>/.<name>.unzipping'
+- commit_staging(staging, target_dir) renames the staging directory onto
+  target_dir in one step (same filesystem, so the rename is atomic); if
+  target_dir already exists the staged entries are moved into it instead
+- discard_staging(staging) removes a failed attempt
+
+A staging directory that survives a crash is reused by the next attempt,
+which then skips members already extracted completely (see `resume` in
+extract_archive()).
+"""
+from __future__ import annotations
+import os
+import shutil
+
+STAGING_SUFFIX = '.unzipping'
+
+
+def staging_dir_for(target_dir: str) -> str:
+    parent, name = os.path.split(os.path.normpath(target_dir))
+    return os.path.join(parent, f'.{name}{STAGING_SUFFIX}')
+
+
+def _merge_into(src: str, dst: str):
+    """Move the contents of directory src into existing directory dst (staged entries win)."""
+    for entry in os.scandir(src):
+        target = os.path.join(dst, entry.name)
+        if entry.is_dir(follow_symlinks=False) and os.path.isdir(target) and not os.path.islink(target):
+            _merge_into(entry.path, target)
+            os.rmdir(entry.path)
+            continue
+        if os.path.isdir(target) and not os.path.islink(target):
+            shutil.rmtree(target)
+        os.replace(entry.path, target)
+
+
+def commit_staging(staging: str, target_dir: str):
+    """Publish the extracted tree in staging as target_dir."""
+    try:
+        os.replace(staging, target_dir)
+        return
+    except OSError:
+        if not os.path.isdir(target_dir):
+            raise
+    # Output folder already exists (e.g. created by the user): move entry by entry
+    _merge_into(staging, target_dir)
+    os.rmdir(staging)
+
+
+def discard_staging(staging: str):
+    shutil.rmtree(staging, ignore_errors=True)
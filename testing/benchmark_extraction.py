@@ -0,0 +1,430 @@
+"""
+benchmark_extraction.py
+-----------------------
+Extraction benchmark for Auto-Unzip.
+
+Generates synthetic corpora (many small files, a few huge files), packs them
+into every format extract_archive() can dispatch (zip stored/deflated, 7z
+solid/non-solid, tar, tar.gz, tar.bz2, tar.xz, tar.zst, gz, bz2, xz, zst,
+cab, rar), adds the checked-in fixtures in this folder, and extracts each one
+through extract_archive().
+
+CAB archives (MSZIP) are written by a small builder in this script. zst
+needs the zstd tool or the zstandard package and rar needs the rar tool;
+without them those cases are skipped with the reason printed.
+
+Every case runs in its own child process so the reported peak RSS belongs to
+that case only. Results (throughput, peak RSS, per-file overhead) are printed
+as a table and can be written to JSON and compared against an earlier run:
+
+    python testing/benchmark_extraction.py --json bench.json
+    python testing/benchmark_extraction.py --compare bench.json --fail-threshold 10
+
+The exit status is 1 if any case fails, and with --compare also if a case
+got slower than the threshold or is missing/failing while it passed in the
+baseline.
+"""
+from __future__ import annotations
+import argparse
+import bz2
+import gzip
+import json
+import lzma
+import os
+import platform
+import random
+import shutil
+import struct
+import subprocess
+import sys
+import tarfile
+import tempfile
+import time
+import zipfile
+import zlib
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURES_DIR = os.path.dirname(os.path.abspath(__file__))
+FIXTURES = ['test-zip.zip', 'test-7zip.7z', 'test-rar.rar', 'test-tar.tar', 'test-gzip.gz', 'test-bz2.bz2',
+            'test-cabinet.cab']
+
+# name -> (file count, file size) for each scale
+CORPORA = {
+    'small': {'many_small': (5000, 2048), 'few_huge': (2, 32 * 1024 * 1024)},
+    'large': {'many_small': (50000, 2048), 'few_huge': (4, 512 * 1024 * 1024)},
+}
+
+
+# ---------------------------------------------------------------- corpus / archives
+
+def _fill(f, size: int, rng: random.Random):
+    """Write size bytes of moderately compressible data (text-like with noise)."""
+    words = [bytes(rng.choice(b'abcdefghijklmnopqrstuvwxyz') for _ in range(rng.randint(2, 9))) for _ in range(512)]
+    block = b' '.join(rng.choice(words) for _ in range(16384))[:64 * 1024]
+    noise = rng.randbytes(4096) if hasattr(rng, 'randbytes') else os.urandom(4096)
+    written = 0
+    while written < size:
+        chunk = (block + noise)[: size - written]
+        f.write(chunk)
+        written += len(chunk)
+
+
+def generate_corpus(root: str, name: str, count: int, size: int) -> str:
+    path = os.path.join(root, 'corpus', name)
+    marker = os.path.join(path, '.complete')
+    if os.path.exists(marker):
+        return path
+    shutil.rmtree(path, ignore_errors=True)
+    rng = random.Random(count * 31 + size)
+    for i in range(count):
+        sub = os.path.join(path, f'dir{i % 50:02d}')
+        os.makedirs(sub, exist_ok=True)
+        with open(os.path.join(sub, f'file{i:06d}.dat'), 'wb') as f:
+            _fill(f, size, rng)
+    open(marker, 'w').close()
+    return path
+
+
+def _corpus_files(corpus: str):
+    for dirpath, _, names in os.walk(corpus):
+        for n in sorted(names):
+            if n != '.complete':
+                full = os.path.join(dirpath, n)
+                yield full, os.path.relpath(full, corpus)
+
+
+def _build_zip(corpus, out, compression):
+    with zipfile.ZipFile(out, 'w', compression) as zf:
+        for full, rel in _corpus_files(corpus):
+            zf.write(full, rel)
+
+
+def _build_tar(corpus, out, mode):
+    with tarfile.open(out, mode) as tf:
+        for full, rel in _corpus_files(corpus):
+            tf.add(full, rel)
+
+
+def _build_single(corpus, out, opener):
+    # Single-file formats: compress the largest file of the corpus
+    src = max((full for full, _ in _corpus_files(corpus)), key=os.path.getsize)
+    with open(src, 'rb') as f_in, opener(out, 'wb') as f_out:
+        shutil.copyfileobj(f_in, f_out, 1024 * 1024)
+
+
+def _zstd_compress(src, out):
+    tool = shutil.which('zstd')
+    if tool:
+        subprocess.run([tool, '-q', '-f', '-T0', src, '-o', out], check=True)
+        return
+    try:
+        import zstandard  # type: ignore
+    except ImportError:
+        raise RuntimeError('zst needs the zstd tool or the zstandard package')
+    with open(src, 'rb') as f_in, open(out, 'wb') as f_out:
+        zstandard.ZstdCompressor(threads=-1).copy_stream(f_in, f_out)
+
+
+def _build_zst(corpus, out, tar):
+    if not tar:
+        src = max((full for full, _ in _corpus_files(corpus)), key=os.path.getsize)
+        _zstd_compress(src, out)
+        return
+    tar_path = out + '.tar'
+    try:
+        _build_tar(corpus, tar_path, 'w')
+        _zstd_compress(tar_path, out)
+    finally:
+        if os.path.exists(tar_path):
+            os.remove(tar_path)
+
+
+_CAB_BLOCK = 32768  # uncompressed bytes per CFDATA block
+_CAB_MAX_BLOCKS = 0xFFFF  # CFDATA blocks per folder
+
+
+def _build_cab(corpus, out):
+    """Write a single-cabinet MSZIP .cab (one folder per 65535 data blocks)."""
+    files = list(_corpus_files(corpus))
+    if len(files) > 0xFFFF:
+        raise RuntimeError(f'{len(files)} files is more than a cabinet can hold')
+    folders = []  # [data offset in the spool file, CFDATA block count]
+    entries = []  # (size, offset in folder, folder index, name)
+    with tempfile.TemporaryFile() as spool:
+        state = {'pending': b'', 'offset': 0}
+
+        def write_block(chunk):
+            comp = zlib.compressobj(9, zlib.DEFLATED, -15)
+            data = b'CK' + comp.compress(chunk) + comp.flush()
+            spool.write(struct.pack('<IHH', 0, len(data), len(chunk)) + data)
+            folders[-1][1] += 1
+
+        def new_folder():
+            if folders and state['pending']:
+                write_block(state['pending'])
+            state['pending'], state['offset'] = b'', 0
+            folders.append([spool.tell(), 0])
+
+        new_folder()
+        for full, rel in files:
+            size = os.path.getsize(full)
+            if folders[-1][1] + (len(state['pending']) + size) // _CAB_BLOCK + 1 > _CAB_MAX_BLOCKS:
+                new_folder()
+            entries.append((size, state['offset'], len(folders) - 1, rel.replace('/', '\\')))
+            state['offset'] += size
+            with open(full, 'rb') as f:
+                while True:
+                    chunk = f.read(1024 * 1024)
+                    if not chunk:
+                        break
+                    pending = state['pending'] + chunk
+                    cut = len(pending) - len(pending) % _CAB_BLOCK
+                    for i in range(0, cut, _CAB_BLOCK):
+                        write_block(pending[i:i + _CAB_BLOCK])
+                    state['pending'] = pending[cut:]
+        if state['pending']:
+            write_block(state['pending'])
+
+        file_table = b''.join(struct.pack('<IIHHHH', size, offset, folder, 0x21, 0, 0x80) + name.encode('utf-8') + b'\0'
+                              for size, offset, folder, name in entries)
+        data_start = 36 + 8 * len(folders) + len(file_table)
+        spool_size = spool.tell()
+        with open(out, 'wb') as f:
+            f.write(struct.pack('<4sIIIIIBBHHHHH', b'MSCF', 0, data_start + spool_size, 0, 36 + 8 * len(folders), 0,
+                                3, 1, len(folders), len(entries), 0, 0, 0))
+            for offset, blocks in folders:
+                f.write(struct.pack('<IHH', data_start + offset, blocks, 1))
+            f.write(file_table)
+            spool.seek(0)
+            shutil.copyfileobj(spool, f, 1024 * 1024)
+
+
+def _build_rar(corpus, out):
+    tool = shutil.which('rar')
+    if not tool:
+        raise RuntimeError('rar needs the rar command line tool')
+    subprocess.run([tool, 'a', '-idq', '-r', '-y', os.path.abspath(out), '*'], cwd=corpus,
+                   stdout=subprocess.DEVNULL, check=True)
+
+
+def _build_7z(corpus, out, solid):
+    seven = shutil.which('7z') or shutil.which('7za')
+    if seven:
+        subprocess.run([seven, 'a', '-bd', '-y', f'-ms={"on" if solid else "off"}', out, '.'], cwd=corpus,
+                       stdout=subprocess.DEVNULL, check=True)
+        return
+    if not solid:
+        raise RuntimeError('non-solid 7z needs the 7z command line tool')
+    import py7zr  # type: ignore
+    with py7zr.SevenZipFile(out, 'w') as z:
+        for full, rel in _corpus_files(corpus):
+            z.write(full, rel)
+
+
+BUILDERS = {
+    'zip-stored': ('.zip', lambda c, o: _build_zip(c, o, zipfile.ZIP_STORED)),
+    'zip-deflated': ('.zip', lambda c, o: _build_zip(c, o, zipfile.ZIP_DEFLATED)),
+    '7z-solid': ('.7z', lambda c, o: _build_7z(c, o, True)),
+    '7z-nonsolid': ('.7z', lambda c, o: _build_7z(c, o, False)),
+    'tar': ('.tar', lambda c, o: _build_tar(c, o, 'w')),
+    'tar.gz': ('.tar.gz', lambda c, o: _build_tar(c, o, 'w:gz')),
+    'tar.bz2': ('.tar.bz2', lambda c, o: _build_tar(c, o, 'w:bz2')),
+    'tar.xz': ('.tar.xz', lambda c, o: _build_tar(c, o, 'w:xz')),
+    'tar.zst': ('.tar.zst', lambda c, o: _build_zst(c, o, True)),
+    'gz': ('.gz', lambda c, o: _build_single(c, o, gzip.open)),
+    'bz2': ('.bz2', lambda c, o: _build_single(c, o, bz2.open)),
+    'xz': ('.xz', lambda c, o: _build_single(c, o, lzma.open)),
+    'zst': ('.zst', lambda c, o: _build_zst(c, o, False)),
+    'cab': ('.cab', _build_cab),
+    'rar': ('.rar', _build_rar),
+}
+_SINGLE_FILE_FORMATS = ('gz', 'bz2', 'xz', 'zst')
+
+
+def build_cases(workdir: str, scale: str, formats):
+    cases = []
+    for corpus_name, (count, size) in CORPORA[scale].items():
+        corpus = generate_corpus(workdir, f'{scale}-{corpus_name}', count, size)
+        for fmt, (ext, build) in BUILDERS.items():
+            if formats and fmt not in formats:
+                continue
+            if fmt in _SINGLE_FILE_FORMATS and corpus_name == 'many_small':
+                continue  # single-file formats only make sense for the huge corpus
+            archive = os.path.join(workdir, 'archives', f'{scale}-{corpus_name}-{fmt}{ext}')
+            if not os.path.exists(archive):
+                os.makedirs(os.path.dirname(archive), exist_ok=True)
+                try:
+                    build(corpus, archive + '.tmp')
+                    os.replace(archive + '.tmp', archive)
+                except Exception as e:
+                    print(f'skip {fmt}/{corpus_name}: {e}')
+                    continue
+            cases.append({'case': f'{fmt}/{corpus_name}', 'format': fmt, 'archive': archive})
+    for name in FIXTURES:
+        path = os.path.join(FIXTURES_DIR, name)
+        if os.path.exists(path) and (not formats or 'fixtures' in formats):
+            cases.append({'case': f'fixture/{name}', 'format': 'fixture', 'archive': path})
+    return cases
+
+
+# ---------------------------------------------------------------- child process
+
+def _peak_rss_bytes() -> int:
+    if sys.platform.startswith('win'):
+        import ctypes
+        from ctypes import wintypes
+
+        class _PMC(ctypes.Structure):
+            _fields_ = [('cb', wintypes.DWORD), ('PageFaultCount', wintypes.DWORD),
+                        ('PeakWorkingSetSize', ctypes.c_size_t), ('WorkingSetSize', ctypes.c_size_t),
+                        ('QuotaPeakPagedPoolUsage', ctypes.c_size_t), ('QuotaPagedPoolUsage', ctypes.c_size_t),
+                        ('QuotaPeakNonPagedPoolUsage', ctypes.c_size_t), ('QuotaNonPagedPoolUsage', ctypes.c_size_t),
+                        ('PagefileUsage', ctypes.c_size_t), ('PeakPagefileUsage', ctypes.c_size_t)]
+        pmc = _PMC()
+        pmc.cb = ctypes.sizeof(_PMC)
+        ctypes.windll.psapi.GetProcessMemoryInfo(ctypes.windll.kernel32.GetCurrentProcess(), ctypes.byref(pmc), pmc.cb)
+        return int(pmc.PeakWorkingSetSize)
+    try:
+        # Linux: high-water mark of this process image (ru_maxrss survives fork+exec from the driver)
+        with open('/proc/self/status', 'r', encoding='ascii') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return int(peak if sys.platform == 'darwin' else peak * 1024)
+
+
+def run_case(spec: dict) -> dict:
+    sys.path.insert(0, PROJECT_ROOT)
+    from modules.config_dataclass import Config
+    from modules.extract_archive import extract_archive
+
+    cfg = Config(watch_folders=[], decompression_backend=spec.get('backend', 'auto'))
+    out_dir = spec['out_dir']
+    shutil.rmtree(out_dir, ignore_errors=True)
+    os.makedirs(out_dir)
+    start = time.perf_counter()
+    ok = extract_archive(spec['archive'], out_dir, lambda *a: None, cfg)
+    seconds = time.perf_counter() - start
+    files = 0
+    written = 0
+    for dirpath, _, names in os.walk(out_dir):
+        for n in names:
+            files += 1
+            written += os.path.getsize(os.path.join(dirpath, n))
+    shutil.rmtree(out_dir, ignore_errors=True)
+    return {
+        'case': spec['case'], 'format': spec['format'], 'ok': bool(ok),
+        'archive_bytes': os.path.getsize(spec['archive']), 'uncompressed_bytes': written, 'files': files,
+        'seconds': seconds, 'mb_s': (written / (1024 * 1024)) / seconds if seconds > 0 else 0.0,
+        'per_file_us': (seconds / files) * 1e6 if files else None,
+        'peak_rss_mb': _peak_rss_bytes() / (1024 * 1024),
+    }
+
+
+# ---------------------------------------------------------------- driver
+
+def _run_in_child(spec: dict) -> dict:
+    proc = subprocess.run([sys.executable, os.path.abspath(__file__), '--run-case', json.dumps(spec)],
+                          capture_output=True, text=True)
+    lines = [l for l in proc.stdout.splitlines() if l.startswith('{')]
+    if proc.returncode != 0 or not lines:
+        return {'case': spec['case'], 'format': spec['format'], 'ok': False, 'error': proc.stderr.strip()[-500:]}
+    return json.loads(lines[-1])
+
+
+def _print_table(results, baseline=None):
+    base = {r['case']: r for r in (baseline or {}).get('results', [])}
+    print(f"{'case':<32} {'ok':<3} {'MB/s':>9} {'sec':>8} {'files':>7} {'us/file':>9} {'peakMB':>8} {'vs base':>8}")
+    for r in results:
+        delta = ''
+        b = base.get(r['case'])
+        if b and b.get('mb_s') and r.get('mb_s'):
+            delta = f"{(r['mb_s'] / b['mb_s'] - 1) * 100:+.1f}%"
+        if not r.get('ok') and 'seconds' not in r:
+            print(f"{r['case']:<32} {'no':<3} {r.get('error', '')[:60]}")
+            continue
+        per_file = f"{r['per_file_us']:.0f}" if r.get('per_file_us') is not None else '-'
+        print(f"{r['case']:<32} {'yes' if r['ok'] else 'no':<3} {r['mb_s']:>9.1f} {r['seconds']:>8.3f} "
+              f"{r['files']:>7} {per_file:>9} {r['peak_rss_mb']:>8.1f} {delta:>8}")
+
+
+def _regressions(results, baseline, threshold: float, formats=None):
+    """Cases slower than threshold percent, or failed/missing while they passed in baseline."""
+    current = {r['case']: r for r in results}
+    regressed = []
+    for b in baseline.get('results', []):
+        if not b.get('ok'):
+            continue
+        if formats and b['format'] not in formats and not (b['format'] == 'fixture' and 'fixtures' in formats):
+            continue  # not part of this run
+        r = current.get(b['case'])
+        if r is None:
+            regressed.append(f"{b['case']} (missing)")
+        elif not r.get('ok'):
+            regressed.append(f"{b['case']} (failed)")
+        elif b.get('mb_s') and r['mb_s'] < b['mb_s'] * (1 - threshold / 100.0):
+            regressed.append(b['case'])
+    return regressed
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='Benchmark Auto-Unzip extractors.')
+    parser.add_argument('--scale', choices=sorted(CORPORA), default='small')
+    parser.add_argument('--formats', help='comma separated subset, e.g. zip-deflated,tar.gz,fixtures')
+    parser.add_argument('--workdir', help='where corpora/archives are generated (reused between runs)')
+    parser.add_argument('--repeat', type=int, default=1, help='runs per case; the fastest is reported')
+    parser.add_argument('--json', dest='json_out', help='write results to this JSON file')
+    parser.add_argument('--compare', help='baseline JSON from an earlier run')
+    parser.add_argument('--fail-threshold', type=float, default=10.0, help='percent slowdown counted as regression')
+    parser.add_argument('--decompression-backend', default='auto',
+                        choices=['auto', 'external', 'parallel', 'stdlib'], help='backend for gz/bz2/xz cases')
+    parser.add_argument('--run-case', help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.run_case:
+        print(json.dumps(run_case(json.loads(args.run_case))))
+        return 0
+
+    workdir = args.workdir or os.path.join(tempfile.gettempdir(), 'auto-unzip-bench')
+    os.makedirs(workdir, exist_ok=True)
+    formats = set(args.formats.split(',')) if args.formats else None
+    cases = build_cases(workdir, args.scale, formats)
+    results = []
+    for spec in cases:
+        spec = dict(spec, out_dir=os.path.join(workdir, 'out'), backend=args.decompression_backend)
+        runs = [_run_in_child(spec) for _ in range(max(1, args.repeat))]
+        good = [r for r in runs if r.get('ok')]
+        results.append(max(good, key=lambda r: r['mb_s']) if good else runs[-1])
+        print(f"  {spec['case']}: {'ok' if good else 'FAILED'}", file=sys.stderr)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+    _print_table(results, baseline)
+
+    if args.json_out:
+        meta = {'time': time.time(), 'python': sys.version.split()[0], 'platform': platform.platform(),
+                'cpu_count': os.cpu_count(), 'scale': args.scale, 'decompression_backend': args.decompression_backend}
+        with open(args.json_out, 'w', encoding='utf-8') as f:
+            json.dump({'meta': meta, 'results': results}, f, indent=2)
+
+    status = 0
+    failed = [r['case'] for r in results if not r.get('ok')]
+    if failed:
+        print(f"Failed cases: {', '.join(failed)}")
+        status = 1
+    if baseline is not None:
+        regressed = _regressions(results, baseline, args.fail_threshold, formats)
+        if regressed:
+            print(f"Regressions (> {args.fail_threshold:.0f}% slower, failed or missing): {', '.join(regressed)}")
+            status = 1
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main())